@@ -1,10 +1,12 @@
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
 from alembic import context
 from app.core.config import settings
 from app.db.base import Base
-from app.db.models import sheep, health_event, mating_pair, birth_record, section_assignment
+from app.db.models import sheep, health_event, mating_pair, birth_record, lamb, section_assignment, lambing_forecast, change_log, scheduler_lease, attachment, breeding_value, treatment_protocol, job, archive, farm
+from app.db.tenancy import validate_schema_name
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -24,7 +26,16 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Farm databases and schemas are migrated one at a time:
+#   alembic -x database=<FARM_DATABASES name> upgrade head
+#   alembic -x schema=<farm schema> upgrade head
+x_args = context.get_x_argument(as_dictionary=True)
+
+
 def get_url():
+    database = x_args.get("database")
+    if database:
+        return settings.FARM_DATABASES[database]
     return settings.SQLALCHEMY_DATABASE_URI
 
 def run_migrations_offline() -> None:
@@ -67,8 +78,14 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        schema = x_args.get("schema")
+        if schema:
+            schema = validate_schema_name(schema)
+            connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+            connection.execute(text(f'SET search_path TO "{schema}", public'))
+            connection.commit()
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, version_table_schema=schema
         )
 
         with context.begin_transaction():
@@ -0,0 +1,57 @@
+"""lambing forecasts
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('mating_pairs', sa.Column('lambing_window_start', sa.Date(), nullable=True))
+    op.add_column('mating_pairs', sa.Column('lambing_window_end', sa.Date(), nullable=True))
+    op.create_index(op.f('ix_mating_pairs_expected_lambing_date'), 'mating_pairs', ['expected_lambing_date'], unique=False)
+
+    op.create_table(
+        'gestation_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('breed', sa.String(50), nullable=False),
+        sa.Column('mean_days', sa.Float(), nullable=False),
+        sa.Column('std_days', sa.Float(), nullable=False),
+        sa.Column('sample_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('breed')
+    )
+    op.create_index(op.f('ix_gestation_stats_id'), 'gestation_stats', ['id'], unique=False)
+
+    op.create_table(
+        'lambing_calendar',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('lambing_date', sa.Date(), nullable=False),
+        sa.Column('section', postgresql.ENUM('male', 'general', 'mating', name='sheep_section', create_type=False), nullable=False),
+        sa.Column('expected_lambings', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('lambing_date', 'section')
+    )
+    op.create_index(op.f('ix_lambing_calendar_id'), 'lambing_calendar', ['id'], unique=False)
+    op.create_index(op.f('ix_lambing_calendar_lambing_date'), 'lambing_calendar', ['lambing_date'], unique=False)
+
+def downgrade():
+    op.drop_table('lambing_calendar')
+    op.drop_table('gestation_stats')
+    op.drop_index(op.f('ix_mating_pairs_expected_lambing_date'), table_name='mating_pairs')
+    op.drop_column('mating_pairs', 'lambing_window_end')
+    op.drop_column('mating_pairs', 'lambing_window_start')
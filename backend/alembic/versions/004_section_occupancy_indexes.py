@@ -0,0 +1,32 @@
+"""section occupancy indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_section_assignments_section_period', 'section_assignments', ['section', 'start_date', 'end_date'], unique=False)
+    op.create_index('ix_section_assignments_sheep_open', 'section_assignments', ['sheep_id', 'end_date'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # btree_gist lets the enum section column share a GiST index with the date range
+        op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+        op.execute(
+            "CREATE INDEX ix_section_assignments_period_gist ON section_assignments "
+            "USING gist (section, daterange(start_date, end_date, '[)'))"
+        )
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_section_assignments_period_gist")
+    op.drop_index('ix_section_assignments_sheep_open', table_name='section_assignments')
+    op.drop_index('ix_section_assignments_section_period', table_name='section_assignments')
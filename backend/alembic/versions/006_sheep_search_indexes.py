@@ -0,0 +1,41 @@
+"""sheep search indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        # Other backends use the in-process search index
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Prefix autocomplete
+    op.execute("CREATE INDEX ix_sheep_tag_id_prefix ON sheep (upper(tag_id) text_pattern_ops)")
+    op.execute("CREATE INDEX ix_sheep_scrapie_id_prefix ON sheep (upper(scrapie_id) text_pattern_ops)")
+    # Typo-tolerant matching
+    op.execute("CREATE INDEX ix_sheep_tag_id_trgm ON sheep USING gin (tag_id gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_sheep_scrapie_id_trgm ON sheep USING gin (scrapie_id gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_sheep_origin_farm_trgm ON sheep USING gin (origin_farm gin_trgm_ops)")
+    # Full-text search over notes
+    op.execute("CREATE INDEX ix_sheep_notes_fts ON sheep USING gin (to_tsvector('simple', coalesce(notes, '')))")
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_sheep_notes_fts")
+    op.execute("DROP INDEX IF EXISTS ix_sheep_origin_farm_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_sheep_scrapie_id_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_sheep_tag_id_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_sheep_scrapie_id_prefix")
+    op.execute("DROP INDEX IF EXISTS ix_sheep_tag_id_prefix")
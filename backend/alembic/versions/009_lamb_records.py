@@ -0,0 +1,177 @@
+"""normalized lamb records
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import json
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+lambs_table = sa.table(
+    'lambs',
+    sa.column('birth_record_id', sa.Integer),
+    sa.column('birth_order', sa.Integer),
+    sa.column('tag_id', sa.String),
+    sa.column('sex', sa.String),
+    sa.column('birth_weight', sa.Float),
+    sa.column('born_alive', sa.Boolean),
+    sa.column('death_date', sa.Date),
+    sa.column('death_reason', sa.Text),
+)
+
+
+def _first(detail, *keys):
+    for key in keys:
+        if detail.get(key) not in (None, ""):
+            return detail[key]
+    return None
+
+
+def _parse_bool(value):
+    """True/False from the spellings seen in the field; None when unreadable."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value) if value in (0, 1) else None
+    text = str(value).strip().lower()
+    if text in ('true', 'yes', 'y', '1', 'alive'):
+        return True
+    if text in ('false', 'no', 'n', '0', 'dead', 'stillborn'):
+        return False
+    return None
+
+
+def _parse_date(value):
+    """A date from an ISO string, ignoring any time part; raises ValueError otherwise."""
+    if value is None:
+        return None
+    return date.fromisoformat(str(value).strip()[:10])
+
+
+def _parse_lambs(birth_record_id, raw):
+    """Turn one lamb_details blob into lamb rows, skipping anything unreadable.
+
+    The blob was free text, so accept a list of lambs or an object wrapping
+    one under "lambs", and the key spellings seen in the field.
+    """
+    try:
+        details = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if isinstance(details, dict):
+        details = details.get('lambs', [details])
+    if not isinstance(details, list):
+        return []
+
+    rows = []
+    for order, detail in enumerate(details, start=1):
+        if not isinstance(detail, dict):
+            continue
+        sex = str(_first(detail, 'sex', 'gender') or '').lower()
+        sex = {'m': 'male', 'ram': 'male', 'f': 'female', 'ewe': 'female'}.get(sex, sex)
+        weight = _first(detail, 'birth_weight', 'weight')
+        try:
+            weight = float(weight) if weight is not None else None
+        except (TypeError, ValueError):
+            weight = None
+        status = str(_first(detail, 'status') or '').lower()
+        alive = _first(detail, 'born_alive', 'alive')
+        born_alive = status not in ('stillborn', 'dead') if alive is None else _parse_bool(alive)
+        # A lamb whose alive flag or death date can't be read is skipped, not guessed
+        if born_alive is None:
+            continue
+        try:
+            death_date = _parse_date(_first(detail, 'death_date', 'date_of_death'))
+        except ValueError:
+            continue
+        rows.append({
+            'birth_record_id': birth_record_id,
+            'birth_order': order,
+            'tag_id': _first(detail, 'tag_id', 'tag'),
+            'sex': sex if sex in ('male', 'female') else None,
+            'birth_weight': weight,
+            'born_alive': born_alive,
+            'death_date': death_date,
+            'death_reason': _first(detail, 'death_reason', 'cause_of_death'),
+        })
+    return rows
+
+
+def upgrade():
+    op.create_table(
+        'lambs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('birth_record_id', sa.Integer(), nullable=False),
+        sa.Column('birth_order', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.String(20), nullable=True),
+        sa.Column('sex', postgresql.ENUM('male', 'female', name='sheep_sex', create_type=False), nullable=True),
+        sa.Column('birth_weight', sa.Float(), nullable=True),
+        sa.Column('born_alive', sa.Boolean(), nullable=False),
+        sa.Column('death_date', sa.Date(), nullable=True),
+        sa.Column('death_reason', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['birth_record_id'], ['birth_records.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['sheep.tag_id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('birth_record_id', 'birth_order')
+    )
+    op.create_index(op.f('ix_lambs_id'), 'lambs', ['id'], unique=False)
+    op.create_index(op.f('ix_lambs_birth_record_id'), 'lambs', ['birth_record_id'], unique=False)
+    op.create_index(op.f('ix_lambs_tag_id'), 'lambs', ['tag_id'], unique=False)
+    op.create_index(op.f('ix_lambs_death_date'), 'lambs', ['death_date'], unique=False)
+    op.create_index('ix_lambs_sex_alive', 'lambs', ['sex', 'born_alive'], unique=False)
+    op.create_index(op.f('ix_birth_records_date_lambed'), 'birth_records', ['date_lambed'], unique=False)
+
+    # Backfill from the JSON blobs in batches, then drop the blob column
+    bind = op.get_bind()
+    known_tags = {row[0] for row in bind.execute(sa.text("SELECT tag_id FROM sheep"))}
+    result = bind.execute(sa.text(
+        "SELECT id, lamb_details FROM birth_records WHERE lamb_details IS NOT NULL ORDER BY id"
+    ))
+    while True:
+        batch = result.fetchmany(BACKFILL_BATCH)
+        if not batch:
+            break
+        rows = []
+        for birth_record_id, raw in batch:
+            for row in _parse_lambs(birth_record_id, raw):
+                if row['tag_id'] not in known_tags:
+                    row['tag_id'] = None
+                rows.append(row)
+        if rows:
+            op.bulk_insert(lambs_table, rows)
+
+    op.drop_column('birth_records', 'lamb_details')
+
+def downgrade():
+    op.add_column('birth_records', sa.Column('lamb_details', sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE birth_records SET lamb_details = agg.details
+        FROM (
+            SELECT birth_record_id, json_agg(json_build_object(
+                'tag_id', tag_id,
+                'sex', sex,
+                'birth_weight', birth_weight,
+                'born_alive', born_alive,
+                'death_date', death_date,
+                'death_reason', death_reason
+            ) ORDER BY birth_order)::text AS details
+            FROM lambs GROUP BY birth_record_id
+        ) AS agg
+        WHERE birth_records.id = agg.birth_record_id
+    """)
+    op.drop_index(op.f('ix_birth_records_date_lambed'), table_name='birth_records')
+    op.drop_table('lambs')
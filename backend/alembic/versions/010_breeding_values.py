@@ -0,0 +1,63 @@
+"""genetic evaluations and breeding values
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("CREATE TYPE breeding_trait AS ENUM ('weaning_weight', 'prolificacy')")
+    op.execute("CREATE TYPE evaluation_status AS ENUM ('pending', 'running', 'completed', 'failed')")
+
+    op.create_table(
+        'genetic_evaluations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('trait', postgresql.ENUM('weaning_weight', 'prolificacy', name='breeding_trait', create_type=False), nullable=False),
+        sa.Column('status', postgresql.ENUM('pending', 'running', 'completed', 'failed', name='evaluation_status', create_type=False), nullable=False),
+        sa.Column('animals', sa.Integer(), nullable=True),
+        sa.Column('records', sa.Integer(), nullable=True),
+        sa.Column('iterations', sa.Integer(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_genetic_evaluations_id'), 'genetic_evaluations', ['id'], unique=False)
+    op.create_index(op.f('ix_genetic_evaluations_trait'), 'genetic_evaluations', ['trait'], unique=False)
+
+    op.create_table(
+        'breeding_values',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('trait', postgresql.ENUM('weaning_weight', 'prolificacy', name='breeding_trait', create_type=False), nullable=False),
+        sa.Column('sheep_id', sa.String(20), nullable=False),
+        sa.Column('ebv', sa.Float(), nullable=False),
+        sa.Column('own_records', sa.Integer(), nullable=False),
+        sa.Column('evaluation_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['sheep_id'], ['sheep.tag_id'], ),
+        sa.ForeignKeyConstraint(['evaluation_id'], ['genetic_evaluations.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('trait', 'sheep_id')
+    )
+    op.create_index(op.f('ix_breeding_values_id'), 'breeding_values', ['id'], unique=False)
+    op.create_index(op.f('ix_breeding_values_sheep_id'), 'breeding_values', ['sheep_id'], unique=False)
+    op.create_index('ix_breeding_values_trait_ebv', 'breeding_values', ['trait', 'ebv'], unique=False)
+
+def downgrade():
+    op.drop_table('breeding_values')
+    op.drop_table('genetic_evaluations')
+    op.execute('DROP TYPE evaluation_status')
+    op.execute('DROP TYPE breeding_trait')
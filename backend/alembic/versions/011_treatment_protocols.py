@@ -0,0 +1,67 @@
+"""treatment protocols and due treatments
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'treatment_protocols',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('event_type', postgresql.ENUM('vaccination', 'treatment', 'checkup', 'other', name='event_type', create_type=False), nullable=False),
+        sa.Column('details', sa.Text(), nullable=True),
+        sa.Column('sex', postgresql.ENUM('male', 'female', name='sheep_sex', create_type=False), nullable=True),
+        sa.Column('breed', sa.String(50), nullable=True),
+        sa.Column('section', postgresql.ENUM('male', 'general', 'mating', name='sheep_section', create_type=False), nullable=True),
+        sa.Column('min_age_days', sa.Integer(), nullable=True),
+        sa.Column('max_age_days', sa.Integer(), nullable=True),
+        sa.Column('first_dose_age_days', sa.Integer(), nullable=False),
+        sa.Column('interval_days', sa.Integer(), nullable=True),
+        sa.Column('doses', sa.Integer(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_treatment_protocols_id'), 'treatment_protocols', ['id'], unique=False)
+
+    op.create_table(
+        'due_treatments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('protocol_id', sa.Integer(), nullable=False),
+        sa.Column('sheep_id', sa.String(20), nullable=False),
+        sa.Column('dose_number', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('completed_date', sa.Date(), nullable=True),
+        sa.Column('health_event_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['protocol_id'], ['treatment_protocols.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['sheep_id'], ['sheep.tag_id'], ),
+        sa.ForeignKeyConstraint(['health_event_id'], ['health_events.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('protocol_id', 'sheep_id', 'dose_number')
+    )
+    op.create_index(op.f('ix_due_treatments_id'), 'due_treatments', ['id'], unique=False)
+    op.create_index(op.f('ix_due_treatments_sheep_id'), 'due_treatments', ['sheep_id'], unique=False)
+    op.create_index(
+        'ix_due_treatments_open_due_date', 'due_treatments', ['due_date'],
+        unique=False, postgresql_where=sa.text('completed_date IS NULL')
+    )
+
+def downgrade():
+    op.drop_table('due_treatments')
+    op.drop_table('treatment_protocols')
@@ -0,0 +1,50 @@
+"""background jobs
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("CREATE TYPE job_status AS ENUM ('queued', 'running', 'completed', 'failed', 'cancelled')")
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('status', postgresql.ENUM('queued', 'running', 'completed', 'failed', 'cancelled', name='job_status', create_type=False), nullable=False),
+        sa.Column('params', sa.Text(), nullable=True),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('cancel_requested', sa.Boolean(), nullable=False),
+        sa.Column('worker', sa.String(100), nullable=True),
+        sa.Column('queued_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_id'), 'jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_jobs_kind'), 'jobs', ['kind'], unique=False)
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+
+    op.add_column('genetic_evaluations', sa.Column('job_id', sa.Integer(), nullable=True))
+    op.create_foreign_key('fk_genetic_evaluations_job_id', 'genetic_evaluations', 'jobs', ['job_id'], ['id'])
+
+def downgrade():
+    op.drop_constraint('fk_genetic_evaluations_job_id', 'genetic_evaluations', type_='foreignkey')
+    op.drop_column('genetic_evaluations', 'job_id')
+    op.drop_table('jobs')
+    op.execute('DROP TYPE job_status')
@@ -0,0 +1,138 @@
+"""partition health events by year and add archive tables
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+HEALTH_EVENT_COLUMNS = "id, sheep_id, event_date, event_type, details, next_due_date, attachments, created_at, updated_at"
+
+# Rows dated more than this many years back go to the default partition
+# instead of getting a partition each (guards against mistyped years)
+OLDEST_PARTITION_YEARS = 20
+
+def upgrade():
+    # Unique constraints on a partitioned table must include the partition
+    # key, so health_events.id alone can no longer be referenced
+    op.execute("ALTER TABLE attachments DROP CONSTRAINT IF EXISTS attachments_health_event_id_fkey")
+    op.execute("ALTER TABLE due_treatments DROP CONSTRAINT IF EXISTS due_treatments_health_event_id_fkey")
+
+    op.execute("ALTER TABLE health_events RENAME TO health_events_unpartitioned")
+    op.execute("ALTER TABLE health_events_unpartitioned RENAME CONSTRAINT health_events_pkey TO health_events_unpartitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_health_events_id")
+    op.execute("ALTER SEQUENCE health_events_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE health_events (
+            id integer NOT NULL DEFAULT nextval('health_events_id_seq'),
+            sheep_id varchar(20) NOT NULL REFERENCES sheep (tag_id),
+            event_date date NOT NULL,
+            event_type event_type NOT NULL,
+            details text NOT NULL,
+            next_due_date date,
+            attachments text,
+            created_at date,
+            updated_at date,
+            PRIMARY KEY (id, event_date)
+        ) PARTITION BY RANGE (event_date)
+    """)
+    op.execute("ALTER SEQUENCE health_events_id_seq OWNED BY health_events.id")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            this_year integer := extract(year FROM current_date)::integer;
+            first_year integer;
+        BEGIN
+            SELECT greatest(
+                coalesce(extract(year FROM min(event_date))::integer, this_year),
+                this_year - {OLDEST_PARTITION_YEARS}
+            ) INTO first_year FROM health_events_unpartitioned;
+            FOR y IN first_year .. this_year + 1 LOOP
+                EXECUTE format(
+                    'CREATE TABLE health_events_y%s PARTITION OF health_events FOR VALUES FROM (%L) TO (%L)',
+                    y, make_date(y, 1, 1), make_date(y + 1, 1, 1)
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE health_events_default PARTITION OF health_events DEFAULT")
+    op.create_index(op.f('ix_health_events_id'), 'health_events', ['id'], unique=False)
+    op.create_index('ix_health_events_sheep_date', 'health_events', ['sheep_id', 'event_date'], unique=False)
+    op.create_index(
+        'ix_health_events_next_due_date',
+        'health_events',
+        ['next_due_date'],
+        unique=False,
+        postgresql_where=sa.text('next_due_date IS NOT NULL')
+    )
+    op.execute(f"""
+        INSERT INTO health_events ({HEALTH_EVENT_COLUMNS})
+        SELECT {HEALTH_EVENT_COLUMNS} FROM health_events_unpartitioned
+    """)
+    op.execute("DROP TABLE health_events_unpartitioned")
+
+    # Archive tables mirror their hot tables column for column (LIKE keeps
+    # the order) with archived_at appended, so rows move with
+    # INSERT ... SELECT moved.*, now()
+    for table in ('sheep', 'health_events', 'section_assignments'):
+        op.execute(f"CREATE TABLE {table}_archive (LIKE {table})")
+        op.execute(f"ALTER TABLE {table}_archive ADD COLUMN archived_at timestamp NOT NULL DEFAULT now()")
+        op.execute(f"ALTER TABLE {table}_archive ADD PRIMARY KEY (id)")
+    op.create_index('ix_sheep_archive_tag_id', 'sheep_archive', ['tag_id'], unique=True)
+    op.create_index('ix_health_events_archive_sheep_date', 'health_events_archive', ['sheep_id', 'event_date'], unique=False)
+    op.create_index('ix_section_assignments_archive_sheep_id', 'section_assignments_archive', ['sheep_id'], unique=False)
+
+def downgrade():
+    # Bring archived rows back before dropping the archive tables
+    for table in ('sheep', 'section_assignments'):
+        op.execute(f"""
+            DO $$
+            DECLARE cols text;
+            BEGIN
+                SELECT string_agg(quote_ident(column_name), ', ' ORDER BY ordinal_position) INTO cols
+                FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = '{table}';
+                EXECUTE format('INSERT INTO {table} (%s) SELECT %s FROM {table}_archive', cols, cols);
+            END $$
+        """)
+    op.execute(f"INSERT INTO health_events ({HEALTH_EVENT_COLUMNS}) SELECT {HEALTH_EVENT_COLUMNS} FROM health_events_archive")
+    op.drop_table('section_assignments_archive')
+    op.drop_table('health_events_archive')
+    op.drop_table('sheep_archive')
+
+    op.execute("ALTER TABLE health_events RENAME TO health_events_partitioned")
+    op.execute("ALTER TABLE health_events_partitioned RENAME CONSTRAINT health_events_pkey TO health_events_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_health_events_id")
+    op.execute("ALTER SEQUENCE health_events_id_seq OWNED BY NONE")
+    op.execute("""
+        CREATE TABLE health_events (
+            id integer NOT NULL DEFAULT nextval('health_events_id_seq'),
+            sheep_id varchar(20) NOT NULL REFERENCES sheep (tag_id),
+            event_date date NOT NULL,
+            event_type event_type NOT NULL,
+            details text NOT NULL,
+            next_due_date date,
+            attachments text,
+            created_at date,
+            updated_at date,
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE health_events_id_seq OWNED BY health_events.id")
+    op.execute(f"""
+        INSERT INTO health_events ({HEALTH_EVENT_COLUMNS})
+        SELECT {HEALTH_EVENT_COLUMNS} FROM health_events_partitioned
+    """)
+    op.execute("DROP TABLE health_events_partitioned")
+    op.create_index(op.f('ix_health_events_id'), 'health_events', ['id'], unique=False)
+
+    op.create_foreign_key('attachments_health_event_id_fkey', 'attachments', 'health_events', ['health_event_id'], ['id'])
+    op.create_foreign_key('due_treatments_health_event_id_fkey', 'due_treatments', 'health_events', ['health_event_id'], ['id'])
@@ -0,0 +1,168 @@
+"""farm tenancy: farms table and farm_id on every farm-scoped table
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+FARM_TABLES = (
+    'sheep',
+    'health_events',
+    'section_assignments',
+    'mating_pairs',
+    'birth_records',
+    'lambs',
+    'attachments',
+    'change_log',
+    'gestation_stats',
+    'lambing_calendar',
+    'genetic_evaluations',
+    'breeding_values',
+    'treatment_protocols',
+    'due_treatments',
+    'jobs',
+    'sheep_archive',
+    'health_events_archive',
+    'section_assignments_archive',
+)
+
+# Single-column indexes replaced by ones leading with farm_id:
+# (old index, new index, table, new columns)
+REPLACED_INDEXES = (
+    ('ix_section_assignments_section_period', 'ix_section_assignments_farm_section_period', 'section_assignments', ['farm_id', 'section', 'start_date', 'end_date']),
+    ('ix_mating_pairs_expected_lambing_date', 'ix_mating_pairs_farm_lambing', 'mating_pairs', ['farm_id', 'expected_lambing_date']),
+    ('ix_birth_records_date_lambed', 'ix_birth_records_farm_date', 'birth_records', ['farm_id', 'date_lambed']),
+    ('ix_lambs_sex_alive', 'ix_lambs_farm_sex_alive', 'lambs', ['farm_id', 'sex', 'born_alive']),
+    ('ix_lambing_calendar_lambing_date', None, 'lambing_calendar', None),
+    ('ix_genetic_evaluations_trait', 'ix_genetic_evaluations_farm_trait', 'genetic_evaluations', ['farm_id', 'trait']),
+    ('ix_breeding_values_trait_ebv', 'ix_breeding_values_farm_trait_ebv', 'breeding_values', ['farm_id', 'trait', 'ebv']),
+    ('ix_jobs_status', 'ix_jobs_farm_status', 'jobs', ['farm_id', 'status']),
+)
+
+# Unique constraints that now hold per farm: (table, old name, columns)
+REPLACED_UNIQUES = (
+    ('gestation_stats', 'gestation_stats_breed_key', ['breed']),
+    ('lambing_calendar', 'lambing_calendar_lambing_date_section_key', ['lambing_date', 'section']),
+    ('treatment_protocols', 'treatment_protocols_name_key', ['name']),
+)
+
+def upgrade():
+    op.create_table(
+        'farms',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(50), nullable=False),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('database', sa.String(50), nullable=True),
+        sa.Column('schema_name', sa.String(63), nullable=True),
+        sa.Column('created_at', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_farms_id'), 'farms', ['id'], unique=False)
+    op.create_index(op.f('ix_farms_code'), 'farms', ['code'], unique=True)
+
+    # Everything recorded so far belongs to one farm
+    default_farm_id = op.get_bind().execute(sa.text(
+        "INSERT INTO farms (code, name, created_at, updated_at) "
+        "VALUES ('default', 'Default farm', current_date, current_date) RETURNING id"
+    )).scalar()
+
+    for table in FARM_TABLES:
+        # A constant default fills existing rows without rewriting the table
+        op.add_column(table, sa.Column('farm_id', sa.Integer(), nullable=False, server_default=str(default_farm_id)))
+        op.alter_column(table, 'farm_id', server_default=None)
+        op.create_foreign_key(f'fk_{table}_farm_id', table, 'farms', ['farm_id'], ['id'])
+
+    op.create_index('ix_sheep_farm_status', 'sheep', ['farm_id', 'status', 'current_section'], unique=False)
+    op.create_index('ix_sheep_farm_breed', 'sheep', ['farm_id', 'breed'], unique=False)
+
+    op.create_index('ix_health_events_farm_date', 'health_events', ['farm_id', 'event_date'], unique=False)
+    op.drop_index('ix_health_events_next_due_date', table_name='health_events')
+    op.create_index(
+        'ix_health_events_farm_next_due_date',
+        'health_events',
+        ['farm_id', 'next_due_date'],
+        unique=False,
+        postgresql_where=sa.text('next_due_date IS NOT NULL')
+    )
+
+    op.drop_index('ix_due_treatments_open_due_date', table_name='due_treatments')
+    op.create_index(
+        'ix_due_treatments_farm_open_due_date',
+        'due_treatments',
+        ['farm_id', 'due_date'],
+        unique=False,
+        postgresql_where=sa.text('completed_date IS NULL')
+    )
+
+    for old, new, table, columns in REPLACED_INDEXES:
+        op.drop_index(old, table_name=table)
+        if new:
+            op.create_index(new, table, columns, unique=False)
+
+    for table, old, columns in REPLACED_UNIQUES:
+        op.drop_constraint(old, table, type_='unique')
+        op.create_unique_constraint(f"{table}_farm_id_{'_'.join(columns)}_key", table, ['farm_id'] + columns)
+
+    op.create_index('ix_attachments_farm_id', 'attachments', ['farm_id'], unique=False)
+    op.create_index('ix_change_log_farm_cursor', 'change_log', ['farm_id', 'id'], unique=False)
+    op.create_index('ix_sheep_archive_farm_id', 'sheep_archive', ['farm_id'], unique=False)
+    op.create_index('ix_health_events_archive_farm_id', 'health_events_archive', ['farm_id'], unique=False)
+    op.create_index('ix_section_assignments_archive_farm_id', 'section_assignments_archive', ['farm_id'], unique=False)
+
+def downgrade():
+    op.drop_index('ix_section_assignments_archive_farm_id', table_name='section_assignments_archive')
+    op.drop_index('ix_health_events_archive_farm_id', table_name='health_events_archive')
+    op.drop_index('ix_sheep_archive_farm_id', table_name='sheep_archive')
+    op.drop_index('ix_change_log_farm_cursor', table_name='change_log')
+    op.drop_index('ix_attachments_farm_id', table_name='attachments')
+
+    for table, old, columns in REPLACED_UNIQUES:
+        op.drop_constraint(f"{table}_farm_id_{'_'.join(columns)}_key", table, type_='unique')
+        op.create_unique_constraint(old, table, columns)
+
+    for old, new, table, columns in REPLACED_INDEXES:
+        if new:
+            op.drop_index(new, table_name=table)
+    op.create_index('ix_section_assignments_section_period', 'section_assignments', ['section', 'start_date', 'end_date'], unique=False)
+    op.create_index(op.f('ix_mating_pairs_expected_lambing_date'), 'mating_pairs', ['expected_lambing_date'], unique=False)
+    op.create_index(op.f('ix_birth_records_date_lambed'), 'birth_records', ['date_lambed'], unique=False)
+    op.create_index('ix_lambs_sex_alive', 'lambs', ['sex', 'born_alive'], unique=False)
+    op.create_index(op.f('ix_lambing_calendar_lambing_date'), 'lambing_calendar', ['lambing_date'], unique=False)
+    op.create_index(op.f('ix_genetic_evaluations_trait'), 'genetic_evaluations', ['trait'], unique=False)
+    op.create_index('ix_breeding_values_trait_ebv', 'breeding_values', ['trait', 'ebv'], unique=False)
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+
+    op.drop_index('ix_due_treatments_farm_open_due_date', table_name='due_treatments')
+    op.create_index(
+        'ix_due_treatments_open_due_date',
+        'due_treatments',
+        ['due_date'],
+        unique=False,
+        postgresql_where=sa.text('completed_date IS NULL')
+    )
+    op.drop_index('ix_health_events_farm_next_due_date', table_name='health_events')
+    op.create_index(
+        'ix_health_events_next_due_date',
+        'health_events',
+        ['next_due_date'],
+        unique=False,
+        postgresql_where=sa.text('next_due_date IS NOT NULL')
+    )
+    op.drop_index('ix_health_events_farm_date', table_name='health_events')
+    op.drop_index('ix_sheep_farm_breed', table_name='sheep')
+    op.drop_index('ix_sheep_farm_status', table_name='sheep')
+
+    for table in FARM_TABLES:
+        op.drop_constraint(f'fk_{table}_farm_id', table, type_='foreignkey')
+        op.drop_column(table, 'farm_id')
+    op.drop_table('farms')
@@ -0,0 +1,34 @@
+"""open section intervals for sheep registered without one
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+BACKFILL_REASON = 'Backfilled from current section'
+
+def upgrade():
+    # Sheep created before registration opened an interval were missing from
+    # occupancy and headcounts; they have been in their current section since
+    # they joined the flock as far as we know
+    op.execute(f"""
+        INSERT INTO section_assignments (farm_id, sheep_id, section, start_date, reason, created_at, updated_at)
+        SELECT s.farm_id, s.tag_id, s.current_section, COALESCE(s.purchase_date, s.date_of_birth),
+               '{BACKFILL_REASON}', current_date, current_date
+        FROM sheep s
+        WHERE NOT EXISTS (
+            SELECT 1 FROM section_assignments a
+            WHERE a.sheep_id = s.tag_id AND a.end_date IS NULL
+        )
+    """)
+
+def downgrade():
+    op.execute(f"DELETE FROM section_assignments WHERE reason = '{BACKFILL_REASON}' AND end_date IS NULL")
@@ -0,0 +1,31 @@
+"""drop the legacy health_events.attachments column
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+LEGACY_NOTE = '\n\nLegacy attachments: '
+
+def upgrade():
+    # The free-text list of paths/URLs predates content-addressed attachments
+    # and can't be turned into stored objects; keep what it said in details
+    for table in ('health_events', 'health_events_archive'):
+        op.get_bind().execute(sa.text(
+            f"UPDATE {table} SET details = details || :note || attachments "
+            "WHERE attachments IS NOT NULL AND attachments NOT IN ('', '[]', 'null')"
+        ), {"note": LEGACY_NOTE})
+        op.drop_column(table, 'attachments')
+
+def downgrade():
+    for table in ('health_events', 'health_events_archive'):
+        op.add_column(table, sa.Column('attachments', sa.Text(), nullable=True))
@@ -0,0 +1,26 @@
+"""add a lease to running jobs
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('jobs', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    # Jobs already running get a lease from now, so an upgrade does not fail
+    # them before their worker had a chance to report
+    op.execute(
+        "UPDATE jobs SET lease_expires_at = (now() AT TIME ZONE 'utc') + interval '10 minutes' WHERE status = 'running'"
+    )
+
+def downgrade():
+    op.drop_column('jobs', 'lease_expires_at')
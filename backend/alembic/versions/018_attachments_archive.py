@@ -0,0 +1,42 @@
+"""archive attachments together with their health events
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-20 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+ATTACHMENT_COLUMNS = "id, farm_id, health_event_id, sha256, filename, content_type, size, created_at, updated_at"
+
+def upgrade():
+    # Same layout as the other archive tables (see 013): the hot table's
+    # columns in order with archived_at appended
+    op.execute("CREATE TABLE attachments_archive (LIKE attachments)")
+    op.execute("ALTER TABLE attachments_archive ADD COLUMN archived_at timestamp NOT NULL DEFAULT now()")
+    op.execute("ALTER TABLE attachments_archive ADD PRIMARY KEY (id)")
+    op.create_index('ix_attachments_archive_farm_id', 'attachments_archive', ['farm_id'], unique=False)
+    op.create_index('ix_attachments_archive_health_event_id', 'attachments_archive', ['health_event_id'], unique=False)
+    op.create_index('ix_attachments_archive_sha256', 'attachments_archive', ['sha256'], unique=False)
+
+    # Attachments of events archived before now were left behind in the hot table
+    op.execute(f"""
+        WITH moved AS (
+            DELETE FROM attachments a
+            USING health_events_archive e
+            WHERE a.health_event_id = e.id
+            RETURNING a.*
+        )
+        INSERT INTO attachments_archive ({ATTACHMENT_COLUMNS}, archived_at)
+        SELECT {ATTACHMENT_COLUMNS}, timezone('utc', now()) FROM moved
+    """)
+
+def downgrade():
+    op.execute(f"INSERT INTO attachments ({ATTACHMENT_COLUMNS}) SELECT {ATTACHMENT_COLUMNS} FROM attachments_archive")
+    op.drop_table('attachments_archive')
@@ -0,0 +1,76 @@
+from typing import Optional
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import FarmRoute, SessionLocal, farm_session, get_farm_route
+
+# Requests with these methods never write and may be served by the read replica
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def request_farm(request: Request) -> FarmRoute:
+    """The farm a request is for: FARM_HEADER, by code or id, else DEFAULT_FARM_CODE."""
+    requested = request.headers.get(settings.FARM_HEADER)
+    if not requested:
+        if settings.FARM_HEADER_REQUIRED:
+            raise HTTPException(status_code=400, detail=f"Missing {settings.FARM_HEADER} header")
+        requested = settings.DEFAULT_FARM_CODE
+    farm = get_farm_route(requested)
+    if farm is None:
+        raise HTTPException(status_code=404, detail=f"Farm {requested} not found")
+    return farm
+
+
+def _batch_session(request: Request) -> Optional[Session]:
+    """The shared session of the atomic batch a sub-request belongs to, if any."""
+    return request.scope.get("batch_session")
+
+
+# Dependencies
+def get_write_db(request: Request):
+    batch_db = _batch_session(request)
+    if batch_db is not None:
+        yield batch_db
+        return
+    db = farm_session(request_farm(request))
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_registry_db():
+    """Unscoped primary session, for the farm registry itself."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    batch_db = _batch_session(request)
+    if batch_db is not None:
+        yield batch_db
+        return
+    db = farm_session(request_farm(request), read_only=True)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_db(request: Request):
+    """Scope the session to the request's farm; read-only requests go to the replica.
+
+    Sub-requests of an atomic batch share the batch's session instead.
+    """
+    batch_db = _batch_session(request)
+    if batch_db is not None:
+        yield batch_db
+        return
+    db = farm_session(request_farm(request), read_only=request.method in READ_ONLY_METHODS)
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,8 +1,20 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import sheep, health_events, notifications
+from app.api.v1.endpoints import sheep, health, notifications, mating, calendar, sections, sync, attachments, births, breeding_values, protocols, jobs, debug, farms, batch
 
 api_router = APIRouter()
 
 api_router.include_router(sheep.router, prefix="/sheep", tags=["sheep"])
-api_router.include_router(health_events.router, prefix="/health-events", tags=["health-events"])
-api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"]) 
\ No newline at end of file
+api_router.include_router(health.router, prefix="/health-events", tags=["health-events"])
+api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"]) 
+api_router.include_router(mating.router, prefix="/mating-pairs", tags=["mating-pairs"])
+api_router.include_router(calendar.router, prefix="/calendar", tags=["calendar"])
+api_router.include_router(sections.router, prefix="/sections", tags=["sections"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
+api_router.include_router(attachments.router, prefix="/attachments", tags=["attachments"])
+api_router.include_router(births.router, prefix="/birth-records", tags=["birth-records"])
+api_router.include_router(breeding_values.router, prefix="/breeding-values", tags=["breeding-values"])
+api_router.include_router(protocols.router, prefix="/protocols", tags=["protocols"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
+api_router.include_router(farms.router, prefix="/farms", tags=["farms"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
\ No newline at end of file
@@ -0,0 +1,136 @@
+from typing import List, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.schemas.attachment import AttachmentResponse
+from app.services.attachments import (
+    AttachmentTooLargeError,
+    store_stream,
+    create_attachment,
+    get_attachment,
+    list_attachments,
+    delete_attachment,
+    object_path,
+    thumbnail_path,
+    parse_range,
+    iter_file
+)
+from app.services.health import get_health_event
+from app.services.thumbnails import request_thumbnail
+
+router = APIRouter()
+
+
+@router.post("/", response_model=AttachmentResponse)
+async def upload_attachment(
+    request: Request,
+    health_event_id: int,
+    filename: str,
+    db: Session = Depends(get_db)
+):
+    """Upload a file for a health event as the raw request body (chunked transfer is fine)."""
+    event = await run_in_threadpool(get_health_event, db, health_event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Health event not found")
+
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    try:
+        upload = await store_stream(request.stream())
+    except AttachmentTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    attachment = await run_in_threadpool(
+        create_attachment, db, health_event_id, upload, filename, content_type
+    )
+    request_thumbnail(upload.sha256, content_type)
+    return attachment
+
+
+@router.get("/", response_model=List[AttachmentResponse])
+def list_event_attachments(
+    health_event_id: int,
+    db: Session = Depends(get_db)
+):
+    """List the attachments of a health event."""
+    return list_attachments(db=db, health_event_id=health_event_id)
+
+
+@router.get("/{attachment_id}")
+def download_attachment(
+    attachment_id: int,
+    range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Download an attachment, honouring single byte-range requests."""
+    attachment = get_attachment(db=db, attachment_id=attachment_id)
+    path = object_path(attachment.sha256) if attachment else None
+    if not attachment or not path.exists():
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    size = attachment.size
+    etag = f'"{attachment.sha256}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        # Content-addressed bytes never change
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(attachment.filename)}"
+    }
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    if size == 0:
+        return Response(content=b"", media_type=attachment.content_type, headers=headers)
+
+    try:
+        byte_range = parse_range(range, size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iter_file(path, start, end),
+        status_code=status_code,
+        media_type=attachment.content_type,
+        headers=headers
+    )
+
+
+@router.get("/{attachment_id}/thumbnail")
+def download_thumbnail(
+    attachment_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get an image attachment's thumbnail, generating it in the background if needed."""
+    attachment = get_attachment(db=db, attachment_id=attachment_id)
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+
+    path = thumbnail_path(attachment.sha256)
+    if path.exists():
+        return FileResponse(path, media_type="image/jpeg", headers={"ETag": f'"{attachment.sha256}-thumb"'})
+    if not request_thumbnail(attachment.sha256, attachment.content_type):
+        raise HTTPException(status_code=404, detail="No thumbnail for this attachment type")
+    return Response(status_code=202, content="Thumbnail is being generated")
+
+
+@router.delete("/{attachment_id}")
+def delete_attachment_record(
+    attachment_id: int,
+    db: Session = Depends(get_db)
+):
+    """Delete an attachment."""
+    success = delete_attachment(db=db, attachment_id=attachment_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    return {"message": "Attachment deleted successfully"}
@@ -0,0 +1,146 @@
+import json
+import logging
+from typing import Any, List, Optional
+from urllib.parse import urlencode
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.concurrency import contextmanager_in_threadpool, run_in_threadpool
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from sqlalchemy.orm import Session
+from starlette.middleware.exceptions import ExceptionMiddleware
+from app.core.config import settings
+from app.api.deps import request_farm
+from app.db.session import atomic_farm_session
+from app.schemas.batch import BatchOperation, BatchOperationResult, BatchRequest, BatchResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Parent scope keys that describe the batch route itself
+_ROUTE_SCOPE_KEYS = ("endpoint", "path_params", "route", "router")
+
+
+class _OperationFailed(Exception):
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _dispatcher(app: FastAPI):
+    """The app's routes behind its exception handlers, without its middleware.
+
+    The batch request already went through admission control and profiling
+    once; its operations must not take further admission slots.
+    """
+    dispatcher = getattr(app.state, "batch_dispatcher", None)
+    if dispatcher is None:
+        handlers = {key: handler for key, handler in app.exception_handlers.items() if key not in (500, Exception)}
+        dispatcher = ExceptionMiddleware(AsyncExitStackMiddleware(app.router), handlers=handlers)
+        app.state.batch_dispatcher = dispatcher
+    return dispatcher
+
+
+def _decode_body(content_type: str, body: bytes) -> Optional[Any]:
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+async def _run_operation(request: Request, operation: BatchOperation, db: Optional[Session] = None) -> BatchOperationResult:
+    """Run one operation in-process as a sub-request carrying the batch's headers.
+
+    With ``db`` the operation's session dependencies yield that shared session
+    instead of opening their own.
+    """
+    path, _, raw_query = operation.path.partition("?")
+    if path.rstrip("/") == "/batch":
+        return BatchOperationResult(id=operation.id, status=400, body={"detail": "Batches cannot be nested"})
+    query = "&".join(part for part in (raw_query, urlencode(operation.query, doseq=True)) if part)
+
+    body = b"" if operation.body is None else json.dumps(operation.body).encode()
+    headers = [(k, v) for k, v in request.scope["headers"] if k not in (b"content-length", b"content-type")]
+    if operation.body is not None:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    full_path = settings.API_V1_STR + path
+    scope = {key: value for key, value in request.scope.items() if key not in _ROUTE_SCOPE_KEYS}
+    scope.update(
+        method=operation.method.value,
+        path=full_path,
+        raw_path=full_path.encode(),
+        query_string=query.encode(),
+        headers=headers,
+        batch_session=db
+    )
+
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    response = {"status": 500, "content_type": ""}
+    chunks: List[bytes] = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            for key, value in message.get("headers", []):
+                if key.lower() == b"content-type":
+                    response["content_type"] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await _dispatcher(request.app)(scope, receive, send)
+    except Exception:
+        logger.exception(f"Batch operation {operation.method.value} {operation.path} failed")
+        return BatchOperationResult(id=operation.id, status=500, body={"detail": "Internal Server Error"})
+    return BatchOperationResult(
+        id=operation.id,
+        status=response["status"],
+        body=_decode_body(response["content_type"], b"".join(chunks))
+    )
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, request: Request):
+    """Run several API calls in one round trip, in order.
+
+    Each operation is routed as if it had been sent on its own, with this
+    request's headers (farm, tokens). By default every operation commits
+    on its own and later operations run whatever earlier ones returned. An
+    atomic batch runs them all in one transaction on the primary: it stops
+    at the first operation answering with an error status, rolls back
+    everything and marks the operations after it 424.
+
+    The handler stays async to dispatch the operations; its own blocking
+    work (farm lookup, opening and committing the shared transaction) runs
+    in the threadpool so it never stalls the event loop.
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_MAX_OPERATIONS} operations per batch"
+        )
+
+    if not batch.atomic:
+        results = [await _run_operation(request, operation) for operation in batch.operations]
+        return BatchResponse(atomic=False, results=results)
+
+    farm = await run_in_threadpool(request_farm, request)
+    results = []
+    try:
+        async with contextmanager_in_threadpool(atomic_farm_session(farm)) as db:
+            for index, operation in enumerate(batch.operations):
+                result = await _run_operation(request, operation, db)
+                results.append(result)
+                if result.status >= 400:
+                    raise _OperationFailed(index)
+    except _OperationFailed as failed:
+        results.extend(
+            BatchOperationResult(id=operation.id, status=424, body={"detail": f"Not run: operation {failed.index} failed"})
+            for operation in batch.operations[failed.index + 1:]
+        )
+        return BatchResponse(atomic=True, rolled_back=True, results=results)
+    return BatchResponse(atomic=True, results=results)
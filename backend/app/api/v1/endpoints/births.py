@@ -0,0 +1,56 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.api.deps import get_db
+from app.schemas.birth import (
+    BirthRecordResponse,
+    BulkBirthCreate,
+    LambResponse,
+    LambStatsGroup,
+    LambStatsResponse
+)
+from app.services.births import get_lambs, get_lamb_stats, record_births
+
+router = APIRouter()
+
+
+@router.post("/bulk", response_model=List[BirthRecordResponse])
+def record_bulk_births(
+    births_in: BulkBirthCreate,
+    db: Session = Depends(get_db)
+):
+    """Record births and register their live lambs as sheep, all or nothing."""
+    if len(births_in.births) > settings.BIRTHS_MAX_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BIRTHS_MAX_PER_REQUEST} births per request"
+        )
+    try:
+        return record_births(db=db, births_in=births_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/lamb-stats", response_model=List[LambStatsResponse])
+def read_lamb_stats(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: Optional[LambStatsGroup] = None,
+    db: Session = Depends(get_db)
+):
+    """Get lamb counts, sex ratio, losses and mean birth weight, optionally grouped."""
+    try:
+        return get_lamb_stats(db=db, start_date=start_date, end_date=end_date, group_by=group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{birth_record_id}/lambs", response_model=List[LambResponse])
+def read_birth_record_lambs(
+    birth_record_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get the lambs of a birth record."""
+    return get_lambs(db=db, birth_record_id=birth_record_id)
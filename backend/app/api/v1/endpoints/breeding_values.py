@@ -0,0 +1,60 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.db.models.breeding_value import BreedingTrait
+from app.db.models.sheep import SheepSex
+from app.schemas.breeding_value import BreedingValueResponse, GeneticEvaluationResponse
+from app.services.breeding_values import (
+    start_evaluation,
+    get_evaluation,
+    get_breeding_value_ranking,
+    get_sheep_breeding_values
+)
+
+router = APIRouter()
+
+
+@router.post("/evaluations", response_model=GeneticEvaluationResponse, status_code=202)
+def start_genetic_evaluation(
+    trait: BreedingTrait,
+    db: Session = Depends(get_db)
+):
+    """Start a BLUP evaluation for a trait; poll the evaluation or its job for progress."""
+    return start_evaluation(db=db, trait=trait)
+
+
+@router.get("/evaluations/{evaluation_id}", response_model=GeneticEvaluationResponse)
+def read_genetic_evaluation(
+    evaluation_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get the status of a genetic evaluation."""
+    evaluation = get_evaluation(db=db, evaluation_id=evaluation_id)
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return evaluation
+
+
+@router.get("/", response_model=List[BreedingValueResponse])
+def read_breeding_value_ranking(
+    trait: BreedingTrait,
+    sex: Optional[SheepSex] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Rank rams or ewes on a trait, best breeding value first."""
+    return get_breeding_value_ranking(db=db, trait=trait, sex=sex, skip=skip, limit=limit)
+
+
+@router.get("/{tag_id}", response_model=List[BreedingValueResponse])
+def read_sheep_breeding_values(
+    tag_id: str,
+    db: Session = Depends(get_db)
+):
+    """Get the latest breeding values of a sheep."""
+    values = get_sheep_breeding_values(db=db, tag_id=tag_id)
+    if not values:
+        raise HTTPException(status_code=404, detail="No breeding values for this sheep")
+    return list(values.values())
@@ -0,0 +1,43 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.db.models.sheep import SheepSection
+from app.schemas.lambing import LambingCalendarDayResponse, GestationStatResponse
+from app.services.lambing import (
+    get_lambing_calendar,
+    get_gestation_stats,
+    refresh_lambing_forecasts
+)
+
+router = APIRouter()
+
+
+@router.get("/lambing", response_model=List[LambingCalendarDayResponse])
+def read_lambing_calendar(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[SheepSection] = None,
+    db: Session = Depends(get_db)
+):
+    """Get expected lambings per day and per section."""
+    return get_lambing_calendar(db=db, start_date=start_date, end_date=end_date, section=section)
+
+
+@router.post("/lambing/refresh")
+def refresh_lambing_calendar(
+    full: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Refresh lambing forecasts for changed mating pairs."""
+    updated = refresh_lambing_forecasts(db=db, full=full)
+    return {"message": "Lambing calendar refreshed", "updated_pairs": updated}
+
+
+@router.get("/gestation-stats", response_model=List[GestationStatResponse])
+def list_gestation_stats(
+    db: Session = Depends(get_db)
+):
+    """Get breed-specific gestation statistics."""
+    return get_gestation_stats(db=db)
@@ -0,0 +1,45 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse
+from app.core.config import settings
+from app.core.profiling import list_profiles, profile_path
+from app.core.slow_queries import slow_query_log
+
+router = APIRouter()
+
+
+def require_admin_token(request: Request):
+    """Profiles expose code paths; only admins holding the profiling token may read them."""
+    token = request.headers.get(settings.PROFILING_HEADER)
+    if not settings.PROFILING_ADMIN_TOKEN or token != settings.PROFILING_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Profiling token required")
+
+
+@router.get("/profiles", response_model=List[dict], dependencies=[Depends(require_admin_token)])
+def read_profiles():
+    """List captured request profiles with route and timing metadata, newest first."""
+    return list_profiles()
+
+
+@router.get("/profiles/{name}", dependencies=[Depends(require_admin_token)])
+def download_profile(name: str):
+    """Download a capture as folded stacks, for flamegraph.pl or speedscope."""
+    path = profile_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{name}.folded")
+
+
+@router.get("/slow-queries", response_model=List[dict], dependencies=[Depends(require_admin_token)])
+def read_slow_queries(
+    limit: int = Query(None, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|max_ms|count)$")
+):
+    """Top slow statements in this worker process, with callers, parameter shapes and plans."""
+    return slow_query_log.top(limit, order_by)
+
+
+@router.delete("/slow-queries", status_code=204, dependencies=[Depends(require_admin_token)])
+def reset_slow_queries():
+    """Clear the aggregated slow query statistics of this worker process."""
+    slow_query_log.reset()
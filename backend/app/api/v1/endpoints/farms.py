@@ -0,0 +1,26 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api.deps import get_registry_db
+from app.schemas.farm import FarmCreate, FarmResponse
+from app.services.farms import create_farm, list_farms
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[FarmResponse])
+def list_all_farms(db: Session = Depends(get_registry_db)):
+    """List the farms a request can name in the farm header."""
+    return list_farms(db)
+
+
+@router.post("/", response_model=FarmResponse, status_code=201)
+def create_farm_record(
+    farm_in: FarmCreate,
+    db: Session = Depends(get_registry_db)
+):
+    """Register a farm, optionally in a database or schema of its own."""
+    try:
+        return create_farm(db=db, farm_in=farm_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
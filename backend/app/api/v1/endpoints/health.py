@@ -1,7 +1,8 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.core.encoding import COMPACT_LIST_RESPONSES, negotiate_list
+from app.api.deps import get_db
 from app.schemas.health import (
     HealthEventCreate,
     HealthEventUpdate,
@@ -63,35 +64,44 @@ def delete_health_event_record(
     db: Session = Depends(get_db)
 ):
     """Delete a health event record."""
-    success = delete_health_event(db=db, event_id=event_id)
+    try:
+        success = delete_health_event(db=db, event_id=event_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not success:
         raise HTTPException(status_code=404, detail="Health event not found")
     return {"message": "Health event deleted successfully"}
 
 
-@router.get("/", response_model=List[HealthEventResponse])
+@router.get("/", response_model=List[HealthEventResponse], responses=COMPACT_LIST_RESPONSES)
 def list_health_event_records(
+    request: Request,
+    response: Response,
     sheep_id: Optional[str] = None,
     event_type: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     overdue: Optional[bool] = None,
+    include_archived: bool = Query(False, description="Also list events moved to the archive"),
     db: Session = Depends(get_db)
 ):
-    """List health event records with optional filtering."""
+    """List health event records with optional filtering; see the 200 response for compact encodings."""
     filters = HealthEventFilter(
         sheep_id=sheep_id,
         event_type=event_type,
         start_date=start_date,
         end_date=end_date,
-        overdue=overdue
+        overdue=overdue,
+        include_archived=include_archived
     )
-    return list_health_events(db=db, filters=filters)
+    return negotiate_list(request, response, list_health_events(db=db, filters=filters), HealthEventResponse)
 
 
-@router.get("/overdue/", response_model=List[HealthEventResponse])
+@router.get("/overdue/", response_model=List[HealthEventResponse], responses=COMPACT_LIST_RESPONSES)
 def list_overdue_events(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """List all overdue health events."""
-    return get_overdue_events(db=db) 
\ No newline at end of file
+    return negotiate_list(request, response, get_overdue_events(db=db), HealthEventResponse) 
\ No newline at end of file
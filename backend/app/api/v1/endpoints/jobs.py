@@ -0,0 +1,64 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.jobs import submit_job
+from app.api.deps import get_db, get_write_db
+from app.db.models.job import JobStatus
+from app.schemas.job import JobCreate, JobResponse
+from app.services.jobs import get_job, list_jobs, cancel_job
+
+router = APIRouter()
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+def create_job(
+    job_in: JobCreate,
+    db: Session = Depends(get_db)
+):
+    """Queue a background job; poll GET /jobs/{id} for progress and the result."""
+    try:
+        return submit_job(db=db, kind=job_in.kind, params=job_in.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=List[JobResponse])
+def list_all_jobs(
+    kind: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db)
+):
+    """List jobs, newest first."""
+    return list_jobs(db=db, kind=kind, status=status, skip=skip, limit=limit)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def read_job(
+    job_id: int,
+    db: Session = Depends(get_write_db)
+):
+    """Get a job's status, progress and result.
+
+    Read from the primary: a replica may lag behind a job that just changed.
+    """
+    job = get_job(db=db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.delete("/{job_id}", response_model=JobResponse)
+def cancel_job_record(
+    job_id: int,
+    db: Session = Depends(get_db)
+):
+    """Cancel a queued or running job."""
+    try:
+        job = cancel_job(db=db, job_id=job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,114 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_db, get_read_db
+from app.schemas.mating import (
+    MatingOptimizationRequest,
+    MatingOptimizationResponse,
+    MatingPairCreate,
+    MatingGroupCreate,
+    MatingPairUpdate,
+    MatingPairResponse,
+    MatingPairFilter,
+    MatingPairsCreated
+)
+from app.services.mating import (
+    optimize_mating_assignments,
+    create_mating_pair,
+    create_mating_group,
+    get_mating_pair,
+    list_mating_pairs,
+    update_mating_pair,
+    delete_mating_pair
+)
+
+router = APIRouter()
+
+
+@router.post("/optimize", response_model=MatingOptimizationResponse)
+def optimize_mating_pairs(
+    request: MatingOptimizationRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Suggest ram-ewe pairings that minimize total relationship coefficient."""
+    try:
+        return optimize_mating_assignments(db=db, request=request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/", response_model=MatingPairsCreated)
+def create_new_mating_pair(
+    pair_in: MatingPairCreate,
+    db: Session = Depends(get_db)
+):
+    """Create a mating pair; inbreeding alerts for it come back with the pair."""
+    try:
+        return create_mating_pair(db=db, pair_in=pair_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/groups", response_model=MatingPairsCreated)
+def create_new_mating_group(
+    group_in: MatingGroupCreate,
+    db: Session = Depends(get_db)
+):
+    """Pair a ram with every ewe of a group slot, checking all pairs for inbreeding at once."""
+    try:
+        return create_mating_group(db=db, group_in=group_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=List[MatingPairResponse])
+def list_mating_pair_records(
+    ram_id: Optional[str] = None,
+    ewe_id: Optional[str] = None,
+    group_slot: Optional[int] = None,
+    open_only: bool = Query(False, description="Only pairs that may still lamb"),
+    db: Session = Depends(get_db)
+):
+    """List mating pairs with optional filtering."""
+    filters = MatingPairFilter(ram_id=ram_id, ewe_id=ewe_id, group_slot=group_slot, open_only=open_only)
+    return list_mating_pairs(db=db, filters=filters)
+
+
+@router.get("/{pair_id}", response_model=MatingPairResponse)
+def read_mating_pair(
+    pair_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get a specific mating pair by ID."""
+    pair = get_mating_pair(db=db, pair_id=pair_id)
+    if not pair:
+        raise HTTPException(status_code=404, detail="Mating pair not found")
+    return pair
+
+
+@router.put("/{pair_id}", response_model=MatingPairResponse)
+def update_mating_pair_record(
+    pair_id: int,
+    pair_in: MatingPairUpdate,
+    db: Session = Depends(get_db)
+):
+    """Update a mating pair."""
+    try:
+        pair = update_mating_pair(db=db, pair_id=pair_id, pair_in=pair_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not pair:
+        raise HTTPException(status_code=404, detail="Mating pair not found")
+    return pair
+
+
+@router.delete("/{pair_id}")
+def delete_mating_pair_record(
+    pair_id: int,
+    db: Session = Depends(get_db)
+):
+    """Delete a mating pair."""
+    success = delete_mating_pair(db=db, pair_id=pair_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Mating pair not found")
+    return {"message": "Mating pair deleted successfully"}
@@ -1,11 +1,12 @@
 from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.api.deps import get_db
 from app.services.notifications import (
     get_all_notifications,
     get_health_notifications,
     get_mating_notifications,
+    get_inbreeding_notifications,
     get_weaning_notifications,
     Notification
 )
@@ -42,6 +43,15 @@ def list_mating_notifications(
     return [NotificationResponse.from_notification(n) for n in notifications]
 
 
+@router.get("/inbreeding", response_model=List[NotificationResponse])
+def list_inbreeding_notifications(
+    db: Session = Depends(get_db)
+):
+    """Get inbreeding alerts for open mating pairs."""
+    notifications = get_inbreeding_notifications(db)
+    return [NotificationResponse.from_notification(n) for n in notifications]
+
+
 @router.get("/weaning", response_model=List[NotificationResponse])
 def list_weaning_notifications(
     db: Session = Depends(get_db)
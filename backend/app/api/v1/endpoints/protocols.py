@@ -0,0 +1,126 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.schemas.health import HealthEventResponse
+from app.schemas.protocol import (
+    TreatmentProtocolCreate,
+    TreatmentProtocolUpdate,
+    TreatmentProtocolResponse,
+    DueTreatmentResponse,
+    DueTreatmentCompletion
+)
+from app.services.protocols import (
+    create_protocol,
+    get_protocol,
+    list_protocols,
+    update_protocol,
+    delete_protocol,
+    materialize_due_treatments,
+    get_due_treatments,
+    complete_due_treatments
+)
+
+router = APIRouter()
+
+
+@router.post("/", response_model=TreatmentProtocolResponse)
+def create_new_protocol(
+    protocol_in: TreatmentProtocolCreate,
+    db: Session = Depends(get_db)
+):
+    """Create a recurring treatment protocol."""
+    try:
+        return create_protocol(db=db, protocol_in=protocol_in)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=List[TreatmentProtocolResponse])
+def list_all_protocols(
+    active: Optional[bool] = None,
+    db: Session = Depends(get_db)
+):
+    """List treatment protocols."""
+    return list_protocols(db=db, active=active)
+
+
+@router.get("/due", response_model=List[DueTreatmentResponse])
+def list_due_treatments(
+    until: Optional[date] = None,
+    overdue: bool = False,
+    protocol_id: Optional[int] = None,
+    sheep_id: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 500,
+    db: Session = Depends(get_db)
+):
+    """List open doses due by a date (default today), or only overdue ones."""
+    return get_due_treatments(
+        db=db,
+        until=until,
+        overdue_only=overdue,
+        protocol_id=protocol_id,
+        sheep_id=sheep_id,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.post("/due/complete", response_model=List[HealthEventResponse])
+def complete_treatments(
+    completion: DueTreatmentCompletion,
+    db: Session = Depends(get_db)
+):
+    """Record a batch of given doses as health events."""
+    try:
+        return complete_due_treatments(db=db, completion=completion)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/due/materialize")
+def materialize_treatments(
+    db: Session = Depends(get_db)
+):
+    """Materialize due doses for all active protocols now instead of waiting for the nightly run."""
+    created = materialize_due_treatments(db=db)
+    return {"message": f"{created} due treatments created"}
+
+
+@router.get("/{protocol_id}", response_model=TreatmentProtocolResponse)
+def read_protocol(
+    protocol_id: int,
+    db: Session = Depends(get_db)
+):
+    """Get a treatment protocol by ID."""
+    protocol = get_protocol(db=db, protocol_id=protocol_id)
+    if not protocol:
+        raise HTTPException(status_code=404, detail="Protocol not found")
+    return protocol
+
+
+@router.put("/{protocol_id}", response_model=TreatmentProtocolResponse)
+def update_protocol_record(
+    protocol_id: int,
+    protocol_in: TreatmentProtocolUpdate,
+    db: Session = Depends(get_db)
+):
+    """Update a protocol's details or pause/resume it."""
+    protocol = update_protocol(db=db, protocol_id=protocol_id, protocol_in=protocol_in)
+    if not protocol:
+        raise HTTPException(status_code=404, detail="Protocol not found")
+    return protocol
+
+
+@router.delete("/{protocol_id}")
+def delete_protocol_record(
+    protocol_id: int,
+    db: Session = Depends(get_db)
+):
+    """Delete a protocol and its open doses."""
+    success = delete_protocol(db=db, protocol_id=protocol_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Protocol not found")
+    return {"message": "Protocol deleted successfully"}
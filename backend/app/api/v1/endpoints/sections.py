@@ -0,0 +1,96 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.db.models.sheep import SheepSection
+from app.schemas.sheep import SheepResponse
+from app.schemas.section import (
+    SectionMove,
+    BulkSectionMove,
+    SectionAssignmentResponse,
+    SectionHeadcountResponse
+)
+from app.services.sections import (
+    get_section_occupants,
+    get_section_headcounts,
+    get_section_history,
+    move_sheep,
+    bulk_move_sheep
+)
+
+router = APIRouter()
+
+
+@router.get("/headcount", response_model=List[SectionHeadcountResponse])
+def read_section_headcounts(
+    start_date: date,
+    end_date: date,
+    section: Optional[SheepSection] = None,
+    db: Session = Depends(get_db)
+):
+    """Get the headcount per section for every day in a date range."""
+    try:
+        return get_section_headcounts(db=db, start_date=start_date, end_date=end_date, section=section)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/history/{tag_id}", response_model=List[SectionAssignmentResponse])
+def read_section_history(
+    tag_id: str,
+    db: Session = Depends(get_db)
+):
+    """Get a sheep's section history."""
+    return get_section_history(db=db, tag_id=tag_id)
+
+
+@router.get("/{section}/occupants", response_model=List[SheepResponse])
+def read_section_occupants(
+    section: SheepSection,
+    on_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """Get the sheep that were in a section on a given date (default today)."""
+    return get_section_occupants(db=db, section=section, on_date=on_date or date.today())
+
+
+@router.post("/move", response_model=dict)
+def move_sheep_group(
+    move_in: BulkSectionMove,
+    db: Session = Depends(get_db)
+):
+    """Move a group of sheep to a section."""
+    try:
+        moved = bulk_move_sheep(
+            db=db,
+            tag_ids=move_in.tag_ids,
+            section=move_in.section,
+            move_date=move_in.move_date,
+            reason=move_in.reason
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"message": "Sheep moved successfully", "moved": moved}
+
+
+@router.post("/move/{tag_id}", response_model=SectionAssignmentResponse)
+def move_single_sheep(
+    tag_id: str,
+    move_in: SectionMove,
+    db: Session = Depends(get_db)
+):
+    """Move a sheep to a section."""
+    try:
+        assignment = move_sheep(
+            db=db,
+            tag_id=tag_id,
+            section=move_in.section,
+            move_date=move_in.move_date,
+            reason=move_in.reason
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Sheep not found")
+    return assignment
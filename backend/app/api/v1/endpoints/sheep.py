@@ -1,22 +1,31 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.core.encoding import COMPACT_LIST_RESPONSES, negotiate_list
+from app.api.deps import get_db, get_read_db, get_write_db
 from app.db.models.sheep import Sheep, SheepStatus, SheepSex, SheepSection
 from app.schemas.sheep import (
     SheepCreate,
     SheepUpdate,
     SheepResponse,
-    SheepFilter
+    SheepFilter,
+    TagResolveRequest,
+    TagResolveResponse,
+    AutocompleteSuggestion
 )
+from app.schemas.pedigree import PedigreeValidationReport
 from app.services.sheep import (
     create_sheep,
     get_sheep,
     update_sheep,
     delete_sheep,
     list_sheep,
-    generate_tag_id
+    generate_tag_id,
+    resolve_tag_codes
 )
+from app.services.search import search_sheep, autocomplete_sheep
+from app.services.pedigree_validation import validate_pedigree
+from app.services.archive import restore_sheep
 
 router = APIRouter()
 
@@ -33,13 +42,51 @@ def create_new_sheep(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/resolve", response_model=TagResolveResponse)
+def resolve_sheep_codes(
+    resolve_in: TagResolveRequest,
+    db: Session = Depends(get_read_db)
+):
+    """Resolve a batch of RFID/QR codes to sheep."""
+    return resolve_tag_codes(db=db, codes=resolve_in.codes)
+
+
+@router.get("/pedigree/validation", response_model=PedigreeValidationReport)
+def validate_flock_pedigree(
+    db: Session = Depends(get_db)
+):
+    """Check the whole pedigree for cycles, impossible dates and wrong parent sexes."""
+    return validate_pedigree(db=db)
+
+
+@router.get("/search", response_model=List[SheepResponse])
+def search_sheep_records(
+    q: str = Query(..., min_length=1, description="Partial or misspelled tag, scrapie ID, farm or note text"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Search sheep by identifiers, origin farm and notes, best matches first."""
+    return search_sheep(db=db, q=q, limit=limit)
+
+
+@router.get("/search/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete_sheep_ids(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Suggest tag and scrapie IDs starting with a prefix."""
+    return autocomplete_sheep(db=db, prefix=prefix, limit=limit)
+
+
 @router.get("/{tag_id}", response_model=SheepResponse)
 def read_sheep(
     tag_id: str,
+    include_archived: bool = Query(False, description="Also look in the archive"),
     db: Session = Depends(get_db)
 ):
     """Get a specific sheep by tag ID."""
-    sheep = get_sheep(db=db, tag_id=tag_id)
+    sheep = get_sheep(db=db, tag_id=tag_id, include_archived=include_archived)
     if not sheep:
         raise HTTPException(status_code=404, detail="Sheep not found")
     return sheep
@@ -58,6 +105,21 @@ def update_sheep_record(
     return sheep
 
 
+@router.post("/{tag_id}/restore", response_model=SheepResponse)
+def restore_archived_sheep(
+    tag_id: str,
+    db: Session = Depends(get_write_db)
+):
+    """Move an archived animal and its history back to the active tables."""
+    try:
+        sheep = restore_sheep(db=db, tag_id=tag_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not sheep:
+        raise HTTPException(status_code=404, detail="Archived sheep not found")
+    return sheep
+
+
 @router.delete("/{tag_id}")
 def delete_sheep_record(
     tag_id: str,
@@ -70,22 +132,26 @@ def delete_sheep_record(
     return {"message": "Sheep deleted successfully"}
 
 
-@router.get("/", response_model=List[SheepResponse])
+@router.get("/", response_model=List[SheepResponse], responses=COMPACT_LIST_RESPONSES)
 def list_sheep_records(
+    request: Request,
+    response: Response,
     status: Optional[SheepStatus] = None,
     sex: Optional[SheepSex] = None,
     section: Optional[SheepSection] = None,
     breed: Optional[str] = None,
+    include_archived: bool = Query(False, description="Also list animals moved to the archive"),
     db: Session = Depends(get_db)
 ):
-    """List sheep records with optional filtering."""
+    """List sheep records with optional filtering; see the 200 response for compact encodings."""
     filters = SheepFilter(
         status=status,
         sex=sex,
         section=section,
-        breed=breed
+        breed=breed,
+        include_archived=include_archived
     )
-    return list_sheep(db=db, filters=filters)
+    return negotiate_list(request, response, list_sheep(db=db, filters=filters), SheepResponse)
 
 
 @router.get("/generate-tag/{color_code}", response_model=str)
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.api.deps import get_db
+from app.schemas.sync import SyncChangesResponse
+from app.services.sync import get_changes, get_current_cursor, CursorExpiredError
+
+router = APIRouter()
+
+
+@router.get("/changes", response_model=SyncChangesResponse)
+def read_changes(
+    since: int = Query(0, ge=0, description="Cursor returned by the previous sync"),
+    limit: int = Query(settings.SYNC_BATCH_SIZE, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """Get sheep and health events changed since a cursor, including deletions."""
+    try:
+        return get_changes(db=db, since=since, limit=limit)
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+
+@router.get("/cursor")
+def read_current_cursor(
+    db: Session = Depends(get_db)
+):
+    """Get the current cursor, to take before a full download."""
+    return {"cursor": get_current_cursor(db=db)}
@@ -0,0 +1,111 @@
+"""Parallel, resumable database backups with checksum verification.
+
+Usage:
+    python -m app.cli.backup full [--jobs N]
+    python -m app.cli.backup incremental [--parent NAME | --resume NAME]
+    python -m app.cli.backup list
+    python -m app.cli.backup verify NAME
+    python -m app.cli.backup restore NAME [--database DB] [--resume] [--yes]
+    python -m app.cli.backup drill [NAME] [--keep]
+    python -m app.cli.backup prune [--retention-days N]
+
+Full backups are directory-format pg_dumps taken with --jobs; incrementals
+export rows whose updated_at moved past the previous backup's watermark.
+Restoring a backup replays the full backup and every incremental up to it.
+The drill restores into a scratch database and reports the recovery time.
+"""
+import argparse
+import json
+import sys
+from app.services.backup import (
+    create_full_backup,
+    create_incremental_backup,
+    list_backups,
+    prune_backups,
+    restore_backup,
+    restore_drill,
+    verify_backup,
+    configured_database
+)
+
+
+def _progress(step: str) -> None:
+    sys.stderr.write(f"... {step}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Back up, verify and restore the database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    full = commands.add_parser("full", help="Take a parallel full backup")
+    full.add_argument("--jobs", type=int, help="Parallel dump workers")
+
+    incremental = commands.add_parser("incremental", help="Export rows changed since the last backup")
+    incremental.add_argument("--parent", help="Backup to continue from (default: the latest)")
+    incremental.add_argument("--resume", help="Finish an interrupted incremental")
+    incremental.add_argument("--jobs", type=int, help="Tables exported in parallel")
+
+    commands.add_parser("list", help="List completed backups")
+
+    verify = commands.add_parser("verify", help="Check a backup's files against its checksums")
+    verify.add_argument("name")
+
+    restore = commands.add_parser("restore", help="Restore a backup and its incrementals")
+    restore.add_argument("name")
+    restore.add_argument("--database", help="Database to restore into (default: the configured one)")
+    restore.add_argument("--jobs", type=int, help="Parallel restore workers")
+    restore.add_argument("--resume", action="store_true", help="Continue an interrupted restore")
+    restore.add_argument("--yes", action="store_true", help="Don't ask before replacing the database")
+
+    drill = commands.add_parser("drill", help="Timed restore into a scratch database")
+    drill.add_argument("name", nargs="?", help="Backup to restore (default: the latest)")
+    drill.add_argument("--jobs", type=int, help="Parallel restore workers")
+    drill.add_argument("--keep", action="store_true", help="Keep the scratch database afterwards")
+
+    prune = commands.add_parser("prune", help="Delete expired backups")
+    prune.add_argument("--retention-days", type=int)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "full":
+            manifest = create_full_backup(args.jobs)
+            print(f"{manifest['name']}: {len(manifest['files'])} files in {manifest['total_seconds']}s")
+        elif args.command == "incremental":
+            manifest = create_incremental_backup(args.parent, args.jobs, args.resume)
+            rows = sum(t.get("exported_rows", 0) for t in manifest["tables"].values())
+            print(f"{manifest['name']}: {rows} changed rows since {manifest['parent']} in {manifest['total_seconds']}s")
+        elif args.command == "list":
+            for manifest in list_backups():
+                base = f" (after {manifest['parent']})" if manifest["type"] == "incremental" else ""
+                print(f"{manifest['name']}  {manifest['type']}{base}  {manifest['started_at']}")
+        elif args.command == "verify":
+            problems = verify_backup(args.name)
+            for problem in problems:
+                print(problem)
+            print("OK" if not problems else f"{len(problems)} problems")
+            return 1 if problems else 0
+        elif args.command == "restore":
+            database = args.database or configured_database()
+            if not args.yes and not args.resume:
+                reply = input(f"This will replace database {database}. Are you sure? (y/N) ")
+                if reply.strip().lower() != "y":
+                    print("Restore cancelled")
+                    return 1
+            report = restore_backup(args.name, database, args.jobs, args.resume, _progress)
+            print(json.dumps(report, indent=2))
+        elif args.command == "drill":
+            report = restore_drill(args.name, args.jobs, args.keep, _progress)
+            print(json.dumps(report, indent=2))
+            return 0 if report["passed"] else 1
+        elif args.command == "prune":
+            for name in prune_backups(args.retention_days):
+                print(f"Deleted {name}")
+    except (ValueError, RuntimeError) as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""Validate the whole flock pedigree and print a JSON issue report.
+
+Usage: python -m app.cli.validate_pedigree [--farm CODE] [--output report.json] [--errors-only]
+
+Exits with status 1 when any error-level issue is found, so it can gate
+imports in scripts.
+"""
+import argparse
+import sys
+from app.db.session import SessionLocal, farm_session, get_farm_route
+from app.schemas.pedigree import PedigreeIssueSeverity
+from app.services.pedigree_validation import validate_pedigree
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the flock pedigree for integrity problems.")
+    parser.add_argument("--farm", help="Check one farm's flock (default: every farm together)")
+    parser.add_argument("--output", help="Write the report to this file instead of stdout")
+    parser.add_argument("--errors-only", action="store_true", help="Leave warnings out of the report")
+    args = parser.parse_args(argv)
+
+    if args.farm:
+        farm = get_farm_route(args.farm)
+        if farm is None:
+            parser.error(f"Farm {args.farm} not found")
+        db = farm_session(farm)
+    else:
+        db = SessionLocal()
+    try:
+        report = validate_pedigree(db)
+    finally:
+        db.close()
+
+    if args.errors_only:
+        report.issues = [i for i in report.issues if i.severity == PedigreeIssueSeverity.ERROR]
+    payload = report.model_dump_json(indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        sys.stdout.write(payload + "\n")
+    return 0 if report.valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import asyncio
+import re
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+
+
+class AdmissionPool:
+    """A concurrency limit with a bounded wait queue.
+
+    Up to ``limit`` requests run at once; up to ``queue_size`` more wait for
+    at most ``timeout`` seconds. Anything beyond that is rejected at once, so
+    a burst is shed at the door instead of piling up inside get_db until the
+    connection pool times out.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.limit and self.waiting == 0:
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.queue_size:
+                self.rejected_total += 1
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self.rejected_total += 1
+                return False
+            finally:
+                self.waiting -= 1
+        self.in_flight += 1
+        self.admitted_total += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+def pool_limits() -> Dict[str, int]:
+    """Concurrency limit per pool; the default pool gets the connections the others leave.
+
+    Every admitted request may hold a database connection, so together the
+    pools never admit more requests than the connection pool can serve.
+    """
+    limits = dict(settings.ADMISSION_POOLS)
+    if "default" not in limits:
+        connections = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        limits["default"] = max(connections - sum(limits.values()), 1)
+    return limits
+
+
+class AdmissionController:
+    """Maps each request to an admission pool by method and path."""
+
+    def __init__(self):
+        self.pools: Dict[str, AdmissionPool] = {
+            name: AdmissionPool(
+                name,
+                limit,
+                settings.ADMISSION_QUEUE_SIZES.get(name, settings.ADMISSION_QUEUE_SIZES.get("default", 0)),
+                settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+            )
+            for name, limit in pool_limits().items()
+        }
+        self.routes: List[Tuple[re.Pattern, str]] = [
+            (re.compile(pattern), pool) for pattern, pool in settings.ADMISSION_ROUTE_POOLS.items()
+        ]
+
+    def pool_for(self, method: str, path: str) -> Optional[AdmissionPool]:
+        if not path.startswith(settings.API_V1_STR):
+            return None
+        key = f"{method} {path}"
+        for pattern, pool in self.routes:
+            if pattern.search(key):
+                return self.pools.get(pool)
+        return self.pools.get("default")
+
+    def metrics(self) -> str:
+        """Prometheus text exposition of per-pool admission state."""
+        lines = []
+        for metric, kind, help_text, attr in (
+            ("admission_in_flight", "gauge", "Requests currently executing", "in_flight"),
+            ("admission_queue_depth", "gauge", "Requests waiting for a slot", "waiting"),
+            ("admission_limit", "gauge", "Concurrent request limit", "limit"),
+            ("admission_admitted_total", "counter", "Requests admitted", "admitted_total"),
+            ("admission_rejected_total", "counter", "Requests shed with 503", "rejected_total"),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for pool in self.pools.values():
+                lines.append(f'{metric}{{pool="{pool.name}"}} {getattr(pool, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying per-route concurrency limits.
+
+    Limits are per worker process. The pools share the database pool
+    (DB_POOL_SIZE + DB_MAX_OVERFLOW) so admitted requests never wait for a
+    connection, and heavy routes keep their own smaller pool so they cannot
+    starve cheap lookups. Installed inside CORSMiddleware, so a 503 still
+    carries the CORS headers a browser needs to read it.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        pool = self.controller.pool_for(scope["method"], scope["path"])
+        if pool is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await pool.acquire():
+            await self._reject(send, pool)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            pool.release()
+
+    async def _reject(self, send, pool: AdmissionPool) -> None:
+        body = f'{{"detail":"Server busy ({pool.name} requests), retry later"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+admission_controller = AdmissionController()
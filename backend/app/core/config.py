@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl, validator
 
@@ -31,11 +31,134 @@ class Settings(BaseSettings):
             return v
         return f"postgresql://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/{values.get('POSTGRES_DB')}"
 
+    # Optional read replica; read-only requests are routed here when set
+    SQLALCHEMY_READ_REPLICA_URI: str | None = None
+
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 disables the timeout
+
+    # Admission control (per worker process). Requests are matched against
+    # ADMISSION_ROUTE_POOLS as "METHOD /path" regexes; unmatched API requests
+    # use the "default" pool. Unless set here, the default pool gets the
+    # database connections (DB_POOL_SIZE + DB_MAX_OVERFLOW) the other pools
+    # leave over.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_POOLS: Dict[str, int] = {"heavy": 4}
+    ADMISSION_QUEUE_SIZES: Dict[str, int] = {"default": 50, "heavy": 8}
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    ADMISSION_ROUTE_POOLS: Dict[str, str] = {
+        r"^GET /api/v1/sheep/?$": "heavy",
+        r"^GET /api/v1/sheep/search": "heavy",
+        r"^GET /api/v1/sheep/pedigree/": "heavy",
+        r"^GET /api/v1/notifications": "heavy",
+        r"^GET /api/v1/sections/headcount": "heavy",
+        r"^GET /api/v1/sync/changes": "heavy",
+        r"^GET /api/v1/birth-records/lamb-stats": "heavy",
+        r"^POST /api/v1/mating-pairs/optimize": "heavy",
+        r"^POST /api/v1/batch": "heavy",
+        r"^POST /api/v1/birth-records/bulk": "heavy",
+    }
+
+    # Farm tenancy. Requests name their farm in FARM_HEADER (code or id) and
+    # fall back to DEFAULT_FARM_CODE. A farm may live in a database of its own
+    # (farms.database names an entry of FARM_DATABASES, name -> URI) or in a
+    # PostgreSQL schema of its own (farms.schema_name).
+    FARM_HEADER: str = "X-Farm"
+    FARM_HEADER_REQUIRED: bool = False
+    DEFAULT_FARM_CODE: str = "default"
+    FARM_DATABASES: Dict[str, str] = {}
+    FARM_CACHE_SECONDS: int = 60
+
+    # Batch endpoint (POST /batch)
+    BATCH_MAX_OPERATIONS: int = 50
+
+    # Archival: sold/deceased animals leave the hot tables this long after
+    # their sale or death date, and health events once dated (and due)
+    # before the retention window
+    ARCHIVE_INACTIVE_AFTER_DAYS: int = 730
+    HEALTH_EVENT_RETENTION_DAYS: int = 1095
+    ARCHIVE_BATCH_SIZE: int = 1000
+    HEALTH_EVENT_PARTITIONS_AHEAD_YEARS: int = 1
+
+    # Backups (python -m app.cli.backup); needs the PostgreSQL client tools
+    BACKUP_DIR: str = "/backups"
+    BACKUP_JOBS: int = 4  # parallel pg_dump/pg_restore workers and table exports
+    BACKUP_RETENTION_DAYS: int = 7
+
+    # Slow query log; SELECTs over the threshold also get an EXPLAIN ANALYZE
+    # captured in the background (PostgreSQL only)
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: int = 250
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 600  # per distinct statement
+    SLOW_QUERY_EXPLAIN_QUEUE_SIZE: int = 4
+    SLOW_QUERY_MAX_ENTRIES: int = 500
+    SLOW_QUERY_TOP_N: int = 20
+
+    # Request profiling (off unless enabled; requests opt in with the admin
+    # token in PROFILING_HEADER, or are sampled at PROFILING_SAMPLE_RATE)
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile-Token"
+    PROFILING_ADMIN_TOKEN: str | None = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILE_STORAGE_DIR: str = "data/profiles"
+    PROFILE_MAX_FILES: int = 200
+
     # JWT
     SECRET_KEY: str = "your-secret-key-here"  # Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_MAX_TASKS_PER_WORKER: int = 20  # worker processes are replaced after this many jobs
+    JOB_PROGRESS_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 600  # a running job not heard from for this long is failed on startup
+
+    # Scheduler leader election (one worker process runs scheduled jobs)
+    SCHEDULER_LEADER_LOCK_KEY: int = 7291002
+    SCHEDULER_ELECTION_INTERVAL_SECONDS: int = 15
+    SCHEDULER_LEASE_SECONDS: int = 45
+
+    # Breeding
+    DEFAULT_GESTATION_DAYS: int = 150
+    DEFAULT_GESTATION_STD_DAYS: float = 2.5
+    LAMBING_FORECAST_REFRESH_MINUTES: int = 15
+    MATING_INBREEDING_ALERT_THRESHOLD: float = 0.0625  # expected lamb inbreeding of a first-cousin mating
+    WEANING_AGE_DAYS: int = 90
+    BIRTHS_MAX_PER_REQUEST: int = 200
+
+    # Genetic evaluation (BLUP breeding values)
+    EBV_WEANING_WEIGHT_HERITABILITY: float = 0.20
+    EBV_PROLIFICACY_HERITABILITY: float = 0.10
+    EBV_PROLIFICACY_REPEATABILITY: float = 0.15
+    EBV_ACCOUNT_FOR_INBREEDING: bool = False
+    EBV_SOLVER_TOLERANCE: float = 1e-8
+    EBV_MAX_ITERATIONS: int = 5000
+
+    # Treatment protocols
+    PROTOCOL_DUE_HORIZON_DAYS: int = 30  # how far ahead due doses are materialized
+
+    # Offline sync
+    SYNC_BATCH_SIZE: int = 500
+    SYNC_CHANGE_RETENTION_DAYS: int = 90
+
+    # Attachments
+    ATTACHMENT_STORAGE_DIR: str = "data/attachments"
+    ATTACHMENT_MAX_BYTES: int = 50 * 1024 * 1024
+    ATTACHMENT_CHUNK_SIZE: int = 1024 * 1024
+    THUMBNAIL_SIZE: int = 256
+    THUMBNAIL_WORKERS: int = 2
+
+    # Search
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.3
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,106 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+import json
+import msgpack
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+COLUMNAR_JSON = "application/vnd.kamureito.columnar+json"
+COLUMNAR_MSGPACK = "application/vnd.kamureito.columnar+msgpack"
+
+# Media types a list endpoint can answer with, in order of preference when
+# the client accepts several equally
+LIST_MEDIA_TYPES = (JSON, COLUMNAR_JSON, MSGPACK, COLUMNAR_MSGPACK)
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+# String columns with at most this many distinct values, and fewer distinct
+# values than half the rows, are sent as indexes into a dictionary
+MAX_DICTIONARY_SIZE = 256
+
+# OpenAPI entries for endpoints that answer with negotiate_list
+COMPACT_LIST_RESPONSES = {
+    200: {
+        "description": (
+            f"Rows as JSON by default; send Accept: {MSGPACK} for the same rows as MessagePack, "
+            f"or {COLUMNAR_JSON} / {COLUMNAR_MSGPACK} for the columnar layout"
+        ),
+        "content": {media_type: {} for media_type in LIST_MEDIA_TYPES[1:]},
+    }
+}
+
+
+def negotiate_media_type(accept: Optional[str], offered: Sequence[str] = LIST_MEDIA_TYPES) -> str:
+    """Pick the offered media type the Accept header prefers, falling back to JSON."""
+    if not accept:
+        return JSON
+    ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_range, *params = [p.strip() for p in part.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            ranges.append((-quality, position, _ALIASES.get(media_range.lower(), media_range.lower())))
+    for _, _, media_range in sorted(ranges):
+        if media_range in offered:
+            return media_range
+        if media_range in ("*/*", "application/*"):
+            return offered[0]
+    return JSON
+
+
+def to_columns(rows: List[Dict[str, Any]], fields: List[str]) -> Dict[str, Any]:
+    """Turn rows into one array per field, dictionary-encoding repetitive string columns.
+
+    The result holds ``columns`` (field names), ``data`` (one value array per
+    field, in the same order) and ``dictionaries``: for each dictionary-encoded
+    field, the distinct values its array indexes into.
+    """
+    data = []
+    dictionaries = {}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        distinct = {v for v in values if v is not None}
+        if (
+            distinct
+            and all(isinstance(v, str) for v in distinct)
+            and len(distinct) <= MAX_DICTIONARY_SIZE
+            and len(distinct) * 2 < len(values)
+        ):
+            dictionary = sorted(distinct)
+            codes = {value: code for code, value in enumerate(dictionary)}
+            values = [None if v is None else codes[v] for v in values]
+            dictionaries[field] = dictionary
+        data.append(values)
+    return {"count": len(rows), "columns": fields, "data": data, "dictionaries": dictionaries}
+
+
+def negotiate_list(request: Request, response: Response, items: List[Any], model: Type[BaseModel]):
+    """Answer a list endpoint in the representation the client's Accept header asks for.
+
+    Plain JSON returns ``items`` untouched, for the route's response_model
+    to serialize as usual; the compact representations are encoded here
+    from the same ``model``.
+    """
+    response.headers["Vary"] = "Accept"
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    if media_type == JSON:
+        return items
+
+    rows = [model.model_validate(item).model_dump(mode="json") for item in items]
+    if media_type in (COLUMNAR_JSON, COLUMNAR_MSGPACK):
+        payload = to_columns(rows, list(model.model_fields))
+    else:
+        payload = rows
+
+    if media_type in (MSGPACK, COLUMNAR_MSGPACK):
+        content = msgpack.packb(payload, use_bin_type=True)
+    else:
+        content = json.dumps(payload, separators=(",", ":")).encode()
+    return Response(content=content, media_type=media_type, headers={"Vary": "Accept"})
@@ -0,0 +1,297 @@
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.job import Job, JobStatus
+from app.db.session import call_after_commit, farm_session, farm_session_for_id, list_farm_routes
+
+logger = logging.getLogger(__name__)
+
+# Job kinds and the "module:function" that runs them. Handlers are resolved by
+# name inside the worker process, so they must be importable top-level
+# functions taking (ctx: JobContext, **params) and returning a JSON-able result.
+JOB_HANDLERS: Dict[str, str] = {
+    "validate_pedigree": "app.services.pedigree_validation:validate_pedigree_job",
+    "evaluate_breeding_values": "app.services.breeding_values:evaluation_job",
+    "materialize_treatments": "app.services.protocols:materialize_job",
+    "rebuild_lambing_forecasts": "app.services.lambing:rebuild_forecasts_job",
+    "archive_records": "app.services.archive:archive_job",
+}
+
+# Cleanup for job kinds that leave state behind when they never get to run
+# their handler to the end: cancelled while queued, lost with their worker
+# or abandoned by a dead process. Called as (db, error, **params) inside the
+# transaction that finishes the job.
+JOB_CLEANUP_HANDLERS: Dict[str, str] = {
+    "evaluate_breeding_values": "app.services.breeding_values:abandon_evaluation_job",
+}
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once cancellation of its job was requested."""
+
+
+class JobContext:
+    """Handed to a running handler to report progress and observe cancellation.
+
+    Progress writes use their own short sessions, throttled to one per
+    JOB_PROGRESS_INTERVAL_SECONDS, so they never touch the handler's
+    transaction. Every write also renews the job's lease.
+    """
+
+    def __init__(self, job_id: int, farm_id: int):
+        self.job_id = job_id
+        self.farm_id = farm_id
+        self._last_write = 0.0
+
+    def open_session(self) -> Session:
+        """A session scoped to the job's farm, for the handler's own work."""
+        return farm_session_for_id(self.farm_id)
+
+    def progress(self, fraction: float, message: Optional[str] = None, force: bool = False) -> None:
+        """Record progress in [0, 1]; raises JobCancelled if the job was cancelled."""
+        self._report(fraction, message, force)
+
+    def heartbeat(self) -> None:
+        """Renew the lease and observe cancellation without reporting progress.
+
+        Throttled like progress, so it is cheap enough to call from every
+        iteration of a long computation.
+        """
+        self._report(None, None, False)
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested; for loops without progress to report."""
+        db = self.open_session()
+        try:
+            cancelled = db.query(Job.cancel_requested).filter(Job.id == self.job_id).scalar()
+        finally:
+            db.close()
+        if cancelled:
+            raise JobCancelled()
+
+    def _report(self, fraction: Optional[float], message: Optional[str], force: bool) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_write < settings.JOB_PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_write = now
+        db = self.open_session()
+        try:
+            job = db.query(Job).filter(Job.id == self.job_id).first()
+            if fraction is not None:
+                job.progress = min(max(fraction, 0.0), 1.0)
+            if message is not None:
+                job.message = message
+            job.lease_expires_at = _lease_expiry()
+            cancelled = job.cancel_requested
+            db.commit()
+        finally:
+            db.close()
+        if cancelled:
+            raise JobCancelled()
+
+
+def _lease_expiry() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+
+def _resolve_handler(kind: str, handlers: Dict[str, str] = JOB_HANDLERS) -> Callable:
+    module_name, function_name = handlers[kind].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def abandon_job(db: Session, job: Job, status: JobStatus, error: Optional[str] = None) -> None:
+    """Finish a job whose handler will not run to the end, and clean up after it.
+
+    The caller holds the job row locked and commits.
+    """
+    job.status = status
+    job.finished_at = datetime.utcnow()
+    job.lease_expires_at = None
+    job.error = error
+    if job.kind in JOB_CLEANUP_HANDLERS:
+        params = json.loads(job.params) if job.params else {}
+        _resolve_handler(job.kind, JOB_CLEANUP_HANDLERS)(db, error or "Cancelled", **params)
+
+
+def _finish(job_id: int, farm_id: int, status: JobStatus, result: Any = None, error: Optional[str] = None) -> None:
+    db = farm_session_for_id(farm_id)
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        job.lease_expires_at = None
+        if status == JobStatus.COMPLETED:
+            job.progress = 1.0
+            job.result = json.dumps(result, default=str) if result is not None else None
+        job.error = error
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_job(job_id: int, farm_id: int) -> None:
+    """Execute a queued job; runs inside a worker process."""
+    db = farm_session_for_id(farm_id)
+    try:
+        job = db.query(Job).filter(Job.id == job_id).with_for_update().first()
+        if not job or job.status != JobStatus.QUEUED:
+            return
+        if job.cancel_requested:
+            abandon_job(db, job, JobStatus.CANCELLED)
+            db.commit()
+            return
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        job.lease_expires_at = _lease_expiry()
+        job.worker = f"{socket.gethostname()}:{os.getpid()}"
+        kind = job.kind
+        params = json.loads(job.params) if job.params else {}
+        db.commit()
+    finally:
+        db.close()
+
+    try:
+        result = _resolve_handler(kind)(JobContext(job_id, farm_id), **params)
+    except JobCancelled:
+        _finish(job_id, farm_id, JobStatus.CANCELLED)
+    except Exception as e:
+        logger.exception(f"Job {job_id} ({kind}) failed")
+        _finish(job_id, farm_id, JobStatus.FAILED, error=str(e))
+    else:
+        _finish(job_id, farm_id, JobStatus.COMPLETED, result=result)
+
+
+class JobRunner:
+    """Bounded process pool that executes jobs off the request path.
+
+    Workers are spawned rather than forked, so they never inherit the web
+    process's connection pool or threads, and are recycled after
+    JOB_MAX_TASKS_PER_WORKER jobs to cap memory growth from large solves.
+    Job ids are only unique within a farm's database, so jobs are tracked by
+    (farm_id, job_id).
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[Tuple[int, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.JOB_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=settings.JOB_MAX_TASKS_PER_WORKER
+            )
+        return self._executor
+
+    def submit(self, job_id: int, farm_id: int) -> None:
+        with self._lock:
+            future = self._get_executor().submit(run_job, job_id, farm_id)
+            self._futures[(farm_id, job_id)] = future
+        future.add_done_callback(lambda f: self._done(job_id, farm_id, f))
+
+    def _done(self, job_id: int, farm_id: int, future: Future) -> None:
+        with self._lock:
+            self._futures.pop((farm_id, job_id), None)
+        if not future.cancelled() and future.exception():
+            # The worker died (e.g. killed for memory) before recording an outcome
+            logger.error(f"Job {job_id} worker failed: {future.exception()}")
+            db = farm_session_for_id(farm_id)
+            try:
+                job = db.query(Job).filter(
+                    Job.id == job_id,
+                    Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+                ).with_for_update().first()
+                if job:
+                    abandon_job(db, job, JobStatus.FAILED, str(future.exception()))
+                    db.commit()
+            finally:
+                db.close()
+
+    def cancel_queued(self, job_id: int, farm_id: int) -> bool:
+        """Drop a job that has not started yet from this process's queue."""
+        with self._lock:
+            future = self._futures.get((farm_id, job_id))
+        return bool(future and future.cancel())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._futures.clear()
+
+
+job_runner = JobRunner()
+
+
+def submit_job(db: Session, kind: str, params: Optional[dict] = None) -> Job:
+    """Persist a job for the session's farm and queue it on the worker pool."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(kind=kind, status=JobStatus.QUEUED, params=json.dumps(params or {}, default=str))
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    job_id, farm_id = job.id, job.farm_id
+    # A job submitted inside a larger transaction is only visible to the
+    # worker once that commits
+    call_after_commit(db, lambda: job_runner.submit(job_id, farm_id))
+    return job
+
+
+def fail_expired_jobs(db: Session) -> int:
+    """Fail the session farm's running jobs whose worker stopped renewing the lease.
+
+    Such a job lost its process (stopped, killed or crashed with the host)
+    and will never finish. It is failed rather than requeued because not
+    every handler is safe to run twice.
+    """
+    expired = db.query(Job).filter(
+        Job.status == JobStatus.RUNNING,
+        Job.lease_expires_at < datetime.utcnow()
+    ).with_for_update().all()
+    for job in expired:
+        abandon_job(db, job, JobStatus.FAILED, f"Worker {job.worker} stopped without finishing the job")
+    db.commit()
+    return len(expired)
+
+
+def resume_queued_jobs() -> int:
+    """Queue jobs left waiting by a stopped process and fail those it left running.
+
+    Safe with several web processes doing the same: a worker locks the row
+    and skips any job that is no longer queued, so each job runs once, and
+    running jobs of live processes keep renewing their lease.
+    """
+    queued = []
+    for farm in list_farm_routes():
+        db = farm_session(farm)
+        try:
+            failed = fail_expired_jobs(db)
+            if failed:
+                logger.warning(f"Failed {failed} jobs of farm {farm.code} abandoned by their worker")
+            queued.extend(
+                (job_id, farm.id) for job_id, in db.query(Job.id).filter(Job.status == JobStatus.QUEUED).all()
+            )
+        finally:
+            db.close()
+    for job_id, farm_id in queued:
+        job_runner.submit(job_id, farm_id)
+    return len(queued)
+
+
+def shutdown_job_workers() -> None:
+    """Stop the job worker pool; jobs not yet started stay queued for the next start."""
+    job_runner.shutdown()
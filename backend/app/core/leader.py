@@ -0,0 +1,134 @@
+import functools
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import or_, text
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.db.models.scheduler_lease import SchedulerLease
+from app.db.session import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerLeader:
+    """Elects the single worker process that runs scheduled jobs.
+
+    On Postgres the leader holds a session-level advisory lock on a dedicated
+    connection. If the process dies its connection closes, Postgres releases
+    the lock and the next election tick in another worker takes over. Other
+    backends use a lease row that the leader renews; it fails over once the
+    lease expires.
+    """
+
+    def __init__(self, name: str = "scheduler"):
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def elect(self) -> bool:
+        """Acquire or confirm leadership; returns whether this process leads."""
+        with self._lock:
+            was_leader = self.is_leader
+            try:
+                if engine.dialect.name == "postgresql":
+                    self.is_leader = self._hold_advisory_lock()
+                else:
+                    self.is_leader = self._renew_lease()
+            except Exception as e:
+                logger.error(f"Scheduler leader election failed: {str(e)}")
+                self._close_connection()
+                self.is_leader = False
+
+            if self.is_leader and not was_leader:
+                logger.info(f"Scheduler leadership acquired by {self.holder}")
+            elif was_leader and not self.is_leader:
+                logger.warning(f"Scheduler leadership lost by {self.holder}")
+            return self.is_leader
+
+    def release(self) -> None:
+        """Give up leadership so another worker can take over immediately."""
+        with self._lock:
+            try:
+                if self._connection is not None:
+                    self._connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": settings.SCHEDULER_LEADER_LOCK_KEY}
+                    )
+                elif self.is_leader:
+                    with SessionLocal() as db:
+                        db.query(SchedulerLease).filter(
+                            SchedulerLease.name == self.name,
+                            SchedulerLease.holder == self.holder
+                        ).update({"expires_at": datetime.utcnow()}, synchronize_session=False)
+                        db.commit()
+            except Exception as e:
+                logger.error(f"Error releasing scheduler leadership: {str(e)}")
+            finally:
+                self._close_connection()
+                self.is_leader = False
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _hold_advisory_lock(self) -> bool:
+        if self._connection is not None:
+            # Fails if the connection died, in which case the lock is gone too
+            self._connection.execute(text("SELECT 1"))
+            return True
+
+        connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {"key": settings.SCHEDULER_LEADER_LOCK_KEY}
+        ).scalar()
+        if acquired:
+            self._connection = connection
+        else:
+            connection.close()
+        return bool(acquired)
+
+    def _renew_lease(self) -> bool:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=settings.SCHEDULER_LEASE_SECONDS)
+        with SessionLocal() as db:
+            renewed = db.query(SchedulerLease).filter(
+                SchedulerLease.name == self.name,
+                or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+            ).update({"holder": self.holder, "expires_at": expires_at}, synchronize_session=False)
+            if not renewed:
+                if db.query(SchedulerLease.id).filter(SchedulerLease.name == self.name).first():
+                    db.rollback()
+                    return False
+                db.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=expires_at))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker created the lease first
+                db.rollback()
+                return False
+        return True
+
+
+scheduler_leader = SchedulerLeader()
+
+
+def leader_only(job):
+    """Run a scheduled job only in the worker that currently holds leadership."""
+    @functools.wraps(job)
+    def wrapper(*args, **kwargs):
+        if not scheduler_leader.elect():
+            logger.debug(f"Skipping {job.__name__}: not the scheduler leader")
+            return None
+        return job(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,186 @@
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import Context, ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+# Frames a thread sits in while idle; such threads are left out of samples
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+# The sampler of the request being profiled, visible in the threadpool
+# workers that run its sync endpoints and dependencies
+_active_sampler: ContextVar[Optional["StackSampler"]] = ContextVar("profiling_sampler", default=None)
+
+
+class StackSampler:
+    """Statistical profiler: samples the profiled request's stacks on a fixed interval.
+
+    Only the thread that started the sampler and threadpool workers running
+    in the request's context are sampled, so concurrent requests stay out
+    of the capture. Stacks are aggregated in the folded format
+    (``root;caller;callee count``) read by flamegraph.pl, speedscope and
+    similar tools, rooted at their thread name.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._owner: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._owner = threading.get_ident()
+        _active_sampler.set(self)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (thread_id != self._owner and not self._runs_for_request(frame)):
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def _runs_for_request(self, frame) -> bool:
+        # Threadpool workers keep the context copied from the request in a
+        # local of their run loop while running its code
+        while frame is not None:
+            if "context" in frame.f_code.co_varnames:
+                context = frame.f_locals.get("context")
+                if isinstance(context, Context) and context.get(_active_sampler) is self:
+                    return True
+            frame = frame.f_back
+        return False
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _storage_dir() -> Path:
+    return Path(settings.PROFILE_STORAGE_DIR)
+
+
+def save_profile(sampler: StackSampler, metadata: dict) -> str:
+    """Write a capture as <name>.folded plus <name>.json and prune old captures."""
+    directory = _storage_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", metadata["route"]).strip("-") or "root"
+    name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{metadata['method'].lower()}-{slug}-{uuid.uuid4().hex[:6]}"
+    metadata = dict(metadata, name=name, samples=sampler.samples, interval_ms=sampler.interval * 1000)
+    (directory / f"{name}.folded").write_text(sampler.folded())
+    (directory / f"{name}.json").write_text(json.dumps(metadata))
+
+    captures = sorted(directory.glob("*.json"))
+    for old in captures[:max(len(captures) - settings.PROFILE_MAX_FILES, 0)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+    return name
+
+
+def list_profiles() -> List[Dict]:
+    """Metadata of stored captures, newest first."""
+    directory = _storage_dir()
+    if not directory.exists():
+        return []
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(name: str) -> Optional[Path]:
+    """Path of a stored capture's folded stacks, or None for unknown or unsafe names."""
+    if not re.fullmatch(r"[A-Za-z0-9-]+", name):
+        return None
+    path = _storage_dir() / f"{name}.folded"
+    return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles selected requests.
+
+    A request is profiled when it carries PROFILING_HEADER set to
+    PROFILING_ADMIN_TOKEN, or at random with probability
+    PROFILING_SAMPLE_RATE. Only installed when PROFILING_ENABLED is set, so
+    it costs nothing otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode()
+
+    def _wanted(self, scope) -> bool:
+        if settings.PROFILING_ADMIN_TOKEN:
+            for key, value in scope.get("headers", []):
+                if key == self.header:
+                    return secrets.compare_digest(value, settings.PROFILING_ADMIN_TOKEN.encode())
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+        started_at = datetime.utcnow()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            sampler.stop()
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            # Writing and pruning captures is file I/O; keep it off the event loop
+            await run_in_threadpool(save_profile, sampler, {
+                "method": scope["method"],
+                "route": route,
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode(),
+                "status": status.get("code"),
+                "started_at": started_at.isoformat(),
+                "duration_ms": round(duration * 1000, 2),
+            })
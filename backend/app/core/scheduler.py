@@ -1,9 +1,18 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from typing import Callable
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from app.db.session import farm_session, list_farm_routes
 from app.services.notifications import get_all_notifications
+from app.services.lambing import refresh_lambing_forecasts
+from app.services.changes import prune_change_log
+from app.services.breeding_values import start_evaluation
+from app.db.models.breeding_value import BreedingTrait
+from app.services.protocols import materialize_due_treatments
 from app.core.config import settings
+from app.core.leader import scheduler_leader, leader_only
+from app.core.jobs import submit_job
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +20,27 @@ logger = logging.getLogger(__name__)
 scheduler = AsyncIOScheduler()
 
 
+def _for_each_farm(task: str, run: Callable[[Session], None]) -> None:
+    """Run a scheduled task once per farm, each in a session scoped to that farm.
+
+    A failure for one farm is logged and does not stop the others.
+    """
+    for farm in list_farm_routes():
+        db = farm_session(farm)
+        try:
+            run(db)
+        except Exception as e:
+            logger.error(f"Error {task} for farm {farm.code}: {str(e)}")
+        finally:
+            db.close()
+
+
+@leader_only
 def check_notifications():
     """Check for notifications and send them to appropriate recipients."""
-    try:
-        db = SessionLocal()
+    def run(db: Session):
         notifications = get_all_notifications(db)
-        
+
         for notification in notifications:
             # Here you would implement the actual notification sending logic
             # For example, sending emails, push notifications, etc.
@@ -24,16 +48,84 @@ def check_notifications():
                 f"Notification: {notification.title} - {notification.message} "
                 f"(Recipient: {notification.recipient}, Priority: {notification.priority})"
             )
-            
-    except Exception as e:
-        logger.error(f"Error checking notifications: {str(e)}")
-    finally:
-        db.close()
+
+    _for_each_farm("checking notifications", run)
+
+
+@leader_only
+def retrain_lambing_forecasts():
+    """Queue a job per farm that relearns gestation statistics and rebuilds every lambing forecast."""
+    _for_each_farm("queueing lambing forecast rebuild", lambda db: submit_job(db, "rebuild_lambing_forecasts"))
+
+
+@leader_only
+def refresh_changed_lambing_forecasts():
+    """Refresh lambing forecasts for mating pairs changed since the last run."""
+    _for_each_farm("refreshing lambing forecasts", refresh_lambing_forecasts)
+
+
+@leader_only
+def prune_sync_changes():
+    """Drop change log entries older than the sync retention window."""
+    def run(db: Session):
+        deleted = prune_change_log(db, settings.SYNC_CHANGE_RETENTION_DAYS)
+        logger.info(f"Pruned {deleted} change log entries")
+
+    _for_each_farm("pruning change log", run)
+
+
+@leader_only
+def materialize_protocol_treatments():
+    """Materialize due doses of every active treatment protocol."""
+    def run(db: Session):
+        created = materialize_due_treatments(db)
+        logger.info(f"Materialized {created} due treatments")
+
+    _for_each_farm("materializing due treatments", run)
+
+
+@leader_only
+def evaluate_breeding_values():
+    """Queue a BLUP evaluation job for every trait of every farm."""
+    def run(db: Session):
+        for trait in BreedingTrait:
+            start_evaluation(db, trait)
+
+    _for_each_farm("queueing breeding value evaluations", run)
+
+
+@leader_only
+def archive_inactive_records():
+    """Queue a job per farm that moves inactive animals and old health events to the archive tables."""
+    _for_each_farm("queueing archival", lambda db: submit_job(db, "archive_records"))
 
 
 def start_scheduler():
-    """Start the scheduler with configured jobs."""
+    """Start the scheduler with configured jobs.
+
+    Every worker process starts the scheduler, but jobs only run in the one
+    that wins the leader election; the others keep retrying so leadership
+    fails over if the leader dies.
+    """
     if not scheduler.running:
+        scheduler_leader.elect()
+        scheduler.add_job(
+            scheduler_leader.elect,
+            IntervalTrigger(seconds=settings.SCHEDULER_ELECTION_INTERVAL_SECONDS),
+            id="scheduler_leader_election",
+            name="Scheduler leader election",
+            replace_existing=True
+        )
+
+        # Materialize protocol doses before the morning notifications
+        scheduler.add_job(
+            materialize_protocol_treatments,
+            CronTrigger(hour=1, minute=0),
+            id="nightly_protocol_treatments",
+            name="Materialize due treatments",
+            replace_existing=True
+        )
+
         # Check for notifications every day at 8 AM
         scheduler.add_job(
             check_notifications,
@@ -42,6 +134,43 @@ def start_scheduler():
             name="Check daily notifications",
             replace_existing=True
         )
+
+        # Relearn gestation statistics nightly and keep forecasts fresh in between
+        scheduler.add_job(
+            retrain_lambing_forecasts,
+            CronTrigger(hour=2, minute=0),
+            id="nightly_lambing_forecasts",
+            name="Rebuild lambing forecasts",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            refresh_changed_lambing_forecasts,
+            IntervalTrigger(minutes=settings.LAMBING_FORECAST_REFRESH_MINUTES),
+            id="incremental_lambing_forecasts",
+            name="Refresh changed lambing forecasts",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            prune_sync_changes,
+            CronTrigger(hour=3, minute=0),
+            id="prune_change_log",
+            name="Prune sync change log",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            evaluate_breeding_values,
+            CronTrigger(hour=4, minute=0),
+            id="nightly_breeding_values",
+            name="Evaluate breeding values",
+            replace_existing=True
+        )
+        scheduler.add_job(
+            archive_inactive_records,
+            CronTrigger(hour=5, minute=0),
+            id="nightly_archival",
+            name="Archive inactive records",
+            replace_existing=True
+        )
         
         scheduler.start()
         logger.info("Scheduler started successfully")
@@ -51,4 +180,5 @@ def shutdown_scheduler():
     """Shutdown the scheduler gracefully."""
     if scheduler.running:
         scheduler.shutdown()
+        scheduler_leader.release()
         logger.info("Scheduler shut down successfully") 
\ No newline at end of file
@@ -0,0 +1,201 @@
+import logging
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"IN \((?:[^()]*?,)+[^()]*?\)", re.IGNORECASE)
+_NUMBERED_PARAM = re.compile(r"_\d+$")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements that EXPLAIN ANALYZE may safely execute a second time
+_EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b", re.IGNORECASE)
+# Reads that lock rows or call functions with side effects (advisory locks,
+# sequences, settings) are only planned, never executed again
+_SIDE_EFFECTS = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b"
+    r"|\b(pg_\w+|nextval|setval|set_config|lo_\w+)\s*\(",
+    re.IGNORECASE
+)
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse literals, IN-lists and whitespace so equivalent statements group together."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def parameter_shape(parameters) -> str:
+    """Types of the bound parameters without their values, e.g. ``{status: str, tag_id: list}``."""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        shape: Dict[str, str] = {}
+        for key, value in parameters.items():
+            # Expanded IN parameters (tag_id_1, tag_id_2, ...) count as one list
+            base = _NUMBERED_PARAM.sub("", key)
+            shape[base] = "list" if base != key and base in shape else type(value).__name__
+        return "{" + ", ".join(f"{key}: {kind}" for key, kind in sorted(shape.items())) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return "{}"
+
+
+def _origin() -> Optional[str]:
+    """The innermost application frame outside the database layer that issued the statement."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and not module.startswith(("app.core.slow_queries", "app.db.")):
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return None
+
+
+class SlowQueryLog:
+    """Times statements on an engine and aggregates those over the threshold.
+
+    Each distinct normalized statement keeps its count, total and worst
+    duration, parameter shape and calling service function. Slow SELECTs are
+    re-run in the background under ``EXPLAIN (ANALYZE, BUFFERS)`` inside a
+    read-only transaction, at most once per statement every
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS; those that lock rows or call
+    functions with side effects get a plain EXPLAIN instead.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._pending_explains = 0
+        self._local = threading.local()
+
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append((context, time.perf_counter()))
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["slow_query_start"].pop()[1]) * 1000
+        if elapsed_ms < settings.SLOW_QUERY_THRESHOLD_MS or getattr(self._local, "explaining", False):
+            return
+        self.record(conn.engine, statement, parameters, elapsed_ms, _origin())
+
+    def _on_error(self, exception_context) -> None:
+        # A failed statement never reaches after_cursor_execute; drop its
+        # start time so it cannot be paired with a later statement
+        conn = exception_context.connection
+        if conn is None or exception_context.execution_context is None:
+            return
+        starts = conn.info.get("slow_query_start")
+        if starts and starts[-1][0] is exception_context.execution_context:
+            starts.pop()
+
+    def record(self, engine: Engine, statement: str, parameters, elapsed_ms: float, origin: Optional[str]) -> None:
+        fingerprint = normalize_sql(statement)
+        shape = parameter_shape(parameters)
+        logger.warning(f"Slow query ({elapsed_ms:.0f} ms) from {origin or 'unknown'}: {fingerprint} params={shape}")
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(fingerprint)
+            if entry is None:
+                if len(self.entries) >= settings.SLOW_QUERY_MAX_ENTRIES:
+                    # Make room by dropping the statement that has cost the least so far
+                    del self.entries[min(self.entries, key=lambda k: self.entries[k]["total_ms"])]
+                entry = self.entries[fingerprint] = {
+                    "sql": fingerprint,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "origins": {},
+                    "parameter_shape": shape,
+                    "plan": None,
+                    "plan_captured_at": None,
+                    "_explained_at": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["parameter_shape"] = shape
+            if origin:
+                entry["origins"][origin] = entry["origins"].get(origin, 0) + 1
+            explain = (
+                settings.SLOW_QUERY_EXPLAIN
+                and engine.dialect.name == "postgresql"
+                and _EXPLAINABLE.match(statement)
+                and not _WRITE_KEYWORDS.search(statement)
+                and self._pending_explains < settings.SLOW_QUERY_EXPLAIN_QUEUE_SIZE
+                and (entry["_explained_at"] is None
+                     or now - entry["_explained_at"] >= settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS)
+            )
+            if explain:
+                entry["_explained_at"] = now
+                self._pending_explains += 1
+                if self._explainer is None:
+                    self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        if explain:
+            self._explainer.submit(self._explain, engine, fingerprint, statement, parameters)
+
+    def _explain(self, engine: Engine, fingerprint: str, statement: str, parameters) -> None:
+        self._local.explaining = True
+        options = "" if _SIDE_EFFECTS.search(statement) else "(ANALYZE, BUFFERS) "
+        try:
+            with engine.connect() as conn:
+                with conn.begin() as transaction:
+                    conn.exec_driver_sql("SET TRANSACTION READ ONLY")
+                    rows = conn.exec_driver_sql(f"EXPLAIN {options}{statement}", parameters).fetchall()
+                    transaction.rollback()
+            plan = "\n".join(row[0] for row in rows)
+            with self._lock:
+                entry = self.entries.get(fingerprint)
+                if entry is not None:
+                    entry["plan"] = plan
+                    entry["plan_captured_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        except Exception:
+            logger.exception(f"EXPLAIN failed for slow query: {fingerprint}")
+        finally:
+            self._local.explaining = False
+            with self._lock:
+                self._pending_explains -= 1
+
+    def top(self, limit: Optional[int] = None, order_by: str = "total_ms") -> List[dict]:
+        """The worst offenders by total (or max, or count), with their latest plans."""
+        with self._lock:
+            entries = sorted(self.entries.values(), key=lambda e: e[order_by], reverse=True)
+            return [
+                {
+                    **{k: v for k, v in entry.items() if not k.startswith("_")},
+                    "total_ms": round(entry["total_ms"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "mean_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "origins": dict(entry["origins"]),
+                }
+                for entry in entries[:limit or settings.SLOW_QUERY_TOP_N]
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def shutdown(self) -> None:
+        if self._explainer is not None:
+            self._explainer.shutdown(wait=False, cancel_futures=True)
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1 @@
+from app.db.base import Base  # noqa: F401
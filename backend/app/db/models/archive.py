@@ -0,0 +1,98 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Enum, Text, Numeric, BigInteger, Index
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+from app.db.models.sheep import SheepStatus, SheepSex, SheepSection
+from app.db.models.health_event import EventType
+
+
+# Archive tables hold the same columns as their hot tables plus archived_at;
+# rows are moved column by column by name, so a column added to a hot table
+# must be added to its archive table as well.
+
+
+class SheepArchive(FarmScoped, Base):
+    """A sold or deceased animal moved out of the hot sheep table."""
+    __tablename__ = "sheep_archive"
+    __table_args__ = (Index("ix_sheep_archive_farm_id", "farm_id"),)
+
+    id = Column(Integer, primary_key=True)
+    tag_id = Column(String(20), unique=True, nullable=False, index=True)
+    scrapie_id = Column(String(50), nullable=True)
+    breed = Column(String(50), nullable=False)
+    sex = Column(Enum(SheepSex), nullable=False)
+    date_of_birth = Column(Date, nullable=False)
+    purchase_date = Column(Date, nullable=True)
+    sale_date = Column(Date, nullable=True)
+    death_date = Column(Date, nullable=True)
+    acquisition_price = Column(Numeric(10, 2), nullable=True)
+    sale_price = Column(Numeric(10, 2), nullable=True)
+    status = Column(Enum(SheepStatus), nullable=False)
+    current_section = Column(Enum(SheepSection), nullable=False)
+    origin_farm = Column(String(100), nullable=True)
+    rfid_code = Column(String(50), nullable=True)
+    qr_code = Column(String(50), nullable=True)
+    notes = Column(Text, nullable=True)
+    sire_id = Column(String(20), nullable=True)
+    dam_id = Column(String(20), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SheepArchive {self.tag_id}>"
+
+
+class HealthEventArchive(FarmScoped, Base):
+    """A health event moved out of the partitioned health_events table."""
+    __tablename__ = "health_events_archive"
+    __table_args__ = (Index("ix_health_events_archive_farm_id", "farm_id"),)
+
+    id = Column(Integer, primary_key=True)
+    sheep_id = Column(String(20), nullable=False, index=True)
+    event_date = Column(Date, nullable=False)
+    event_type = Column(Enum(EventType), nullable=False)
+    details = Column(Text, nullable=False)
+    next_due_date = Column(Date, nullable=True)
+    created_at = Column(Date, nullable=True)
+    updated_at = Column(Date, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<HealthEventArchive {self.sheep_id} - {self.event_type} - {self.event_date}>"
+
+
+class SectionAssignmentArchive(FarmScoped, Base):
+    """A section stay of an archived animal."""
+    __tablename__ = "section_assignments_archive"
+    __table_args__ = (Index("ix_section_assignments_archive_farm_id", "farm_id"),)
+
+    id = Column(Integer, primary_key=True)
+    sheep_id = Column(String(20), nullable=False, index=True)
+    section = Column(Enum(SheepSection), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    reason = Column(Text, nullable=True)
+    created_at = Column(Date, nullable=True)
+    updated_at = Column(Date, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<SectionAssignmentArchive {self.sheep_id} - {self.section} - {self.start_date}>"
+
+
+class AttachmentArchive(FarmScoped, Base):
+    """A file attached to an archived health event; its bytes stay in the object store."""
+    __tablename__ = "attachments_archive"
+    __table_args__ = (Index("ix_attachments_archive_farm_id", "farm_id"),)
+
+    id = Column(Integer, primary_key=True)
+    health_event_id = Column(Integer, nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(Date, nullable=True)
+    updated_at = Column(Date, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<AttachmentArchive {self.filename} - {self.sha256[:12]}>"
@@ -0,0 +1,26 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, BigInteger, Index
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+
+
+class Attachment(FarmScoped, Base):
+    """A file attached to a health event; the bytes live on disk under their SHA-256."""
+    __tablename__ = "attachments"
+    __table_args__ = (Index("ix_attachments_farm_id", "farm_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    health_event_id = Column(Integer, ForeignKey("health_events.id"), nullable=False, index=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    health_event = relationship("HealthEvent")
+
+    def __repr__(self):
+        return f"<Attachment {self.filename} - {self.sha256[:12]}>"
@@ -1,25 +1,30 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text, Float, Boolean
+import enum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
 
-class BirthType(str, Enum):
+class BirthType(str, enum.Enum):
     SINGLE = "single"
     TWIN = "twin"
     TRIPLET = "triplet"
     QUADRUPLET = "quadruplet"
 
-class RearingType(str, Enum):
+class RearingType(str, enum.Enum):
     NATURAL = "natural"
     BOTTLE = "bottle"
     MIXED = "mixed"
 
-class BirthRecord(Base):
+class BirthRecord(FarmScoped, Base):
     __tablename__ = "birth_records"
+    __table_args__ = (
+        Index("ix_birth_records_farm_date", "farm_id", "date_lambed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    ewe_id = Column(String, ForeignKey("sheep.id"), nullable=False)
-    sire_id = Column(String, ForeignKey("sheep.id"), nullable=True)
+    ewe_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False)
+    sire_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=True)
     date_lambed = Column(Date, nullable=False)
     birth_type = Column(Enum(BirthType), nullable=False)
     rearing_type = Column(Enum(RearingType), nullable=False)
@@ -27,7 +32,6 @@ class BirthRecord(Base):
     date_weaned = Column(Date, nullable=True)
     weaning_weight = Column(Float, nullable=True)
     expected_wean_date = Column(Date, nullable=True)
-    lamb_details = Column(Text, nullable=True)  # JSON string containing lamb details
     mortality_flag = Column(Boolean, default=False)
     mortality_date = Column(Date, nullable=True)
     mortality_reason = Column(Text, nullable=True)
@@ -38,6 +42,7 @@ class BirthRecord(Base):
     # Relationships
     ewe = relationship("Sheep", foreign_keys=[ewe_id], back_populates="birth_records_as_ewe")
     sire = relationship("Sheep", foreign_keys=[sire_id], back_populates="birth_records_as_sire")
+    lambs = relationship("Lamb", back_populates="birth_record", cascade="all, delete-orphan", order_by="Lamb.birth_order")
 
     def __repr__(self):
         return f"<BirthRecord {self.ewe_id} - {self.date_lambed}>" 
\ No newline at end of file
@@ -0,0 +1,60 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Enum, Text, ForeignKey, Index, UniqueConstraint
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+import enum
+
+
+class BreedingTrait(str, enum.Enum):
+    WEANING_WEIGHT = "weaning_weight"
+    PROLIFICACY = "prolificacy"
+
+
+class EvaluationStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class GeneticEvaluation(FarmScoped, Base):
+    """One BLUP run for a trait."""
+    __tablename__ = "genetic_evaluations"
+    __table_args__ = (Index("ix_genetic_evaluations_farm_trait", "farm_id", "trait"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    trait = Column(Enum(BreedingTrait), nullable=False)
+    status = Column(Enum(EvaluationStatus), default=EvaluationStatus.PENDING, nullable=False)
+    animals = Column(Integer, nullable=True)
+    records = Column(Integer, nullable=True)
+    iterations = Column(Integer, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    error = Column(Text, nullable=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GeneticEvaluation {self.trait} - {self.status}>"
+
+
+class BreedingValue(FarmScoped, Base):
+    """Latest estimated breeding value of an animal for a trait."""
+    __tablename__ = "breeding_values"
+    __table_args__ = (
+        UniqueConstraint("trait", "sheep_id"),
+        Index("ix_breeding_values_farm_trait_ebv", "farm_id", "trait", "ebv"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    trait = Column(Enum(BreedingTrait), nullable=False)
+    sheep_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False, index=True)
+    ebv = Column(Float, nullable=False)
+    own_records = Column(Integer, nullable=False, default=0)
+    evaluation_id = Column(Integer, ForeignKey("genetic_evaluations.id"), nullable=False)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<BreedingValue {self.sheep_id} {self.trait}: {self.ebv:.3f}>"
@@ -0,0 +1,27 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+
+
+class ChangeOperation:
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class ChangeLogEntry(FarmScoped, Base):
+    """One create, update or delete of a synced record; ``id`` is the sync cursor."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_entity", "entity", "entity_id"),
+        Index("ix_change_log_farm_cursor", "farm_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity = Column(String(50), nullable=False)
+    entity_id = Column(String(50), nullable=False)
+    operation = Column(String(10), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ChangeLogEntry {self.id} {self.operation} {self.entity}:{self.entity_id}>"
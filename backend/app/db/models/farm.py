@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy.orm import declared_attr
+from app.db.base_class import Base
+
+
+class Farm(Base):
+    """A farm whose animals and records are kept apart from every other farm's.
+
+    ``database`` names an entry of FARM_DATABASES when the farm lives in a
+    database of its own, and ``schema_name`` a PostgreSQL schema holding its
+    tables; with neither set the farm shares the public schema of the primary
+    database with the other farms.
+    """
+    __tablename__ = "farms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(50), unique=True, nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    database = Column(String(50), nullable=True)
+    schema_name = Column(String(63), nullable=True)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Farm {self.code}>"
+
+
+class FarmScoped:
+    """Mixin for tables holding one farm's data.
+
+    Sessions scoped to a farm (see app.db.tenancy) only load rows of that farm
+    and stamp it on the rows they add. Each table declares its own indexes
+    leading with farm_id, shaped after the queries it serves.
+    """
+
+    @declared_attr
+    def farm_id(cls):
+        return Column(Integer, ForeignKey("farms.id"), nullable=False)
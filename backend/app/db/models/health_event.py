@@ -1,24 +1,26 @@
 from datetime import datetime
+import enum
 from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
 
-class EventType(str, Enum):
+class EventType(str, enum.Enum):
     VACCINATION = "vaccination"
     TREATMENT = "treatment"
     CHECKUP = "checkup"
     OTHER = "other"
 
-class HealthEvent(Base):
+class HealthEvent(FarmScoped, Base):
+    """A health event; the table is range-partitioned by event year (see migration 013)."""
     __tablename__ = "health_events"
 
     id = Column(Integer, primary_key=True, index=True)
-    sheep_id = Column(String, ForeignKey("sheep.id"), nullable=False)
+    sheep_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False)
     event_date = Column(Date, nullable=False)
     event_type = Column(Enum(EventType), nullable=False)
     details = Column(Text, nullable=False)
     next_due_date = Column(Date, nullable=True)
-    attachments = Column(Text, nullable=True)  # JSON string of file paths/URLs
     created_at = Column(Date, default=datetime.utcnow)
     updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
 
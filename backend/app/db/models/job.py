@@ -0,0 +1,43 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Enum, Text, Boolean, Index
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job(FarmScoped, Base):
+    """A long-running operation executed in the background worker pool.
+
+    Jobs are stored with the data of the farm they work on, so a farm with
+    a database of its own also keeps its jobs there.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_farm_status", "farm_id", "status"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False, index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    params = Column(Text, nullable=True)  # JSON
+    progress = Column(Float, default=0.0, nullable=False)
+    message = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)  # JSON
+    error = Column(Text, nullable=True)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    worker = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)  # renewed by the running worker's progress reports
+    queued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} - {self.status}>"
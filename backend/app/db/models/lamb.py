@@ -0,0 +1,33 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text, Float, Boolean, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+from app.db.models.sheep import SheepSex
+
+
+class Lamb(FarmScoped, Base):
+    """One lamb of a birth record, kept as a row so per-lamb questions run in SQL."""
+    __tablename__ = "lambs"
+    __table_args__ = (
+        UniqueConstraint("birth_record_id", "birth_order"),
+        Index("ix_lambs_farm_sex_alive", "farm_id", "sex", "born_alive"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    birth_record_id = Column(Integer, ForeignKey("birth_records.id", ondelete="CASCADE"), nullable=False, index=True)
+    birth_order = Column(Integer, nullable=False)
+    tag_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=True, index=True)
+    sex = Column(Enum(SheepSex), nullable=True)
+    birth_weight = Column(Float, nullable=True)
+    born_alive = Column(Boolean, default=True, nullable=False)
+    death_date = Column(Date, nullable=True, index=True)
+    death_reason = Column(Text, nullable=True)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    birth_record = relationship("BirthRecord", back_populates="lambs")
+
+    def __repr__(self):
+        return f"<Lamb {self.birth_record_id}/{self.birth_order}>"
@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Enum, UniqueConstraint
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+from app.db.models.sheep import SheepSection
+
+
+class GestationStat(FarmScoped, Base):
+    __tablename__ = "gestation_stats"
+    __table_args__ = (UniqueConstraint("farm_id", "breed"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    breed = Column(String(50), nullable=False)
+    mean_days = Column(Float, nullable=False)
+    std_days = Column(Float, nullable=False)
+    sample_size = Column(Integer, nullable=False, default=0)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<GestationStat {self.breed} - {self.mean_days:.1f}d>"
+
+
+class LambingCalendarDay(FarmScoped, Base):
+    """Precomputed count of expected lambings for one day and section."""
+    __tablename__ = "lambing_calendar"
+    __table_args__ = (UniqueConstraint("farm_id", "lambing_date", "section"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    lambing_date = Column(Date, nullable=False)
+    section = Column(Enum(SheepSection), nullable=False)
+    expected_lambings = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LambingCalendarDay {self.lambing_date} - {self.section}: {self.expected_lambings}>"
@@ -1,19 +1,25 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
 
 
-class MatingPair(Base):
+class MatingPair(FarmScoped, Base):
     __tablename__ = "mating_pairs"
+    __table_args__ = (
+        Index("ix_mating_pairs_farm_lambing", "farm_id", "expected_lambing_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    ram_id = Column(String, ForeignKey("sheep.id"), nullable=False)
-    ewe_id = Column(String, ForeignKey("sheep.id"), nullable=False)
+    ram_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False)
+    ewe_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False)
     
     # Timing
     mating_start_date = Column(Date, nullable=False)
     expected_lambing_date = Column(Date, nullable=True)
+    lambing_window_start = Column(Date, nullable=True)
+    lambing_window_end = Column(Date, nullable=True)
     actual_lambing_date = Column(Date, nullable=True)
     
     # Group management
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.base_class import Base
+
+
+class SchedulerLease(Base):
+    """Time-limited scheduler leadership, used where advisory locks are unavailable."""
+    __tablename__ = "scheduler_leases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(50), unique=True, nullable=False)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SchedulerLease {self.name} - {self.holder} until {self.expires_at}>"
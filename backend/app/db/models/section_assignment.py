@@ -1,18 +1,21 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+from app.db.models.sheep import SheepSection
 
-class SheepSection(str, Enum):
-    MALE = "male"
-    GENERAL = "general"
-    MATING = "mating"
 
-class SectionAssignment(Base):
+class SectionAssignment(FarmScoped, Base):
+    """A sheep's stay in a section over the half-open interval [start_date, end_date)."""
     __tablename__ = "section_assignments"
+    __table_args__ = (
+        Index("ix_section_assignments_farm_section_period", "farm_id", "section", "start_date", "end_date"),
+        Index("ix_section_assignments_sheep_open", "sheep_id", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    sheep_id = Column(String, ForeignKey("sheep.id"), nullable=False)
+    sheep_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False)
     section = Column(Enum(SheepSection), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
@@ -24,4 +27,4 @@ class SectionAssignment(Base):
     sheep = relationship("Sheep", back_populates="section_assignments")
 
     def __repr__(self):
-        return f"<SectionAssignment {self.sheep_id} - {self.section} - {self.start_date}>" 
\ No newline at end of file
+        return f"<SectionAssignment {self.sheep_id} - {self.section} - {self.start_date}>"
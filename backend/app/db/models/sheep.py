@@ -1,7 +1,8 @@
 from datetime import date
-from sqlalchemy import Column, String, Date, Enum, ForeignKey, Text, Numeric
+from sqlalchemy import Column, Integer, String, Date, Enum, ForeignKey, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
+from app.db.models.farm import FarmScoped
 import enum
 
 
@@ -22,8 +23,14 @@ class SheepSection(str, enum.Enum):
     MATING = "mating"
 
 
-class Sheep(Base):
+class Sheep(FarmScoped, Base):
+    __table_args__ = (
+        Index("ix_sheep_farm_status", "farm_id", "status", "current_section"),
+        Index("ix_sheep_farm_breed", "farm_id", "breed"),
+    )
+
     # Core identification
+    id = Column(Integer, primary_key=True, index=True)
     tag_id = Column(String(20), unique=True, nullable=False, index=True)
     scrapie_id = Column(String(50), unique=True, nullable=True)
     breed = Column(String(50), nullable=False)
@@ -59,9 +66,11 @@ class Sheep(Base):
     
     # Health and breeding relationships
     health_events = relationship("HealthEvent", back_populates="sheep")
-    birth_records = relationship("BirthRecord", back_populates="ewe")
-    mating_records = relationship("MatingPair", back_populates="sheep")
-    section_history = relationship("SectionAssignment", back_populates="sheep")
+    birth_records_as_ewe = relationship("BirthRecord", foreign_keys="BirthRecord.ewe_id", back_populates="ewe")
+    birth_records_as_sire = relationship("BirthRecord", foreign_keys="BirthRecord.sire_id", back_populates="sire")
+    mating_pairs_as_ram = relationship("MatingPair", foreign_keys="MatingPair.ram_id", back_populates="ram")
+    mating_pairs_as_ewe = relationship("MatingPair", foreign_keys="MatingPair.ewe_id", back_populates="ewe")
+    section_assignments = relationship("SectionAssignment", back_populates="sheep")
 
     def __repr__(self):
         return f"<Sheep {self.tag_id}>" 
\ No newline at end of file
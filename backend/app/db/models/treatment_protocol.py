@@ -0,0 +1,72 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Enum, Text, Boolean, Index, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from app.db.base_class import Base
+from app.db.models.farm import FarmScoped
+from app.db.models.health_event import EventType
+from app.db.models.sheep import SheepSex, SheepSection
+
+
+class TreatmentProtocol(FarmScoped, Base):
+    """A recurring treatment for a cohort, e.g. a yearly CDT booster for all ewes.
+
+    The first dose falls due at ``first_dose_age_days``; each later dose
+    ``interval_days`` after the previous one was given, up to ``doses``
+    (unlimited when null). Only animals whose age is within the age bounds
+    when the series would start are enrolled.
+    """
+    __tablename__ = "treatment_protocols"
+    __table_args__ = (UniqueConstraint("farm_id", "name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)
+    event_type = Column(Enum(EventType), default=EventType.VACCINATION, nullable=False)
+    details = Column(Text, nullable=True)
+
+    # Cohort
+    sex = Column(Enum(SheepSex), nullable=True)
+    breed = Column(String(50), nullable=True)
+    section = Column(Enum(SheepSection), nullable=True)
+    min_age_days = Column(Integer, nullable=True)
+    max_age_days = Column(Integer, nullable=True)
+
+    # Schedule
+    first_dose_age_days = Column(Integer, nullable=False, default=0)
+    interval_days = Column(Integer, nullable=True)
+    doses = Column(Integer, nullable=True)
+
+    active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    due_treatments = relationship("DueTreatment", back_populates="protocol", cascade="all, delete-orphan")
+
+    def __repr__(self):
+        return f"<TreatmentProtocol {self.name}>"
+
+
+class DueTreatment(FarmScoped, Base):
+    """One materialized dose of a protocol for one sheep."""
+    __tablename__ = "due_treatments"
+    __table_args__ = (
+        UniqueConstraint("protocol_id", "sheep_id", "dose_number"),
+        Index(
+            "ix_due_treatments_farm_open_due_date", "farm_id", "due_date",
+            postgresql_where=text("completed_date IS NULL")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    protocol_id = Column(Integer, ForeignKey("treatment_protocols.id", ondelete="CASCADE"), nullable=False)
+    sheep_id = Column(String(20), ForeignKey("sheep.tag_id"), nullable=False, index=True)
+    dose_number = Column(Integer, nullable=False)
+    due_date = Column(Date, nullable=False)
+    completed_date = Column(Date, nullable=True)
+    health_event_id = Column(Integer, ForeignKey("health_events.id"), nullable=True)
+    created_at = Column(Date, default=datetime.utcnow)
+    updated_at = Column(Date, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    protocol = relationship("TreatmentProtocol", back_populates="due_treatments")
+
+    def __repr__(self):
+        return f"<DueTreatment {self.sheep_id} - protocol {self.protocol_id} dose {self.dose_number} on {self.due_date}>"
@@ -1,15 +1,196 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.slow_queries import slow_query_log
+from app.db.models.farm import Farm
+from app.db.tenancy import scope_session
+
+def _engine_options(uri: str) -> dict:
+    """Pool and timeout options for an engine, limited to what the backend supports."""
+    options = {"pool_pre_ping": True}
+    if uri.startswith("sqlite"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
+    if uri.startswith("postgresql") and settings.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **_engine_options(settings.SQLALCHEMY_DATABASE_URI))
+read_engine = engine
+if settings.SQLALCHEMY_READ_REPLICA_URI:
+    read_engine = create_engine(
+        settings.SQLALCHEMY_READ_REPLICA_URI,
+        **_engine_options(settings.SQLALCHEMY_READ_REPLICA_URI)
+    )
+
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_log.install(engine)
+    if read_engine is not engine:
+        slow_query_log.install(read_engine)
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+class FarmRoute(NamedTuple):
+    """Where one farm's data lives."""
+    id: int
+    code: str
+    database: Optional[str]
+    schema_name: Optional[str]
+
+
+_farm_routes: Dict[str, FarmRoute] = {}
+_farm_routes_loaded_at = 0.0
+# Farms asked for but not found, with when the routes were last reloaded
+# for them; bounded, since the values come from request headers
+_unknown_farms: Dict[str, float] = {}
+_UNKNOWN_FARMS_MAX = 1024
+_farm_engines: Dict[str, Engine] = {}
+_farm_lock = threading.Lock()
+
+
+def _load_farm_routes(force: bool = False) -> Dict[str, FarmRoute]:
+    """Farm routes by code and by id, reloaded from the primary every FARM_CACHE_SECONDS."""
+    global _farm_routes, _farm_routes_loaded_at
+    if not force and time.monotonic() - _farm_routes_loaded_at < settings.FARM_CACHE_SECONDS:
+        return _farm_routes
+    with SessionLocal() as db:
+        routes = {}
+        for farm in db.query(Farm).all():
+            route = FarmRoute(farm.id, farm.code, farm.database, farm.schema_name)
+            routes[farm.code] = route
+            routes[str(farm.id)] = route
+    _farm_routes, _farm_routes_loaded_at = routes, time.monotonic()
+    return routes
+
+
+def get_farm_route(farm: str) -> Optional[FarmRoute]:
+    """Look up a farm by code or id.
+
+    An unknown farm reloads the routes, since it may have been created by
+    another process, but at most once per FARM_CACHE_SECONDS for the same
+    value, so requests naming a farm that does not exist cannot force a
+    query each.
+    """
+    routes = _load_farm_routes()
+    if farm in routes:
+        return routes[farm]
+    now = time.monotonic()
+    missed_at = _unknown_farms.get(farm)
+    if missed_at is not None and now - missed_at < settings.FARM_CACHE_SECONDS:
+        return None
+    if len(_unknown_farms) >= _UNKNOWN_FARMS_MAX:
+        _unknown_farms.clear()
+    _unknown_farms[farm] = now
+    return _load_farm_routes(force=True).get(farm)
+
+
+def list_farm_routes() -> Tuple[FarmRoute, ...]:
+    """Every farm, once each."""
+    return tuple({route.id: route for route in _load_farm_routes().values()}.values())
+
+
+def invalidate_farm_routes() -> None:
+    global _farm_routes_loaded_at
+    _farm_routes_loaded_at = 0.0
+    _unknown_farms.clear()
+
+
+def farm_engine(database: str) -> Engine:
+    """Engine of a farm database named in FARM_DATABASES, created on first use."""
+    with _farm_lock:
+        if database not in _farm_engines:
+            uri = settings.FARM_DATABASES.get(database)
+            if not uri:
+                raise ValueError(f"Farm database {database} is not configured in FARM_DATABASES")
+            _farm_engines[database] = create_engine(uri, **_engine_options(uri))
+            if settings.SLOW_QUERY_LOG_ENABLED:
+                slow_query_log.install(_farm_engines[database])
+        return _farm_engines[database]
+
+
+def farm_session(farm: Optional[FarmRoute], read_only: bool = False) -> Session:
+    """Open a session scoped to one farm and bound to wherever its data lives.
+
+    Farms with a database of their own are served from it for reads and
+    writes alike; the rest share the primary and its read replica. Without a
+    farm the session is unscoped and sees every farm on the primary.
+    """
+    if farm is None:
+        return SessionLocal()
+    if farm.database:
+        db = Session(bind=farm_engine(farm.database), autocommit=False, autoflush=False)
+    else:
+        db = (ReadSessionLocal if read_only else SessionLocal)()
+    return scope_session(db, farm.id, farm.schema_name)
+
+
+def farm_session_for_id(farm_id: Optional[int], read_only: bool = False) -> Session:
+    """farm_session for a farm id, as carried by jobs."""
+    if farm_id is None:
+        return SessionLocal()
+    farm = get_farm_route(str(farm_id))
+    if farm is None:
+        raise ValueError(f"Farm {farm_id} not found")
+    return farm_session(farm, read_only)
+
+
+@contextmanager
+def atomic_farm_session(farm: FarmRoute) -> Iterator[Session]:
+    """A farm session whose commits only release savepoints of one outer transaction.
+
+    Services commit as usual; their work is applied together when the block
+    exits cleanly and rolled back as a whole when it raises. Callbacks
+    registered with call_after_commit run after the outer commit.
+    """
+    bind = farm_engine(farm.database) if farm.database else engine
+    with bind.connect() as connection:
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN to the first write, so the services'
+            # savepoints would open, and their RELEASE commit, a transaction
+            # of their own; take over and begin the outer transaction here
+            connection.execution_options(isolation_level="AUTOCOMMIT")
+            transaction = connection.begin()
+            connection.exec_driver_sql("BEGIN")
+        else:
+            transaction = connection.begin()
+        db = Session(bind=connection, autocommit=False, autoflush=False, join_transaction_mode="create_savepoint")
+        scope_session(db, farm.id, farm.schema_name)
+        callbacks = db.info["after_commit"] = []
+        try:
+            yield db
+            db.flush()
+            transaction.commit()
+        except Exception:
+            transaction.rollback()
+            raise
+        finally:
+            db.close()
+    for callback in callbacks:
+        callback()
+
 
+def call_after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's work is durably committed.
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close() 
\ No newline at end of file
+    That is now for an ordinary session, whose caller has just committed, and
+    after the outer commit for an atomic_farm_session.
+    """
+    pending = db.info.get("after_commit")
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
@@ -0,0 +1,83 @@
+import re
+from typing import Optional
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, with_loader_criteria
+from app.db.models.farm import FarmScoped
+
+# Execution option that lifts the farm scope from one statement, for the few
+# checks that must see every farm (tag IDs and RFID/QR codes are unique
+# across farms). It only lifts the filter: the statement still runs on the
+# session's database, so farms with a database of their own (FARM_DATABASES)
+# neither see nor are seen by these checks, and their tags and codes are
+# only unique within that database.
+ALL_FARMS = {"all_farms": True}
+
+_SCHEMA_NAME = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+def validate_schema_name(schema_name: str) -> str:
+    """Check a farm schema name is a plain PostgreSQL identifier, since it is spliced into SQL."""
+    if not _SCHEMA_NAME.match(schema_name):
+        raise ValueError(f"Invalid schema name: {schema_name}")
+    return schema_name
+
+
+def scope_session(db: Session, farm_id: int, schema_name: Optional[str] = None) -> Session:
+    """Restrict a session to one farm's rows, optionally inside the farm's own schema."""
+    db.info["farm_id"] = farm_id
+    if schema_name:
+        db.info["farm_schema"] = validate_schema_name(schema_name)
+    return db
+
+
+def current_farm_id(db: Session) -> Optional[int]:
+    """The farm a session is scoped to; None for an unscoped, all-farms session."""
+    return db.info.get("farm_id")
+
+
+def require_farm_id(db: Session) -> int:
+    """The farm a session is scoped to, for writes that must belong to one farm."""
+    farm_id = current_farm_id(db)
+    if farm_id is None:
+        raise ValueError("This operation needs a session scoped to a farm")
+    return farm_id
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _add_farm_criteria(execute_state) -> None:
+    """Filter every ORM SELECT, UPDATE and DELETE of a scoped session to its farm.
+
+    Relationship and column loads are left alone: they follow keys of rows
+    already loaded in scope, and a pedigree may cross farms.
+    """
+    farm_id = execute_state.session.info.get("farm_id")
+    if (
+        farm_id is None
+        or execute_state.is_column_load
+        or execute_state.is_relationship_load
+        or execute_state.execution_options.get("all_farms", False)
+        or not (execute_state.is_select or execute_state.is_update or execute_state.is_delete)
+    ):
+        return
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(FarmScoped, lambda cls: cls.farm_id == farm_id, include_aliases=True)
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_farm(session: Session, flush_context, instances) -> None:
+    """Stamp the session's farm on new farm-scoped rows that don't name one."""
+    farm_id = session.info.get("farm_id")
+    for obj in session.new:
+        if isinstance(obj, FarmScoped) and obj.farm_id is None:
+            if farm_id is None:
+                raise ValueError(f"Cannot add {obj!r} outside a farm-scoped session")
+            obj.farm_id = farm_id
+
+
+@event.listens_for(Session, "after_begin")
+def _set_farm_search_path(session: Session, transaction, connection) -> None:
+    """Resolve unqualified table names to the farm's schema for the transaction."""
+    schema_name = session.info.get("farm_schema")
+    if schema_name and connection.dialect.name == "postgresql":
+        connection.execute(text(f'SET LOCAL search_path TO "{schema_name}", public'))
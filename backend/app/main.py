@@ -1,10 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.admission import AdmissionControlMiddleware, admission_controller
+from app.core.profiling import ProfilingMiddleware
+from app.core.slow_queries import slow_query_log
 from app.db.base import Base
 from app.db.session import engine
 from app.api.v1.api import api_router
 from app.core.scheduler import start_scheduler, shutdown_scheduler
+from app.services.thumbnails import shutdown_thumbnail_workers
+from app.core.jobs import resume_queued_jobs, shutdown_job_workers
 import logging
 
 # Configure logging
@@ -22,11 +28,21 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
-# Set up CORS
+# Shed load before it reaches the database pool
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+# Opt-in request profiling; not installed at all unless enabled
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Set up CORS. Added last so it wraps the middleware above and requests they
+# reject (e.g. with 503) still get CORS headers
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        # AnyHttpUrl adds a trailing slash that browsers never send in Origin
+        allow_origins=[str(origin).rstrip("/") for origin in settings.BACKEND_CORS_ORIGINS],
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
@@ -41,6 +57,9 @@ async def startup_event():
     """Start background tasks on application startup."""
     logger.info("Starting up application...")
     start_scheduler()
+    resumed = resume_queued_jobs()
+    if resumed:
+        logger.info(f"Resumed {resumed} queued jobs")
 
 
 @app.on_event("shutdown")
@@ -48,6 +67,9 @@ async def shutdown_event():
     """Clean up resources on application shutdown."""
     logger.info("Shutting down application...")
     shutdown_scheduler()
+    shutdown_thumbnail_workers()
+    shutdown_job_workers()
+    slow_query_log.shutdown()
 
 
 @app.get("/")
@@ -56,4 +78,10 @@ def root():
         "message": "Welcome to Kamureito Sheep Management System API",
         "docs_url": "/docs",
         "openapi_url": f"{settings.API_V1_STR}/openapi.json"
-    } 
\ No newline at end of file
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Admission control metrics in Prometheus text format."""
+    return admission_controller.metrics()
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class AttachmentResponse(BaseModel):
+    id: int
+    health_event_id: int
+    sha256: str
+    filename: str
+    content_type: str
+    size: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,39 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+import enum
+
+
+class BatchMethod(str, enum.Enum):
+    GET = "GET"
+    POST = "POST"
+    PUT = "PUT"
+    PATCH = "PATCH"
+    DELETE = "DELETE"
+
+
+class BatchOperation(BaseModel):
+    id: Optional[str] = Field(None, description="Client reference echoed back with the result")
+    method: BatchMethod = BatchMethod.GET
+    path: str = Field(..., pattern=r"^/", description="Path below the API prefix, e.g. /sheep/BLU-001")
+    query: Dict[str, Any] = Field(default_factory=dict, description="Query parameters; lists repeat the parameter")
+    body: Optional[Any] = Field(None, description="JSON request body")
+
+
+class BatchRequest(BaseModel):
+    atomic: bool = Field(
+        False,
+        description="Run every operation in one transaction, rolled back as a whole when any of them fails"
+    )
+    operations: List[BatchOperation] = Field(..., min_length=1, description="Operations, run in order")
+
+
+class BatchOperationResult(BaseModel):
+    id: Optional[str] = None
+    status: int = Field(..., description="HTTP status the operation would have returned on its own")
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    atomic: bool
+    rolled_back: bool = Field(False, description="Whether an atomic batch was rolled back; its results were not applied")
+    results: List[BatchOperationResult]
@@ -0,0 +1,81 @@
+from typing import List, Optional
+from datetime import date
+from enum import Enum
+from pydantic import BaseModel, Field
+from app.db.models.birth_record import BirthType, RearingType
+from app.db.models.sheep import SheepSex
+
+
+class LambStatsGroup(str, Enum):
+    SIRE = "sire"
+    EWE = "ewe"
+    MONTH = "month"
+    BIRTH_TYPE = "birth_type"
+
+
+class LambResponse(BaseModel):
+    id: int
+    birth_record_id: int
+    birth_order: int
+    tag_id: Optional[str] = None
+    sex: Optional[SheepSex] = None
+    birth_weight: Optional[float] = None
+    born_alive: bool
+    death_date: Optional[date] = None
+    death_reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class LambStatsResponse(BaseModel):
+    group: Optional[str] = Field(None, description="Value of the grouping column; null when ungrouped")
+    lambs: int = Field(..., description="Lambs born")
+    males: int
+    females: int
+    male_ratio: Optional[float] = Field(None, description="Share of sexed lambs that are male")
+    stillborn: int = Field(..., description="Lambs not born alive")
+    deaths: int = Field(..., description="Lambs born alive that later died")
+    mean_birth_weight: Optional[float] = Field(None, description="Mean of recorded birth weights")
+
+
+class LambCreate(BaseModel):
+    tag_id: Optional[str] = Field(None, description="Tag already put on the lamb; one is allocated when omitted")
+    sex: Optional[SheepSex] = Field(None, description="Required for lambs born alive, which are registered as sheep")
+    birth_weight: Optional[float] = Field(None, gt=0, description="Birth weight in kg")
+    born_alive: bool = True
+    death_reason: Optional[str] = Field(None, description="Cause of a stillbirth")
+
+
+class BirthRecordCreate(BaseModel):
+    ewe_id: str = Field(..., description="Ewe's tag ID")
+    sire_id: Optional[str] = Field(None, description="Sire's tag ID; defaults to the ram of the ewe's open mating pair")
+    date_lambed: date
+    rearing_type: RearingType = RearingType.NATURAL
+    dystocia: bool = False
+    comments: Optional[str] = None
+    lambs: List[LambCreate] = Field(..., min_length=1, max_length=4, description="Lambs in birth order")
+
+
+class BulkBirthCreate(BaseModel):
+    births: List[BirthRecordCreate] = Field(..., min_length=1)
+    color_code: Optional[str] = Field(
+        None, description="Color code for allocated tags (e.g., GRN); required when a live lamb has no tag"
+    )
+    breed: Optional[str] = Field(None, description="Breed of the registered lambs; defaults to the ewe's breed")
+
+
+class BirthRecordResponse(BaseModel):
+    id: int
+    ewe_id: str
+    sire_id: Optional[str] = None
+    date_lambed: date
+    birth_type: BirthType
+    rearing_type: RearingType
+    dystocia: Optional[bool] = None
+    expected_wean_date: Optional[date] = None
+    comments: Optional[str] = None
+    lambs: List[LambResponse]
+
+    class Config:
+        from_attributes = True
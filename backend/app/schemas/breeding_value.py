@@ -0,0 +1,31 @@
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from app.db.models.breeding_value import BreedingTrait, EvaluationStatus
+
+
+class GeneticEvaluationResponse(BaseModel):
+    id: int
+    trait: BreedingTrait
+    status: EvaluationStatus
+    animals: Optional[int] = Field(None, description="Animals in the evaluated pedigree")
+    records: Optional[int] = Field(None, description="Phenotype records used")
+    iterations: Optional[int] = Field(None, description="Solver iterations to convergence")
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    job_id: Optional[int] = Field(None, description="Background job running the evaluation")
+
+    class Config:
+        from_attributes = True
+
+
+class BreedingValueResponse(BaseModel):
+    sheep_id: str
+    trait: BreedingTrait
+    ebv: float = Field(..., description="Estimated breeding value, as a deviation in trait units")
+    own_records: int = Field(..., description="Phenotype records of the animal itself")
+    evaluation_id: int
+
+    class Config:
+        from_attributes = True
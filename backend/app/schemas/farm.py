@@ -0,0 +1,20 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class FarmCreate(BaseModel):
+    code: str = Field(..., max_length=50, pattern=r"^[A-Za-z0-9_-]+$", description="Short code sent in the farm header")
+    name: str = Field(..., max_length=100)
+    database: Optional[str] = Field(None, description="FARM_DATABASES entry holding the farm's data")
+    schema_name: Optional[str] = Field(None, description="PostgreSQL schema holding the farm's tables")
+
+
+class FarmResponse(BaseModel):
+    id: int
+    code: str
+    name: str
+    database: Optional[str] = None
+    schema_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
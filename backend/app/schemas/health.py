@@ -1,5 +1,5 @@
-from typing import Optional, List
-from datetime import date
+from typing import Optional
+from datetime import date, datetime
 from pydantic import BaseModel, Field
 from app.db.models.health_event import EventType
 
@@ -10,7 +10,6 @@ class HealthEventBase(BaseModel):
     event_type: EventType
     details: str
     next_due_date: Optional[date] = None
-    attachments: Optional[List[str]] = None
 
 
 class HealthEventCreate(HealthEventBase):
@@ -22,11 +21,11 @@ class HealthEventUpdate(BaseModel):
     event_type: Optional[EventType] = None
     details: Optional[str] = None
     next_due_date: Optional[date] = None
-    attachments: Optional[List[str]] = None
 
 
 class HealthEventResponse(HealthEventBase):
     id: int
+    archived_at: Optional[datetime] = Field(None, description="When the event was moved to the archive")
 
     class Config:
         from_attributes = True
@@ -37,4 +36,5 @@ class HealthEventFilter(BaseModel):
     event_type: Optional[EventType] = None
     start_date: Optional[date] = None
     end_date: Optional[date] = None
-    overdue: Optional[bool] = None 
\ No newline at end of file
+    overdue: Optional[bool] = None
+    include_archived: bool = False 
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+import json
+from pydantic import BaseModel, Field, field_validator
+from app.db.models.job import JobStatus
+
+
+class JobCreate(BaseModel):
+    kind: str = Field(..., description="Registered job kind, e.g. validate_pedigree")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Keyword arguments for the job")
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    progress: float = Field(..., description="Fraction complete, 0 to 1")
+    message: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    cancel_requested: bool
+    queued_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator("params", "result", mode="before")
+    @classmethod
+    def parse_json(cls, v):
+        if isinstance(v, str):
+            return json.loads(v)
+        return v
+
+    class Config:
+        from_attributes = True
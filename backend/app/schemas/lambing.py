@@ -0,0 +1,20 @@
+from typing import Dict
+from datetime import date
+from pydantic import BaseModel, Field
+from app.db.models.sheep import SheepSection
+
+
+class GestationStatResponse(BaseModel):
+    breed: str
+    mean_days: float
+    std_days: float
+    sample_size: int
+
+    class Config:
+        from_attributes = True
+
+
+class LambingCalendarDayResponse(BaseModel):
+    lambing_date: date
+    total: int = Field(..., description="Expected lambings on this day across all sections")
+    sections: Dict[SheepSection, int] = Field(..., description="Expected lambings per section")
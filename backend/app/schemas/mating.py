@@ -0,0 +1,95 @@
+from typing import List, Optional
+from datetime import date
+from pydantic import BaseModel, Field
+from app.schemas.notification import NotificationResponse
+
+
+class RamCapacity(BaseModel):
+    ram_id: str = Field(..., description="Ram's tag ID")
+    capacity: int = Field(..., ge=1, description="Maximum number of ewes for this ram")
+    group_slot: Optional[int] = Field(None, description="Group slot the ram's ewes will be mated in")
+
+
+class MatingOptimizationRequest(BaseModel):
+    rams: List[RamCapacity] = Field(..., min_length=1, description="Available rams and their ewe capacity")
+    ewe_ids: Optional[List[str]] = Field(
+        None, description="Ewes to assign; defaults to the open ewes in the mating section"
+    )
+    max_relationship: Optional[float] = Field(
+        None, ge=0, description="Pairs above this relationship coefficient are never suggested"
+    )
+
+
+class MatingAssignment(BaseModel):
+    ram_id: str
+    ewe_id: str
+    group_slot: Optional[int] = None
+    relationship: float = Field(..., description="Additive relationship coefficient between ram and ewe")
+    expected_inbreeding: float = Field(..., description="Expected inbreeding coefficient of the lamb")
+
+
+class MatingOptimizationResponse(BaseModel):
+    assignments: List[MatingAssignment]
+    unassigned_ewe_ids: List[str]
+    total_relationship: float
+
+
+
+class MatingPairBase(BaseModel):
+    ram_id: str = Field(..., description="Ram's tag ID")
+    ewe_id: str = Field(..., description="Ewe's tag ID")
+    mating_start_date: date
+    group_slot: Optional[int] = Field(None, description="Group slot the pair is mated in")
+
+
+class MatingPairCreate(MatingPairBase):
+    override_user: Optional[str] = Field(None, description="Who accepted the pairing despite an inbreeding alert")
+    override_reason: Optional[str] = None
+
+
+class MatingGroupCreate(BaseModel):
+    ram_id: str = Field(..., description="Ram serving the whole group")
+    ewe_ids: List[str] = Field(..., min_length=1, description="Ewes joined with the ram")
+    group_slot: int = Field(..., description="Group slot the ewes are mated in")
+    mating_start_date: date
+
+
+class MatingPairUpdate(BaseModel):
+    mating_start_date: Optional[date] = None
+    group_slot: Optional[int] = None
+    pregnancy_confirmed: Optional[bool] = None
+    pregnancy_failed: Optional[bool] = None
+    failure_reason: Optional[str] = None
+    actual_lambing_date: Optional[date] = None
+    override_user: Optional[str] = None
+    override_reason: Optional[str] = None
+
+
+class MatingPairResponse(MatingPairBase):
+    id: int
+    expected_lambing_date: Optional[date] = None
+    lambing_window_start: Optional[date] = None
+    lambing_window_end: Optional[date] = None
+    actual_lambing_date: Optional[date] = None
+    pregnancy_confirmed: Optional[bool] = None
+    pregnancy_failed: Optional[bool] = None
+    failure_reason: Optional[str] = None
+    override_user: Optional[str] = None
+    override_reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class MatingPairFilter(BaseModel):
+    ram_id: Optional[str] = None
+    ewe_id: Optional[str] = None
+    group_slot: Optional[int] = None
+    open_only: bool = False
+
+
+class MatingPairsCreated(BaseModel):
+    pairs: List[MatingPairResponse]
+    alerts: List[NotificationResponse] = Field(
+        ..., description="Inbreeding alerts raised for the new pairs"
+    )
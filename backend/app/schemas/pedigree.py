@@ -0,0 +1,34 @@
+from typing import Dict, List, Optional
+from enum import Enum
+from pydantic import BaseModel, Field
+
+
+class PedigreeIssueType(str, Enum):
+    SELF_PARENT = "self_parent"
+    SAME_SIRE_AND_DAM = "same_sire_and_dam"
+    WRONG_PARENT_SEX = "wrong_parent_sex"
+    PARENT_BORN_AFTER_OFFSPRING = "parent_born_after_offspring"
+    SIRE_GONE_BEFORE_CONCEPTION = "sire_gone_before_conception"
+    DAM_GONE_BEFORE_BIRTH = "dam_gone_before_birth"
+    CYCLE = "cycle"
+    CYCLIC_ANCESTRY = "cyclic_ancestry"
+
+
+class PedigreeIssueSeverity(str, Enum):
+    ERROR = "error"
+    WARNING = "warning"
+
+
+class PedigreeIssue(BaseModel):
+    sheep_id: str
+    issue: PedigreeIssueType
+    severity: PedigreeIssueSeverity
+    related_id: Optional[str] = Field(None, description="The parent involved, if any")
+    detail: str
+
+
+class PedigreeValidationReport(BaseModel):
+    checked: int = Field(..., description="Number of sheep checked")
+    valid: bool = Field(..., description="True when no errors were found")
+    counts: Dict[PedigreeIssueType, int]
+    issues: List[PedigreeIssue]
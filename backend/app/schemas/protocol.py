@@ -0,0 +1,59 @@
+from typing import List, Optional
+from datetime import date
+from pydantic import BaseModel, Field, model_validator
+from app.db.models.health_event import EventType
+from app.db.models.sheep import SheepSex, SheepSection
+
+
+class TreatmentProtocolBase(BaseModel):
+    name: str = Field(..., max_length=100)
+    event_type: EventType = EventType.VACCINATION
+    details: Optional[str] = Field(None, description="Product, dose or instructions recorded on each health event")
+    sex: Optional[SheepSex] = Field(None, description="Only sheep of this sex")
+    breed: Optional[str] = Field(None, description="Only sheep of this breed")
+    section: Optional[SheepSection] = Field(None, description="Only sheep currently in this section")
+    min_age_days: Optional[int] = Field(None, ge=0, description="Minimum age when the series starts")
+    max_age_days: Optional[int] = Field(None, ge=0, description="Maximum age when the series starts")
+    first_dose_age_days: int = Field(0, ge=0, description="Age at which the first dose is due")
+    interval_days: Optional[int] = Field(None, gt=0, description="Days from one dose to the next; null for a single dose")
+    doses: Optional[int] = Field(None, gt=0, description="Number of doses in the series; null repeats indefinitely")
+    active: bool = True
+
+    @model_validator(mode="after")
+    def check_schedule(self):
+        if self.interval_days is None and self.doses not in (None, 1):
+            raise ValueError("interval_days is required for a multi-dose protocol")
+        return self
+
+
+class TreatmentProtocolCreate(TreatmentProtocolBase):
+    pass
+
+
+class TreatmentProtocolUpdate(BaseModel):
+    details: Optional[str] = None
+    active: Optional[bool] = None
+
+
+class TreatmentProtocolResponse(TreatmentProtocolBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class DueTreatmentResponse(BaseModel):
+    id: int
+    protocol_id: int
+    protocol_name: str
+    event_type: EventType
+    sheep_id: str
+    dose_number: int
+    due_date: date
+    days_overdue: int = Field(..., description="Days past the due date; negative when not yet due")
+
+
+class DueTreatmentCompletion(BaseModel):
+    due_ids: List[int] = Field(..., min_length=1, description="Due treatments that were given")
+    completed_date: Optional[date] = Field(None, description="Date given; defaults to today")
+    details: Optional[str] = Field(None, description="Extra details for the recorded health events")
@@ -0,0 +1,31 @@
+from typing import Dict, List, Optional
+from datetime import date
+from pydantic import BaseModel, Field
+from app.db.models.sheep import SheepSection
+
+
+class SectionMove(BaseModel):
+    section: SheepSection = Field(..., description="Section to move into")
+    move_date: Optional[date] = Field(None, description="Date of the move; defaults to today")
+    reason: Optional[str] = Field(None, description="Reason for the move")
+
+
+class BulkSectionMove(SectionMove):
+    tag_ids: List[str] = Field(..., min_length=1, description="Tag IDs of the sheep to move")
+
+
+class SectionAssignmentResponse(BaseModel):
+    id: int
+    sheep_id: str
+    section: SheepSection
+    start_date: date
+    end_date: Optional[date] = None
+    reason: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SectionHeadcountResponse(BaseModel):
+    day: date
+    counts: Dict[SheepSection, int]
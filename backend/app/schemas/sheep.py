@@ -1,5 +1,5 @@
-from typing import Optional
-from datetime import date
+from typing import Dict, List, Optional
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field
 from app.db.models.sheep import SheepStatus, SheepSex, SheepSection
@@ -32,6 +32,8 @@ class SheepUpdate(BaseModel):
     sale_date: Optional[date] = None
     sale_price: Optional[Decimal] = None
     death_date: Optional[date] = None
+    rfid_code: Optional[str] = None
+    qr_code: Optional[str] = None
     notes: Optional[str] = None
 
 
@@ -40,6 +42,7 @@ class SheepFilter(BaseModel):
     sex: Optional[SheepSex] = None
     section: Optional[SheepSection] = None
     breed: Optional[str] = None
+    include_archived: bool = False
 
 
 class SheepResponse(SheepBase):
@@ -50,6 +53,21 @@ class SheepResponse(SheepBase):
     death_date: Optional[date] = None
     sire_id: Optional[str] = None
     dam_id: Optional[str] = None
+    archived_at: Optional[datetime] = Field(None, description="When the animal was moved to the archive")
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+class TagResolveRequest(BaseModel):
+    codes: List[str] = Field(..., min_length=1, max_length=1000, description="RFID or QR codes read at the chute")
+
+
+class TagResolveResponse(BaseModel):
+    resolved: Dict[str, SheepResponse] = Field(..., description="Sheep keyed by the code that matched them")
+    unresolved: List[str] = Field(..., description="Codes that matched no sheep")
+
+
+class AutocompleteSuggestion(BaseModel):
+    tag_id: str = Field(..., description="Tag ID of the suggested sheep")
+    value: str = Field(..., description="Identifier that matched the prefix")
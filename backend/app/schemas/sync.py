@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel, Field
+from app.schemas.sheep import SheepResponse
+from app.schemas.health import HealthEventResponse
+
+
+class SyncDeletions(BaseModel):
+    sheep: List[str] = Field(default_factory=list, description="Tag IDs of deleted sheep")
+    health_events: List[int] = Field(default_factory=list, description="IDs of deleted health events")
+
+
+class SyncChangesResponse(BaseModel):
+    cursor: int = Field(..., description="Cursor to pass as `since` on the next call")
+    has_more: bool = Field(..., description="Whether more changes are waiting after this batch")
+    sheep: List[SheepResponse] = Field(default_factory=list)
+    health_events: List[HealthEventResponse] = Field(default_factory=list)
+    deleted: SyncDeletions = Field(default_factory=SyncDeletions)
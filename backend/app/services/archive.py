@@ -0,0 +1,245 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import DateTime, delete, exists, func, insert, literal, or_, select, text
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.core.jobs import JobContext
+from app.db.models.archive import (
+    AttachmentArchive,
+    HealthEventArchive,
+    SectionAssignmentArchive,
+    SheepArchive
+)
+from app.db.models.attachment import Attachment
+from app.db.models.birth_record import BirthRecord
+from app.db.models.breeding_value import BreedingValue
+from app.db.models.change_log import ChangeOperation
+from app.db.models.health_event import HealthEvent
+from app.db.models.lamb import Lamb
+from app.db.models.mating_pair import MatingPair
+from app.db.models.section_assignment import SectionAssignment
+from app.db.models.sheep import Sheep, SheepStatus
+from app.db.models.treatment_protocol import DueTreatment
+from app.db.tenancy import require_farm_id
+from app.services.changes import ChangeEntity, record_changes
+
+logger = logging.getLogger(__name__)
+
+_Offspring = aliased(Sheep)
+
+# References that keep an animal in the hot sheep table however long it has
+# been gone: pedigree, breeding and lambing records resolve against
+# sheep.tag_id, and genetic evaluations need every animal they mention
+PINNING_REFERENCES = [
+    _Offspring.sire_id,
+    _Offspring.dam_id,
+    BirthRecord.ewe_id,
+    BirthRecord.sire_id,
+    MatingPair.ram_id,
+    MatingPair.ewe_id,
+    Lamb.tag_id,
+]
+
+
+def _move_rows(db: Session, source, target, condition, key) -> list:
+    """Copy the session farm's rows of ``source`` matching ``condition`` into ``target``, then delete them.
+
+    ``source`` and ``target`` are a hot model and its archive model (either
+    way round); returns the ``key`` column of the rows moved.
+    """
+    archiving = hasattr(target, "archived_at")
+    rows = db.execute(
+        select(source.id, key).where(condition, source.farm_id == require_farm_id(db))
+    ).all()
+    if not rows:
+        return []
+    ids = [row[0] for row in rows]
+
+    columns = [column.name for column in source.__table__.columns if column.name != "archived_at"]
+    copied = [source.__table__.c[name] for name in columns]
+    if archiving:
+        columns.append("archived_at")
+        copied.append(literal(datetime.utcnow(), DateTime).label("archived_at"))
+    db.execute(insert(target).from_select(columns, select(*copied).where(source.__table__.c.id.in_(ids))))
+    db.execute(
+        delete(source).where(source.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    return [row[1] for row in rows]
+
+
+def _archive_attachments(db: Session, event_ids: List[int]) -> None:
+    """Move the attachments of archived health events along with them; their files stay in place."""
+    if event_ids:
+        _move_rows(db, Attachment, AttachmentArchive, Attachment.health_event_id.in_(event_ids), Attachment.id)
+
+
+def ensure_health_event_partitions(db: Session, today: Optional[date] = None) -> List[str]:
+    """Create the yearly health_events partitions up to HEALTH_EVENT_PARTITIONS_AHEAD_YEARS ahead.
+
+    Returns the names of the partitions created. A year whose rows already
+    sit in the default partition is skipped with a warning; those rows have
+    to be moved out by hand before its partition can be attached.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    year = (today or date.today()).year
+    created = []
+    for y in range(year, year + settings.HEALTH_EVENT_PARTITIONS_AHEAD_YEARS + 1):
+        name = f"health_events_y{y}"
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+            continue
+        try:
+            db.execute(text(
+                f"CREATE TABLE {name} PARTITION OF health_events "
+                f"FOR VALUES FROM ('{y}-01-01') TO ('{y + 1}-01-01')"
+            ))
+            db.commit()
+            created.append(name)
+        except DBAPIError as e:
+            db.rollback()
+            logger.warning(f"Could not create partition {name}: {e}")
+    return created
+
+
+def _archive_candidates(db: Session, cutoff: date, limit: int) -> List[str]:
+    """Sold or deceased animals off the farm since before ``cutoff`` that nothing pins."""
+    off_farm = func.coalesce(Sheep.death_date, Sheep.sale_date)
+    query = db.query(Sheep.tag_id).filter(
+        Sheep.status.in_([SheepStatus.SOLD, SheepStatus.DECEASED]),
+        off_farm < cutoff
+    )
+    for reference in PINNING_REFERENCES:
+        query = query.filter(~exists().where(reference == Sheep.tag_id))
+    return [tag_id for (tag_id,) in query.order_by(off_farm).limit(limit).all()]
+
+
+def archive_inactive_sheep(db: Session, cutoff: date, batch_size: Optional[int] = None) -> int:
+    """Move one batch of inactive animals, with their health events, attachments and section history, to the archive.
+
+    Materialized due doses and breeding values of those animals are derived
+    data and are deleted rather than archived. Returns the number of animals
+    moved; zero means there is nothing left to archive.
+    """
+    tags = _archive_candidates(db, cutoff, batch_size or settings.ARCHIVE_BATCH_SIZE)
+    if not tags:
+        return 0
+
+    _move_rows(
+        db, SectionAssignment, SectionAssignmentArchive, SectionAssignment.sheep_id.in_(tags), SectionAssignment.id
+    )
+    event_ids = _move_rows(db, HealthEvent, HealthEventArchive, HealthEvent.sheep_id.in_(tags), HealthEvent.id)
+    _archive_attachments(db, event_ids)
+    db.query(DueTreatment).filter(DueTreatment.sheep_id.in_(tags)).delete(synchronize_session=False)
+    db.query(BreedingValue).filter(BreedingValue.sheep_id.in_(tags)).delete(synchronize_session=False)
+    moved = _move_rows(db, Sheep, SheepArchive, Sheep.tag_id.in_(tags), Sheep.tag_id)
+
+    # Offline clients drop archived records from their working set
+    record_changes(db, ChangeEntity.HEALTH_EVENT, event_ids, ChangeOperation.DELETE)
+    record_changes(db, ChangeEntity.SHEEP, moved, ChangeOperation.DELETE)
+    db.commit()
+    return len(moved)
+
+
+def archive_old_health_events(db: Session, cutoff: date, batch_size: Optional[int] = None) -> int:
+    """Move one batch of health events dated, and due, before ``cutoff``, with their attachments, to the archive.
+
+    Events still due on or after the cutoff stay, so nothing recent drops out
+    of the overdue lists. Returns the number of events moved.
+    """
+    old_events = [event_id for (event_id,) in db.query(HealthEvent.id).filter(
+        HealthEvent.event_date < cutoff,
+        or_(HealthEvent.next_due_date.is_(None), HealthEvent.next_due_date < cutoff)
+    ).limit(batch_size or settings.ARCHIVE_BATCH_SIZE)]
+    event_ids = _move_rows(db, HealthEvent, HealthEventArchive, HealthEvent.id.in_(old_events), HealthEvent.id)
+    _archive_attachments(db, event_ids)
+    record_changes(db, ChangeEntity.HEALTH_EVENT, event_ids, ChangeOperation.DELETE)
+    db.commit()
+    return len(event_ids)
+
+
+def run_archival(db: Session, today: Optional[date] = None, ctx: Optional[JobContext] = None) -> Dict[str, int]:
+    """Keep the hot tables to the active working set.
+
+    Creates upcoming health event partitions, then archives inactive animals
+    off the farm for ARCHIVE_INACTIVE_AFTER_DAYS and health events older than
+    HEALTH_EVENT_RETENTION_DAYS, in batches of ARCHIVE_BATCH_SIZE, each
+    committed on its own.
+    """
+    today = today or date.today()
+    partitions = ensure_health_event_partitions(db, today)
+
+    sheep_cutoff = today - timedelta(days=settings.ARCHIVE_INACTIVE_AFTER_DAYS)
+    archived_sheep = 0
+    while True:
+        moved = archive_inactive_sheep(db, sheep_cutoff)
+        archived_sheep += moved
+        if ctx:
+            ctx.progress(0.25, f"Archived {archived_sheep} inactive animals")
+        if not moved:
+            break
+
+    event_cutoff = today - timedelta(days=settings.HEALTH_EVENT_RETENTION_DAYS)
+    archived_events = 0
+    while True:
+        moved = archive_old_health_events(db, event_cutoff)
+        archived_events += moved
+        if ctx:
+            ctx.progress(0.75, f"Archived {archived_events} old health events")
+        if not moved:
+            break
+
+    logger.info(
+        f"Archival finished: {archived_sheep} animals, {archived_events} health events, "
+        f"{len(partitions)} partitions created"
+    )
+    return {
+        "partitions_created": len(partitions),
+        "archived_sheep": archived_sheep,
+        "archived_health_events": archived_events,
+    }
+
+
+def archive_job(ctx: JobContext) -> dict:
+    """Job handler: run the nightly archival."""
+    db = ctx.open_session()
+    try:
+        return run_archival(db, ctx=ctx)
+    finally:
+        db.close()
+
+
+def get_archived_sheep(db: Session, tag_id: str) -> Optional[SheepArchive]:
+    """Get an archived animal by tag ID."""
+    return db.query(SheepArchive).filter(SheepArchive.tag_id == tag_id).first()
+
+
+def restore_sheep(db: Session, tag_id: str) -> Optional[Sheep]:
+    """Move an archived animal and all of its archived history back to the hot tables."""
+    if not get_archived_sheep(db, tag_id):
+        return None
+
+    try:
+        restored = _move_rows(db, SheepArchive, Sheep, SheepArchive.tag_id == tag_id, SheepArchive.tag_id)
+        _move_rows(
+            db, SectionAssignmentArchive, SectionAssignment,
+            SectionAssignmentArchive.sheep_id == tag_id, SectionAssignmentArchive.id
+        )
+        event_ids = _move_rows(
+            db, HealthEventArchive, HealthEvent, HealthEventArchive.sheep_id == tag_id, HealthEventArchive.id
+        )
+        if event_ids:
+            _move_rows(
+                db, AttachmentArchive, Attachment,
+                AttachmentArchive.health_event_id.in_(event_ids), AttachmentArchive.id
+            )
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"Sheep {tag_id} conflicts with an active record (tag, scrapie ID, RFID or QR code)")
+
+    record_changes(db, ChangeEntity.SHEEP, restored)
+    record_changes(db, ChangeEntity.HEALTH_EVENT, event_ids)
+    db.commit()
+    return db.query(Sheep).filter(Sheep.tag_id == tag_id).first()
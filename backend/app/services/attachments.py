@@ -0,0 +1,197 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.archive import AttachmentArchive
+from app.db.models.attachment import Attachment
+from app.db.tenancy import ALL_FARMS
+
+# Arbitrary application-wide key for the Postgres advisory locks that
+# serialize uploads and deletes of the same stored object
+ATTACHMENT_LOCK_KEY = 7291004
+
+
+class AttachmentTooLargeError(ValueError):
+    """The upload exceeded ATTACHMENT_MAX_BYTES."""
+
+
+class StagedUpload(NamedTuple):
+    """An upload written to a temporary file, not yet placed in storage."""
+    sha256: str
+    size: int
+    path: str
+
+
+def _storage_root() -> Path:
+    return Path(settings.ATTACHMENT_STORAGE_DIR)
+
+
+def object_path(sha256: str) -> Path:
+    """Location of a stored file; the first two hex digits shard the directory."""
+    return _storage_root() / "objects" / sha256[:2] / sha256
+
+
+def thumbnail_path(sha256: str) -> Path:
+    return _storage_root() / "thumbnails" / sha256[:2] / f"{sha256}.jpg"
+
+
+async def store_stream(chunks: AsyncIterator[bytes]) -> StagedUpload:
+    """Write an upload to a temporary file as it streams in, hashing it on the way.
+
+    The file sits in the same filesystem as the object store so
+    create_attachment can rename it into place.
+    """
+    tmp_dir = _storage_root() / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > settings.ATTACHMENT_MAX_BYTES:
+                    raise AttachmentTooLargeError(
+                        f"Attachment exceeds the {settings.ATTACHMENT_MAX_BYTES} byte limit"
+                    )
+                hasher.update(chunk)
+                tmp.write(chunk)
+        return StagedUpload(hasher.hexdigest(), size, tmp_name)
+    except BaseException:
+        discard_upload(tmp_name)
+        raise
+
+
+def discard_upload(path: str) -> None:
+    """Remove a staged upload that was not placed in storage."""
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def _lock_object(db: Session, sha256: str) -> None:
+    """Serialize placing and removing one stored object until the transaction ends.
+
+    Uploads place the object and insert their row under the lock, and
+    deletes re-check the references before removing the object under it, so
+    a delete never removes bytes a concurrent upload is about to reference.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            text("SELECT pg_advisory_xact_lock(:namespace, :key)"),
+            {"namespace": ATTACHMENT_LOCK_KEY, "key": int(sha256[:7], 16)}
+        )
+
+
+def create_attachment(
+    db: Session,
+    health_event_id: int,
+    upload: StagedUpload,
+    filename: str,
+    content_type: str
+) -> Attachment:
+    """Place a staged upload in content-addressed storage and attach it to a health event.
+
+    If the content is already stored the staged file is dropped, so identical
+    files are kept once.
+    """
+    try:
+        _lock_object(db, upload.sha256)
+        target = object_path(upload.sha256)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(upload.path, target)
+        db_attachment = Attachment(
+            health_event_id=health_event_id,
+            sha256=upload.sha256,
+            size=upload.size,
+            filename=filename,
+            content_type=content_type
+        )
+        db.add(db_attachment)
+        db.commit()
+    finally:
+        discard_upload(upload.path)
+    db.refresh(db_attachment)
+    return db_attachment
+
+
+def get_attachment(db: Session, attachment_id: int) -> Optional[Attachment]:
+    """Get an attachment by ID."""
+    return db.query(Attachment).filter(Attachment.id == attachment_id).first()
+
+
+def list_attachments(db: Session, health_event_id: int) -> List[Attachment]:
+    """List the attachments of a health event."""
+    return db.query(Attachment).filter(
+        Attachment.health_event_id == health_event_id
+    ).order_by(Attachment.id).all()
+
+
+def delete_attachment(db: Session, attachment_id: int) -> bool:
+    """Delete an attachment, removing the stored file once nothing references it."""
+    db_attachment = get_attachment(db, attachment_id)
+    if not db_attachment:
+        return False
+
+    sha256 = db_attachment.sha256
+    db.delete(db_attachment)
+    db.commit()
+
+    # Objects are shared by identical uploads of any farm, and a concurrent
+    # upload may be attaching this one; the lock makes the check final
+    _lock_object(db, sha256)
+    referenced = any(
+        db.query(model.id).filter(model.sha256 == sha256).execution_options(**ALL_FARMS).first()
+        for model in (Attachment, AttachmentArchive)
+    )
+    if not referenced:
+        for path in (object_path(sha256), thumbnail_path(sha256)):
+            if path.exists():
+                path.unlink()
+    db.commit()
+    return True
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single-range ``Range: bytes=...`` header into inclusive offsets.
+
+    Returns None when the whole file should be sent (no header, or a form we
+    choose not to honour such as multiple ranges) and raises ValueError when
+    the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Range {header} not satisfiable for {size} bytes")
+    return start, end
+
+
+def iter_file(path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Yield the inclusive byte range of a file in ATTACHMENT_CHUNK_SIZE chunks."""
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(settings.ATTACHMENT_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -0,0 +1,603 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import psycopg2
+from psycopg2 import sql
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+DUMP_DIR = "dump"
+DRILL_LOG = "drills.jsonl"
+_HASH_CHUNK = 1 << 20
+
+
+# --- Connections and PostgreSQL client tools ---------------------------------
+
+def _connection_params(database: Optional[str] = None) -> dict:
+    url = make_url(settings.SQLALCHEMY_DATABASE_URI)
+    return {
+        "host": url.host or "localhost",
+        "port": url.port or 5432,
+        "user": url.username,
+        "password": url.password,
+        "dbname": database or url.database,
+    }
+
+
+def configured_database() -> str:
+    """Name of the application's database."""
+    return _connection_params()["dbname"]
+
+
+def _connect(database: Optional[str] = None):
+    return psycopg2.connect(**_connection_params(database))
+
+
+def _run(args: List[str], database: Optional[str] = None) -> str:
+    """Run a PostgreSQL client tool against ``database``; raises RuntimeError with its stderr on failure."""
+    params = _connection_params(database)
+    env = dict(os.environ, PGHOST=params["host"], PGPORT=str(params["port"]), PGDATABASE=params["dbname"])
+    if params["user"]:
+        env["PGUSER"] = params["user"]
+    if params["password"]:
+        env["PGPASSWORD"] = params["password"]
+    result = subprocess.run(args, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+# --- Manifests and checksums -------------------------------------------------
+
+def backup_path(name: str) -> Path:
+    return Path(settings.BACKUP_DIR) / name
+
+
+def read_manifest(name: str) -> dict:
+    path = backup_path(name) / MANIFEST
+    if not path.exists():
+        raise ValueError(f"Backup {name} not found")
+    return json.loads(path.read_text())
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Write atomically, so an interrupted run never leaves a torn manifest or state file."""
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2, default=str))
+    os.replace(tmp, path)
+
+
+def list_backups() -> List[dict]:
+    """Manifests of completed backups, oldest first."""
+    root = Path(settings.BACKUP_DIR)
+    if not root.exists():
+        return []
+    manifests = []
+    for path in root.glob(f"*/{MANIFEST}"):
+        manifest = json.loads(path.read_text())
+        if manifest.get("status") == "completed":
+            manifests.append(manifest)
+    return sorted(manifests, key=lambda m: m["started_at"])
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _data_files(root: Path) -> List[Path]:
+    """The dump directory and table exports; manifests and restore state are not backup data."""
+    return sorted(
+        p for p in root.rglob("*")
+        if p.is_file() and (p.parent != root or p.name.endswith(".csv.gz"))
+    )
+
+
+def _checksums(root: Path, jobs: int) -> Dict[str, str]:
+    """SHA-256 of every backup file under ``root``, hashed in parallel."""
+    files = _data_files(root)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        digests = pool.map(_sha256, files)
+    return {path.relative_to(root).as_posix(): digest for path, digest in zip(files, digests)}
+
+
+def verify_backup(name: str, jobs: Optional[int] = None) -> List[str]:
+    """Check a backup's files against its manifest checksums; returns the problems found."""
+    manifest = read_manifest(name)
+    root = backup_path(name)
+    actual = _checksums(root, jobs or settings.BACKUP_JOBS)
+    problems = []
+    for path, digest in manifest["files"].items():
+        if path not in actual:
+            problems.append(f"{name}/{path}: missing")
+        elif actual[path] != digest:
+            problems.append(f"{name}/{path}: checksum mismatch")
+    problems.extend(f"{name}/{path}: not in manifest" for path in actual.keys() - manifest["files"].keys())
+    return problems
+
+
+def _chain(name: str) -> List[dict]:
+    """Manifests from the full backup up to ``name``, in restore order."""
+    chain = [read_manifest(name)]
+    while chain[0]["type"] == "incremental":
+        chain.insert(0, read_manifest(chain[0]["parent"]))
+    return chain
+
+
+# --- Backups -----------------------------------------------------------------
+
+def _table_stats(cursor) -> Dict[str, dict]:
+    """Row count and updated_at high-water mark of every table, read in the caller's snapshot."""
+    cursor.execute("""
+        SELECT c.relname, EXISTS (
+            SELECT 1 FROM pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attname = 'updated_at' AND NOT a.attisdropped
+        )
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p') AND NOT c.relispartition
+        ORDER BY c.relname
+    """)
+    stats = {}
+    for table, incremental in cursor.fetchall():
+        columns = sql.SQL("count(*), max(updated_at)") if incremental else sql.SQL("count(*), NULL")
+        cursor.execute(sql.SQL("SELECT {} FROM {}").format(columns, sql.Identifier(table)))
+        rows, watermark = cursor.fetchone()
+        stats[table] = {
+            "rows": rows,
+            "incremental": incremental,
+            "watermark": watermark.isoformat() if watermark else None,
+        }
+    return stats
+
+
+def _snapshot_connection():
+    """A read-only repeatable-read connection with an exported snapshot other sessions can share."""
+    conn = _connect()
+    conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    cursor = conn.cursor()
+    cursor.execute("SELECT pg_export_snapshot()")
+    return conn, cursor, cursor.fetchone()[0]
+
+
+def create_full_backup(jobs: Optional[int] = None) -> dict:
+    """Parallel directory-format pg_dump plus a manifest of row counts, watermarks and checksums.
+
+    Row counts and updated_at watermarks are read in the snapshot the dump
+    uses, so they describe exactly the dumped data and incrementals can
+    continue from them. A failed run keeps its directory, with a manifest
+    marked failed, for inspection; prune_backups removes it later.
+    """
+    jobs = jobs or settings.BACKUP_JOBS
+    started_at = datetime.utcnow()
+    name = f"full_{started_at:%Y%m%dT%H%M%S}"
+    root = backup_path(name)
+    root.mkdir(parents=True)
+    manifest = {
+        "name": name,
+        "type": "full",
+        "status": "in_progress",
+        "database": configured_database(),
+        "started_at": started_at.isoformat(),
+        "jobs": jobs,
+    }
+    _write_json(root / MANIFEST, manifest)
+    started = time.monotonic()
+    try:
+        conn, cursor, snapshot = _snapshot_connection()
+        try:
+            manifest["tables"] = _table_stats(cursor)
+            _run(["pg_dump", "--format=directory", f"--jobs={jobs}", f"--snapshot={snapshot}",
+                  f"--file={root / DUMP_DIR}"])
+        finally:
+            conn.rollback()
+            conn.close()
+        manifest["dump_seconds"] = round(time.monotonic() - started, 2)
+        manifest["files"] = _checksums(root, jobs)
+    except BaseException as e:
+        manifest.update(status="failed", error=str(e) or type(e).__name__)
+        _write_json(root / MANIFEST, manifest)
+        raise
+    manifest["status"] = "completed"
+    manifest["total_seconds"] = round(time.monotonic() - started, 2)
+    _write_json(root / MANIFEST, manifest)
+    logger.info(f"Full backup {name} written in {manifest['total_seconds']}s")
+    return manifest
+
+
+def _export_table(snapshot: Optional[str], table: str, since: Optional[str], out: Path) -> int:
+    """COPY a table's rows changed since ``since`` to a gzipped CSV; returns the row count."""
+    conn = _connect()
+    try:
+        conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+        with conn.cursor() as cursor:
+            if snapshot:
+                cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(table))
+            if since:
+                # updated_at is a date on most tables, so the watermark day is re-exported
+                query = sql.SQL("{} WHERE updated_at >= {}").format(query, sql.Literal(since))
+            tmp = out.with_suffix(".part")
+            with gzip.open(tmp, "wb") as f:
+                cursor.copy_expert(
+                    sql.SQL("COPY ({}) TO STDOUT WITH (FORMAT csv, HEADER)").format(query).as_string(conn), f
+                )
+            os.replace(tmp, out)
+            return cursor.rowcount
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def create_incremental_backup(
+    parent: Optional[str] = None,
+    jobs: Optional[int] = None,
+    resume: Optional[str] = None
+) -> dict:
+    """Export rows changed since the parent backup, one gzipped CSV per table.
+
+    Tables are exported in parallel from one shared snapshot and the manifest
+    is saved after each table, so an interrupted run continues with
+    ``resume`` instead of starting over. Only inserts and updates are
+    captured; deletes reach backups with the next full backup. Tables
+    without an updated_at column are left to full backups.
+    """
+    jobs = jobs or settings.BACKUP_JOBS
+    if resume:
+        manifest = read_manifest(resume)
+        if manifest["status"] == "completed":
+            return manifest
+    else:
+        completed = list_backups()
+        if parent is None:
+            if not completed:
+                raise ValueError("No backup to base an incremental on; take a full backup first")
+            parent = completed[-1]["name"]
+        parent_manifest = read_manifest(parent)
+        if parent_manifest.get("status") != "completed":
+            raise ValueError(f"Backup {parent} did not complete and cannot be a parent")
+        started_at = datetime.utcnow()
+        manifest = {
+            "name": f"incr_{started_at:%Y%m%dT%H%M%S}",
+            "type": "incremental",
+            "status": "in_progress",
+            "parent": parent,
+            "database": configured_database(),
+            "started_at": started_at.isoformat(),
+            "jobs": jobs,
+            "since": {t: s["watermark"] for t, s in parent_manifest["tables"].items() if s["incremental"]},
+            "tables": None,
+            "files": {},
+        }
+        backup_path(manifest["name"]).mkdir(parents=True)
+
+    root = backup_path(manifest["name"])
+    lock = threading.Lock()
+    started = time.monotonic()
+    conn, cursor, snapshot = _snapshot_connection()
+    try:
+        # A resumed run reads a newer snapshot; keeping the first run's
+        # watermarks means the next incremental overlaps rather than skips
+        stats = _table_stats(cursor)
+        if manifest["tables"] is None:
+            manifest["tables"] = stats
+        _write_json(root / MANIFEST, manifest)
+
+        def export(table: str):
+            out = root / f"{table}.csv.gz"
+            rows = _export_table(snapshot, table, manifest["since"].get(table), out)
+            digest = _sha256(out)
+            with lock:
+                manifest["tables"][table].update(file=out.name, exported_rows=rows)
+                manifest["files"][out.name] = digest
+                _write_json(root / MANIFEST, manifest)
+
+        pending = [
+            table for table, entry in stats.items()
+            if entry["incremental"] and table in manifest["tables"] and "file" not in manifest["tables"][table]
+        ]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(export, pending))
+    finally:
+        conn.rollback()
+        conn.close()
+
+    manifest["status"] = "completed"
+    manifest["total_seconds"] = round(manifest.get("total_seconds", 0) + time.monotonic() - started, 2)
+    _write_json(root / MANIFEST, manifest)
+    logger.info(f"Incremental backup {manifest['name']} written in {manifest['total_seconds']}s")
+    return manifest
+
+
+def _failed_backups() -> List[dict]:
+    """Manifests of backups that failed or never finished."""
+    root = Path(settings.BACKUP_DIR)
+    if not root.exists():
+        return []
+    manifests = [json.loads(path.read_text()) for path in root.glob(f"*/{MANIFEST}")]
+    return [m for m in manifests if m.get("status") != "completed"]
+
+
+def prune_backups(retention_days: Optional[int] = None) -> List[str]:
+    """Delete full backups older than the retention window with their incrementals.
+
+    The newest full backup and its chain are always kept. Failed and
+    unfinished backups are deleted once they are past the window too.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days or settings.BACKUP_RETENTION_DAYS)
+    backups = list_backups()
+    fulls = [m for m in backups if m["type"] == "full"]
+    expired = {m["name"] for m in fulls[:-1] if datetime.fromisoformat(m["started_at"]) < cutoff}
+    for manifest in backups:
+        if manifest["type"] == "incremental" and manifest["parent"] in expired:
+            expired.add(manifest["name"])
+    expired.update(m["name"] for m in _failed_backups() if datetime.fromisoformat(m["started_at"]) < cutoff)
+    for name in expired:
+        shutil.rmtree(backup_path(name), ignore_errors=True)
+    return sorted(expired)
+
+
+# --- Restore -----------------------------------------------------------------
+
+def _recreate_database(database: str) -> None:
+    conn = _connect("postgres")
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname = %s AND pid <> pg_backend_pid()",
+                (database,)
+            )
+            cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(database)))
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(database)))
+    finally:
+        conn.close()
+
+
+def drop_database(database: str) -> None:
+    conn = _connect("postgres")
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(database)))
+    finally:
+        conn.close()
+
+
+def _restore_item(dump: Path, database: str, toc_line: str, scratch: Path) -> None:
+    """Restore a single TOC entry of a directory-format dump, all or nothing."""
+    fd, list_file = tempfile.mkstemp(suffix=".list", dir=scratch)
+    with os.fdopen(fd, "w") as f:
+        f.write(toc_line + "\n")
+    try:
+        _run(["pg_restore", "--exit-on-error", "--single-transaction", f"--dbname={database}",
+              f"--use-list={list_file}", str(dump)], database)
+    finally:
+        os.unlink(list_file)
+
+
+def _apply_incremental(database: str, manifest: dict) -> int:
+    """Upsert an incremental's rows by primary key in one transaction; returns the rows applied.
+
+    Foreign key triggers are suspended (session_replication_role) because
+    the tables arrive in name order, not dependency order, so this needs a
+    superuser, as restoring a dump already does.
+    """
+    root = backup_path(manifest["name"])
+    applied = 0
+    conn = _connect(database)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SET LOCAL session_replication_role = replica")
+            for table, entry in sorted(manifest["tables"].items()):
+                if "file" not in entry:
+                    continue
+                cursor.execute("""
+                    SELECT a.attname FROM pg_index i
+                    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                    WHERE i.indrelid = %s::regclass AND i.indisprimary
+                """, (table,))
+                key = [row[0] for row in cursor.fetchall()]
+                if not key:
+                    logger.warning(f"Skipping {table} in {manifest['name']}: no primary key to upsert on")
+                    continue
+                cursor.execute("""
+                    SELECT attname FROM pg_attribute
+                    WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum
+                """, (table,))
+                columns = [row[0] for row in cursor.fetchall()]
+
+                cursor.execute(sql.SQL("CREATE TEMP TABLE incoming (LIKE {}) ON COMMIT DROP").format(sql.Identifier(table)))
+                with gzip.open(root / entry["file"], "rb") as f:
+                    cursor.copy_expert("COPY incoming FROM STDIN WITH (FORMAT csv, HEADER)", f)
+                column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+                updates = [c for c in columns if c not in key]
+                conflict = sql.SQL("DO NOTHING") if not updates else sql.SQL("DO UPDATE SET {}").format(
+                    sql.SQL(", ").join(sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(c)) for c in updates)
+                )
+                cursor.execute(sql.SQL(
+                    "INSERT INTO {table} ({columns}) SELECT {columns} FROM incoming ON CONFLICT ({key}) {conflict}"
+                ).format(
+                    table=sql.Identifier(table),
+                    columns=column_list,
+                    key=sql.SQL(", ").join(map(sql.Identifier, key)),
+                    conflict=conflict
+                ))
+                applied += cursor.rowcount
+                cursor.execute("DROP TABLE incoming")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return applied
+
+
+def restore_backup(
+    name: str,
+    database: Optional[str] = None,
+    jobs: Optional[int] = None,
+    resume: bool = False,
+    progress: Optional[Callable[[str], None]] = None
+) -> dict:
+    """Restore a backup, and every incremental up to it, into ``database``.
+
+    Checksums are verified first. Schema is restored one TOC entry at a
+    time, then table data in parallel one TOC entry per worker, then
+    indexes and constraints with pg_restore --jobs. Finished steps and TOC
+    entries are recorded in a state file next to the dump, so ``resume``
+    continues an interrupted restore into the same database instead of
+    recreating it or restoring an object twice. Returns per-phase timings.
+    """
+    jobs = jobs or settings.BACKUP_JOBS
+    database = database or configured_database()
+    chain = _chain(name)
+    full = chain[0]
+    dump = backup_path(full["name"]) / DUMP_DIR
+    state_path = backup_path(full["name"]) / f"restore_{database}.json"
+    state = json.loads(state_path.read_text()) if resume and state_path.exists() else {"done": []}
+    done = set(state["done"])
+    lock = threading.Lock()
+    timings: Dict[str, float] = {}
+
+    def step(label: str, key: str, action: Callable[[], None]) -> None:
+        if key in done:
+            return
+        if progress:
+            progress(label)
+        started = time.monotonic()
+        action()
+        with lock:
+            timings[label] = round(timings.get(label, 0) + time.monotonic() - started, 2)
+            done.add(key)
+            state["done"] = sorted(done)
+            _write_json(state_path, state)
+
+    def verify():
+        problems = [p for manifest in chain for p in verify_backup(manifest["name"], jobs)]
+        if problems:
+            raise RuntimeError("Backup failed verification: " + "; ".join(problems))
+
+    started = time.monotonic()
+    step("verify", "verify", verify)
+    step("create database", "create", lambda: _recreate_database(database))
+
+    def toc(section: str) -> List[str]:
+        listing = _run(["pg_restore", "--list", f"--section={section}", str(dump)])
+        return [line for line in listing.splitlines() if line and not line.startswith(";")]
+
+    data = toc("data")
+    table_data = [line for line in data if " TABLE DATA " in line]
+    sequences = [line for line in data if " SEQUENCE SET " in line]
+    with tempfile.TemporaryDirectory() as scratch:
+        # In dump order, so every object follows those it depends on. A state
+        # file with a finished "pre-data" step predates per-entry tracking
+        for line in ([] if "pre-data" in done else toc("pre-data")):
+            step("schema", f"pre-data:{line.split(';')[0]}",
+                 lambda line=line: _restore_item(dump, database, line, Path(scratch)))
+        data_started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(step, "data", f"data:{line.split(';')[0]}",
+                            lambda line=line: _restore_item(dump, database, line, Path(scratch)))
+                for line in table_data
+            ]
+            for future in futures:
+                future.result()
+        for line in sequences:
+            step("sequences", f"sequence:{line.split(';')[0]}",
+                 lambda line=line: _restore_item(dump, database, line, Path(scratch)))
+        if "data" in timings:
+            # Wall-clock time of the parallel phase, not the sum over workers
+            timings["data"] = round(time.monotonic() - data_started, 2)
+    step("indexes and constraints", "post-data", lambda: _run(
+        ["pg_restore", "--exit-on-error", "--section=post-data", f"--jobs={jobs}", f"--dbname={database}", str(dump)],
+        database
+    ))
+    for manifest in chain[1:]:
+        step(f"incremental {manifest['name']}", f"incremental:{manifest['name']}",
+             lambda manifest=manifest: _apply_incremental(database, manifest))
+
+    state_path.unlink(missing_ok=True)
+    return {
+        "backup": name,
+        "database": database,
+        "chain": [m["name"] for m in chain],
+        "timings": timings,
+        "recovery_seconds": round(time.monotonic() - started, 2),
+    }
+
+
+def _row_counts(database: str, tables: List[str]) -> Dict[str, int]:
+    conn = _connect(database)
+    try:
+        with conn.cursor() as cursor:
+            counts = {}
+            for table in tables:
+                cursor.execute(sql.SQL("SELECT count(*) FROM {}").format(sql.Identifier(table)))
+                counts[table] = cursor.fetchone()[0]
+            return counts
+    finally:
+        conn.close()
+
+
+def restore_drill(
+    name: Optional[str] = None,
+    jobs: Optional[int] = None,
+    keep: bool = False,
+    progress: Optional[Callable[[str], None]] = None
+) -> dict:
+    """Restore a backup into a scratch database, check it, and report the recovery time.
+
+    Row counts must match the backup's snapshot exactly for a full backup;
+    after incrementals a table may hold more rows, since deletes are not
+    carried by incrementals. The report is appended to drills.jsonl in
+    BACKUP_DIR so recovery times can be tracked over time.
+    """
+    if name is None:
+        backups = list_backups()
+        if not backups:
+            raise ValueError("No backups to drill")
+        name = backups[-1]["name"]
+    started_at = datetime.utcnow()
+    database = f"{configured_database()}_drill_{started_at:%Y%m%d%H%M%S}"
+    manifest = read_manifest(name)
+
+    report = {"started_at": started_at.isoformat(), "passed": False}
+    try:
+        report.update(restore_backup(name, database, jobs, progress=progress))
+        counts = _row_counts(database, list(manifest["tables"]))
+        mismatches = {}
+        for table, entry in manifest["tables"].items():
+            expected, actual = entry["rows"], counts[table]
+            if actual < expected or (actual != expected and manifest["type"] == "full"):
+                mismatches[table] = {"expected": expected, "restored": actual}
+        report["row_count_mismatches"] = mismatches
+        report["passed"] = not mismatches
+    except Exception as e:
+        report["error"] = str(e)
+    finally:
+        if not keep:
+            drop_database(database)
+
+    log = Path(settings.BACKUP_DIR) / DRILL_LOG
+    with open(log, "a") as f:
+        f.write(json.dumps(report, default=str) + "\n")
+    return report
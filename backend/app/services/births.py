@@ -0,0 +1,302 @@
+from typing import Dict, List, Optional
+from datetime import date, timedelta
+from sqlalchemy import case, extract, func, insert, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.archive import SheepArchive
+from app.db.models.birth_record import BirthRecord, BirthType
+from app.db.models.lamb import Lamb
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import Sheep, SheepSection, SheepSex, SheepStatus
+from app.db.tenancy import ALL_FARMS, require_farm_id
+from app.schemas.birth import (
+    BirthRecordResponse,
+    BulkBirthCreate,
+    LambResponse,
+    LambStatsGroup,
+    LambStatsResponse
+)
+from app.services.changes import ChangeEntity, record_changes
+from app.services.lambing import MIN_GESTATION_DAYS
+from app.services.sections import open_section_intervals
+from app.services.sheep import allocate_tag_ids, lock_tag_allocation
+
+# Bulk inserts pass NULLs explicitly, so rows leaving different fields empty
+# still go in one multi-row statement
+ALL_ROWS = {"render_nulls": True}
+
+BIRTH_TYPES = {
+    1: BirthType.SINGLE,
+    2: BirthType.TWIN,
+    3: BirthType.TRIPLET,
+    4: BirthType.QUADRUPLET
+}
+
+
+def get_lambs(db: Session, birth_record_id: int) -> List[Lamb]:
+    """Get the lambs of a birth record in birth order."""
+    return db.query(Lamb).filter(
+        Lamb.birth_record_id == birth_record_id
+    ).order_by(Lamb.birth_order).all()
+
+
+def get_lamb_stats(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: Optional[LambStatsGroup] = None
+) -> List[LambStatsResponse]:
+    """Per-lamb aggregates (counts, sex ratio, losses, birth weight) computed in the database."""
+    if start_date and end_date and end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+
+    group_columns = []
+    if group_by == LambStatsGroup.SIRE:
+        group_columns = [BirthRecord.sire_id]
+    elif group_by == LambStatsGroup.EWE:
+        group_columns = [BirthRecord.ewe_id]
+    elif group_by == LambStatsGroup.MONTH:
+        # extract() compiles on every backend, unlike to_char
+        group_columns = [extract("year", BirthRecord.date_lambed), extract("month", BirthRecord.date_lambed)]
+    elif group_by == LambStatsGroup.BIRTH_TYPE:
+        group_columns = [BirthRecord.birth_type]
+
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    columns = group_columns + [
+        func.count(Lamb.id),
+        count_where(Lamb.sex == SheepSex.MALE),
+        count_where(Lamb.sex == SheepSex.FEMALE),
+        count_where(Lamb.born_alive.is_(False)),
+        count_where(Lamb.born_alive.is_(True) & Lamb.death_date.isnot(None)),
+        func.avg(Lamb.birth_weight)
+    ]
+
+    query = db.query(*columns).join(BirthRecord, BirthRecord.id == Lamb.birth_record_id)
+    if start_date:
+        query = query.filter(BirthRecord.date_lambed >= start_date)
+    if end_date:
+        query = query.filter(BirthRecord.date_lambed <= end_date)
+    if group_columns:
+        query = query.group_by(*group_columns).order_by(*group_columns)
+
+    stats = []
+    for row in query.all():
+        group = None
+        if group_by == LambStatsGroup.MONTH:
+            (year, month), row = row[:2], row[2:]
+            group = f"{int(year):04d}-{int(month):02d}"
+        elif group_columns:
+            group, row = row[0], row[1:]
+            group = group.value if hasattr(group, "value") else group
+        lambs, males, females, stillborn, deaths, mean_weight = row
+        sexed = males + females
+        stats.append(LambStatsResponse(
+            group=group,
+            lambs=lambs,
+            males=males,
+            females=females,
+            male_ratio=round(males / sexed, 4) if sexed else None,
+            stillborn=stillborn,
+            deaths=deaths,
+            mean_birth_weight=round(float(mean_weight), 3) if mean_weight is not None else None
+        ))
+    return stats
+
+
+def _open_pairs_by_ewe(db: Session, ewe_ids: List[str]) -> Dict[str, MatingPair]:
+    """The latest mating pair of each ewe that has not lambed or failed yet."""
+    pairs = db.query(MatingPair).filter(
+        MatingPair.ewe_id.in_(ewe_ids),
+        MatingPair.actual_lambing_date.is_(None),
+        or_(MatingPair.pregnancy_failed.is_(None), MatingPair.pregnancy_failed.is_(False))
+    ).order_by(MatingPair.mating_start_date).all()
+    return {pair.ewe_id: pair for pair in pairs}
+
+
+def _check_lamb_tags(db: Session, births_in: BulkBirthCreate) -> List[str]:
+    """Validate the tags already put on lambs and return them."""
+    tags = []
+    for birth in births_in.births:
+        for lamb in birth.lambs:
+            if lamb.born_alive and lamb.sex is None:
+                raise ValueError(f"Lamb of ewe {birth.ewe_id} needs a sex to be registered")
+            if lamb.tag_id and not lamb.born_alive:
+                raise ValueError(f"Stillborn lamb of ewe {birth.ewe_id} cannot be tagged")
+            if lamb.tag_id:
+                tags.append(lamb.tag_id)
+    if len(set(tags)) != len(tags):
+        raise ValueError("Each lamb tag may only be used once")
+
+    if not tags:
+        return tags
+
+    # Tags are unique across all farms and the archive
+    taken = db.query(Sheep.tag_id).filter(Sheep.tag_id.in_(tags)).union_all(
+        db.query(SheepArchive.tag_id).filter(SheepArchive.tag_id.in_(tags))
+    ).execution_options(**ALL_FARMS).first()
+    if taken:
+        raise ValueError(f"Sheep with tag ID {taken[0]} already exists")
+    return tags
+
+
+def record_births(db: Session, births_in: BulkBirthCreate) -> List[BirthRecordResponse]:
+    """Record a batch of births and register their live lambs as sheep in one transaction.
+
+    Parents, tags and mating pairs are validated with one query each for
+    the whole batch, and every table is written with a single multi-row
+    INSERT, so the cost stays flat however many births a busy lambing day
+    brings. Lambs without a tag get the next free tags of ``color_code``;
+    the sire defaults to the ram of the ewe's open mating pair, which is
+    marked as lambed.
+    """
+    births = births_in.births
+    ewe_ids = [birth.ewe_id for birth in births]
+    if len(set(ewe_ids)) != len(ewe_ids):
+        raise ValueError("Each ewe may only lamb once per request")
+
+    pairs = _open_pairs_by_ewe(db, ewe_ids)
+    sire_ids = {
+        birth.ewe_id: birth.sire_id or (pairs[birth.ewe_id].ram_id if birth.ewe_id in pairs else None)
+        for birth in births
+    }
+    parents = {
+        tag_id: (sex, breed, status)
+        for tag_id, sex, breed, status in db.query(Sheep.tag_id, Sheep.sex, Sheep.breed, Sheep.status).filter(
+            Sheep.tag_id.in_(set(ewe_ids) | {sire_id for sire_id in sire_ids.values() if sire_id})
+        )
+    }
+    for ewe_id in ewe_ids:
+        if ewe_id not in parents:
+            raise ValueError(f"Ewe with tag ID {ewe_id} not found")
+        if parents[ewe_id][0] != SheepSex.FEMALE:
+            raise ValueError(f"Sheep with tag ID {ewe_id} is not a female")
+        if parents[ewe_id][2] != SheepStatus.ACTIVE:
+            raise ValueError(f"Ewe with tag ID {ewe_id} is {parents[ewe_id][2].value}")
+        sire_id = sire_ids[ewe_id]
+        if sire_id and sire_id not in parents:
+            raise ValueError(f"Sire with tag ID {sire_id} not found")
+        if sire_id and parents[sire_id][0] != SheepSex.MALE:
+            raise ValueError(f"Sheep with tag ID {sire_id} is not a male")
+
+    # A ewe can't lamb twice within one gestation; catches double-submitted births.
+    # The lock makes a concurrent resubmission wait for this one to commit and
+    # then see its birth records
+    lock_tag_allocation(db)
+    earliest = min(birth.date_lambed for birth in births) - timedelta(days=MIN_GESTATION_DAYS)
+    lambed_on: Dict[str, List[date]] = {}
+    for ewe_id, date_lambed in db.query(BirthRecord.ewe_id, BirthRecord.date_lambed).filter(
+        BirthRecord.ewe_id.in_(ewe_ids), BirthRecord.date_lambed > earliest
+    ):
+        lambed_on.setdefault(ewe_id, []).append(date_lambed)
+    for birth in births:
+        for previous in lambed_on.get(birth.ewe_id, []):
+            if abs((birth.date_lambed - previous).days) < MIN_GESTATION_DAYS:
+                raise ValueError(f"Ewe with tag ID {birth.ewe_id} already lambed on {previous}")
+
+    given_tags = _check_lamb_tags(db, births_in)
+    untagged = sum(1 for birth in births for lamb in birth.lambs if lamb.born_alive and not lamb.tag_id)
+    new_tags = []
+    if untagged:
+        if not births_in.color_code:
+            raise ValueError("A color code is needed to allocate tags for untagged lambs")
+        # Skip numbers the batch already uses on pre-tagged lambs
+        given = set(given_tags)
+        new_tags = [
+            tag_id for tag_id in allocate_tag_ids(db, births_in.color_code, untagged + len(given))
+            if tag_id not in given
+        ][:untagged]
+    new_tags.reverse()
+
+    farm_id = require_farm_id(db)
+    birth_rows = []
+    for birth in births:
+        any_alive = any(lamb.born_alive for lamb in birth.lambs)
+        birth_rows.append({
+            "farm_id": farm_id,
+            "ewe_id": birth.ewe_id,
+            "sire_id": sire_ids[birth.ewe_id],
+            "date_lambed": birth.date_lambed,
+            "birth_type": BIRTH_TYPES[len(birth.lambs)],
+            "rearing_type": birth.rearing_type,
+            "dystocia": birth.dystocia,
+            "comments": birth.comments,
+            "expected_wean_date": (
+                birth.date_lambed + timedelta(days=settings.WEANING_AGE_DAYS) if any_alive else None
+            )
+        })
+    # Each ewe lambs once per request, so records are matched back by ewe
+    record_by_ewe = {
+        record.ewe_id: record
+        for record in db.scalars(insert(BirthRecord).returning(BirthRecord), birth_rows, execution_options=ALL_ROWS)
+    }
+
+    sheep_rows = []
+    lamb_rows = []
+    registered_on: Dict[date, List[str]] = {}
+    for birth in births:
+        record = record_by_ewe[birth.ewe_id]
+        for order, lamb in enumerate(birth.lambs, start=1):
+            tag_id = None
+            if lamb.born_alive:
+                tag_id = lamb.tag_id or new_tags.pop()
+                sheep_rows.append({
+                    "farm_id": farm_id,
+                    "tag_id": tag_id,
+                    "breed": births_in.breed or parents[birth.ewe_id][1],
+                    "sex": lamb.sex,
+                    "date_of_birth": birth.date_lambed,
+                    "sire_id": record.sire_id,
+                    "dam_id": birth.ewe_id
+                })
+                registered_on.setdefault(birth.date_lambed, []).append(tag_id)
+            lamb_rows.append({
+                "farm_id": farm_id,
+                "birth_record_id": record.id,
+                "birth_order": order,
+                "tag_id": tag_id,
+                "sex": lamb.sex,
+                "birth_weight": lamb.birth_weight,
+                "born_alive": lamb.born_alive,
+                "death_date": None if lamb.born_alive else birth.date_lambed,
+                "death_reason": lamb.death_reason
+            })
+
+    # Sheep first: lambs reference their tags
+    if sheep_rows:
+        db.execute(insert(Sheep), sheep_rows, execution_options=ALL_ROWS)
+        # Lambs have been in the general section since birth
+        for date_lambed, tag_ids in registered_on.items():
+            open_section_intervals(db, tag_ids, SheepSection.GENERAL, date_lambed)
+        record_changes(db, ChangeEntity.SHEEP, [row["tag_id"] for row in sheep_rows])
+    lambs = db.scalars(insert(Lamb).returning(Lamb), lamb_rows, execution_options=ALL_ROWS).all()
+
+    lambed = [
+        {"id": pairs[birth.ewe_id].id, "actual_lambing_date": birth.date_lambed}
+        for birth in births if birth.ewe_id in pairs
+    ]
+    if lambed:
+        db.bulk_update_mappings(MatingPair, lambed)
+
+    # Serialized before commit, which would expire every row and reload each one
+    lambs_by_record: Dict[int, List[LambResponse]] = {}
+    for lamb in sorted(lambs, key=lambda lamb: lamb.birth_order):
+        lambs_by_record.setdefault(lamb.birth_record_id, []).append(LambResponse.model_validate(lamb))
+    recorded = [
+        BirthRecordResponse(
+            id=record.id,
+            ewe_id=record.ewe_id,
+            sire_id=record.sire_id,
+            date_lambed=record.date_lambed,
+            birth_type=record.birth_type,
+            rearing_type=record.rearing_type,
+            dystocia=record.dystocia,
+            expected_wean_date=record.expected_wean_date,
+            comments=record.comments,
+            lambs=lambs_by_record.get(record.id, [])
+        )
+        for record in (record_by_ewe[birth.ewe_id] for birth in births)
+    ]
+    db.commit()
+    return recorded
@@ -0,0 +1,56 @@
+from typing import Iterable
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from app.db.models.change_log import ChangeLogEntry, ChangeOperation
+from app.db.tenancy import require_farm_id
+
+# Arbitrary application-wide key for the Postgres advisory lock that keeps
+# change log ids in commit order
+CHANGE_LOG_LOCK_KEY = 7291001
+
+
+class ChangeEntity:
+    SHEEP = "sheep"
+    HEALTH_EVENT = "health_event"
+
+
+def record_changes(db: Session, entity: str, entity_ids: Iterable, operation: str = ChangeOperation.UPSERT) -> None:
+    """Append change log entries in the caller's transaction.
+
+    On Postgres a transaction-scoped advisory lock serializes writers from
+    here until commit, so ids are handed out in commit order and a client
+    holding cursor N can never miss a change committed later with id < N.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    farm_id = require_farm_id(db)
+    rows = [
+        {
+            "farm_id": farm_id,
+            "entity": entity,
+            "entity_id": str(entity_id),
+            "operation": operation,
+            "changed_at": datetime.utcnow()
+        }
+        for entity_id in entity_ids
+    ]
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": CHANGE_LOG_LOCK_KEY})
+    db.execute(insert(ChangeLogEntry), rows)
+
+
+def record_change(db: Session, entity: str, entity_id, operation: str = ChangeOperation.UPSERT) -> None:
+    """Append a single change log entry in the caller's transaction."""
+    record_changes(db, entity, [entity_id], operation)
+
+
+def prune_change_log(db: Session, retention_days: int) -> int:
+    """Delete change log entries older than the retention window."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = db.query(ChangeLogEntry).filter(
+        ChangeLogEntry.changed_at < cutoff
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
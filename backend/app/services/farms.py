@@ -0,0 +1,49 @@
+from typing import List
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.farm import Farm
+from app.db.session import FarmRoute, farm_session, invalidate_farm_routes
+from app.db.tenancy import validate_schema_name
+from app.schemas.farm import FarmCreate
+
+
+def list_farms(db: Session) -> List[Farm]:
+    """List every farm."""
+    return db.query(Farm).order_by(Farm.code).all()
+
+
+def create_farm(db: Session, farm_in: FarmCreate) -> Farm:
+    """Register a farm in the primary database.
+
+    A farm with a database or schema of its own also gets its row copied
+    there, so the farm_id foreign keys of its tables resolve. The database
+    or schema must already be migrated (see alembic/env.py).
+    """
+    if db.query(Farm.id).filter(Farm.code == farm_in.code).first():
+        raise ValueError(f"Farm {farm_in.code} already exists")
+    if farm_in.database and farm_in.database not in settings.FARM_DATABASES:
+        raise ValueError(f"Farm database {farm_in.database} is not configured in FARM_DATABASES")
+    if farm_in.schema_name:
+        validate_schema_name(farm_in.schema_name)
+
+    farm = Farm(**farm_in.model_dump())
+    db.add(farm)
+    db.commit()
+    db.refresh(farm)
+
+    if farm.database or farm.schema_name:
+        farm_db = farm_session(FarmRoute(farm.id, farm.code, farm.database, farm.schema_name))
+        try:
+            farm_db.merge(Farm(
+                id=farm.id,
+                code=farm.code,
+                name=farm.name,
+                database=farm.database,
+                schema_name=farm.schema_name
+            ))
+            farm_db.commit()
+        finally:
+            farm_db.close()
+
+    invalidate_farm_routes()
+    return farm
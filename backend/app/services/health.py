@@ -2,8 +2,12 @@ from typing import List, Optional
 from datetime import date, datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from app.db.models.health_event import HealthEvent, EventType
+from app.db.models.health_event import HealthEvent
+from app.db.models.archive import HealthEventArchive
+from app.db.models.attachment import Attachment
+from app.db.models.change_log import ChangeOperation
 from app.schemas.health import HealthEventCreate, HealthEventUpdate, HealthEventFilter
+from app.services.changes import ChangeEntity, record_change
 
 
 def create_health_event(db: Session, event_in: HealthEventCreate) -> HealthEvent:
@@ -13,10 +17,11 @@ def create_health_event(db: Session, event_in: HealthEventCreate) -> HealthEvent
         event_date=event_in.event_date,
         event_type=event_in.event_type,
         details=event_in.details,
-        next_due_date=event_in.next_due_date,
-        attachments=event_in.attachments
+        next_due_date=event_in.next_due_date
     )
     db.add(db_event)
+    db.flush()
+    record_change(db, ChangeEntity.HEALTH_EVENT, db_event.id)
     db.commit()
     db.refresh(db_event)
     return db_event
@@ -41,6 +46,7 @@ def update_health_event(
     for field, value in update_data.items():
         setattr(db_event, field, value)
     
+    record_change(db, ChangeEntity.HEALTH_EVENT, event_id)
     db.commit()
     db.refresh(db_event)
     return db_event
@@ -51,39 +57,51 @@ def delete_health_event(db: Session, event_id: int) -> bool:
     db_event = get_health_event(db=db, event_id=event_id)
     if not db_event:
         return False
+    # No foreign key guards this since health_events is partitioned
+    if db.query(Attachment.id).filter(Attachment.health_event_id == event_id).first():
+        raise ValueError("Cannot delete health event that has attachments")
     
     db.delete(db_event)
+    record_change(db, ChangeEntity.HEALTH_EVENT, event_id, ChangeOperation.DELETE)
     db.commit()
     return True
 
 
-def list_health_events(
-    db: Session,
-    filters: HealthEventFilter
-) -> List[HealthEvent]:
-    """List health events with optional filtering."""
-    query = db.query(HealthEvent)
+def _filter_events(db: Session, model, filters: HealthEventFilter):
+    query = db.query(model)
     
     if filters.sheep_id:
-        query = query.filter(HealthEvent.sheep_id == filters.sheep_id)
+        query = query.filter(model.sheep_id == filters.sheep_id)
     
     if filters.event_type:
-        query = query.filter(HealthEvent.event_type == filters.event_type)
+        query = query.filter(model.event_type == filters.event_type)
     
     if filters.start_date:
-        query = query.filter(HealthEvent.event_date >= filters.start_date)
+        query = query.filter(model.event_date >= filters.start_date)
     
     if filters.end_date:
-        query = query.filter(HealthEvent.event_date <= filters.end_date)
+        query = query.filter(model.event_date <= filters.end_date)
     
     if filters.overdue:
         today = datetime.now().date()
         query = query.filter(
-            HealthEvent.next_due_date.isnot(None),
-            HealthEvent.next_due_date < today
+            model.next_due_date.isnot(None),
+            model.next_due_date < today
         )
     
-    return query.order_by(HealthEvent.event_date.desc()).all()
+    return query.order_by(model.event_date.desc())
+
+
+def list_health_events(
+    db: Session,
+    filters: HealthEventFilter
+) -> List[HealthEvent]:
+    """List health events with optional filtering; archived events only when asked."""
+    events = _filter_events(db, HealthEvent, filters).all()
+    if filters.include_archived:
+        events.extend(_filter_events(db, HealthEventArchive, filters).all())
+        events.sort(key=lambda event: event.event_date, reverse=True)
+    return events
 
 
 def get_overdue_events(db: Session) -> List[HealthEvent]:
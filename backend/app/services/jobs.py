@@ -0,0 +1,48 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.core.jobs import abandon_job, job_runner
+from app.db.models.job import Job, JobStatus
+
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    """Get a job by ID."""
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def list_jobs(
+    db: Session,
+    kind: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[Job]:
+    """List jobs, newest first."""
+    query = db.query(Job)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    if status:
+        query = query.filter(Job.status == status)
+    return query.order_by(Job.id.desc()).offset(skip).limit(limit).all()
+
+
+def cancel_job(db: Session, job_id: int) -> Optional[Job]:
+    """Request cancellation of a job.
+
+    A job still waiting in this process's queue is dropped at once. Otherwise
+    the flag is stored: a queued job is skipped when a worker picks it up and
+    a running job stops at its next progress report.
+    """
+    job = db.query(Job).filter(Job.id == job_id).with_for_update().first()
+    if not job:
+        return None
+    if job.status in FINISHED_STATUSES:
+        raise ValueError(f"Job {job_id} already {job.status.value}")
+
+    job.cancel_requested = True
+    if job.status == JobStatus.QUEUED and job_runner.cancel_queued(job_id, job.farm_id):
+        abandon_job(db, job, JobStatus.CANCELLED)
+    db.commit()
+    db.refresh(job)
+    return job
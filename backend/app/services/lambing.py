@@ -0,0 +1,206 @@
+import math
+from typing import Dict, List, Optional, Set
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.jobs import JobContext
+from app.db.models.birth_record import BirthRecord
+from app.db.models.lambing_forecast import GestationStat, LambingCalendarDay
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import Sheep, SheepSection
+from app.db.tenancy import require_farm_id
+from app.schemas.lambing import LambingCalendarDayResponse
+
+# Gestation lengths outside this range are treated as data-entry errors
+MIN_GESTATION_DAYS = 130
+MAX_GESTATION_DAYS = 165
+
+# Pseudo-observations at the default gestation used to shrink breeds with few records
+PRIOR_WEIGHT = 5
+
+# Lambing window half-width in standard deviations
+WINDOW_STDS = 2
+
+
+def _pending_pair_filter():
+    """Mating pairs that may still lamb."""
+    return [
+        MatingPair.actual_lambing_date.is_(None),
+        or_(MatingPair.pregnancy_failed.is_(None), MatingPair.pregnancy_failed.is_(False))
+    ]
+
+
+def update_gestation_stats(db: Session) -> List[GestationStat]:
+    """Learn breed-specific gestation length from recorded lambings.
+
+    A lambing counts towards the ewe's breed when it falls within a plausible
+    gestation of one of her mating start dates. Breeds with few records are
+    shrunk towards the configured default.
+    """
+    rows = db.query(Sheep.breed, MatingPair.mating_start_date, BirthRecord.date_lambed).join(
+        Sheep, Sheep.tag_id == MatingPair.ewe_id
+    ).join(
+        BirthRecord, BirthRecord.ewe_id == MatingPair.ewe_id
+    ).filter(
+        BirthRecord.date_lambed >= MatingPair.mating_start_date
+    ).all()
+
+    lengths: Dict[str, List[int]] = {}
+    for breed, mating_start_date, date_lambed in rows:
+        days = (date_lambed - mating_start_date).days
+        if MIN_GESTATION_DAYS <= days <= MAX_GESTATION_DAYS:
+            lengths.setdefault(breed, []).append(days)
+
+    existing = {stat.breed: stat for stat in db.query(GestationStat).all()}
+    prior_mean = settings.DEFAULT_GESTATION_DAYS
+    prior_var = settings.DEFAULT_GESTATION_STD_DAYS ** 2
+    for breed, values in lengths.items():
+        n = len(values)
+        mean = (sum(values) + PRIOR_WEIGHT * prior_mean) / (n + PRIOR_WEIGHT)
+        squares = sum((v - mean) ** 2 for v in values)
+        std = math.sqrt((squares + PRIOR_WEIGHT * prior_var) / (n + PRIOR_WEIGHT))
+
+        stat = existing.get(breed)
+        if not stat:
+            stat = GestationStat(breed=breed)
+            db.add(stat)
+            existing[breed] = stat
+        stat.mean_days = mean
+        stat.std_days = std
+        stat.sample_size = n
+
+    db.commit()
+    return list(existing.values())
+
+
+def _forecast(mating_start_date: date, stat: Optional[GestationStat]) -> tuple:
+    """Expected lambing date and window for a mating start date."""
+    mean = stat.mean_days if stat else settings.DEFAULT_GESTATION_DAYS
+    std = stat.std_days if stat else settings.DEFAULT_GESTATION_STD_DAYS
+    return (
+        mating_start_date + timedelta(days=round(mean)),
+        mating_start_date + timedelta(days=math.floor(mean - WINDOW_STDS * std)),
+        mating_start_date + timedelta(days=math.ceil(mean + WINDOW_STDS * std))
+    )
+
+
+def refresh_lambing_forecasts(db: Session, full: bool = False) -> int:
+    """Fill expected lambing dates and rebuild the affected lambing calendar days.
+
+    An incremental refresh only looks at pairs without a forecast and at pairs
+    or ewes changed since the previous refresh, then re-aggregates just the
+    calendar days those pairs moved from or to. Returns the number of pairs
+    whose forecast changed.
+    """
+    started = datetime.utcnow()
+    last_refresh = None
+    if not full:
+        last_refresh = db.query(func.max(LambingCalendarDay.refreshed_at)).scalar()
+
+    stats = {stat.breed: stat for stat in db.query(GestationStat).all()}
+    query = db.query(
+        MatingPair.id,
+        MatingPair.mating_start_date,
+        MatingPair.expected_lambing_date,
+        MatingPair.lambing_window_start,
+        MatingPair.lambing_window_end,
+        Sheep.breed
+    ).join(Sheep, Sheep.tag_id == MatingPair.ewe_id)
+    if last_refresh:
+        query = query.filter(or_(
+            MatingPair.expected_lambing_date.is_(None),
+            MatingPair.updated_at >= last_refresh.date(),
+            Sheep.updated_at >= last_refresh
+        ))
+
+    updates = []
+    affected: Set[date] = set()
+    for pair_id, start, expected, window_start, window_end, breed in query.all():
+        forecast = _forecast(start, stats.get(breed))
+        if expected:
+            affected.add(expected)
+        affected.add(forecast[0])
+        if forecast != (expected, window_start, window_end):
+            updates.append({
+                "id": pair_id,
+                "expected_lambing_date": forecast[0],
+                "lambing_window_start": forecast[1],
+                "lambing_window_end": forecast[2]
+            })
+    if updates:
+        db.bulk_update_mappings(MatingPair, updates)
+
+    calendar = db.query(LambingCalendarDay)
+    counts = db.query(
+        MatingPair.expected_lambing_date,
+        Sheep.current_section,
+        func.count(MatingPair.id)
+    ).join(Sheep, Sheep.tag_id == MatingPair.ewe_id).filter(
+        *_pending_pair_filter(),
+        MatingPair.expected_lambing_date.isnot(None)
+    )
+    if last_refresh:
+        calendar = calendar.filter(LambingCalendarDay.lambing_date.in_(affected))
+        counts = counts.filter(MatingPair.expected_lambing_date.in_(affected))
+
+    if full or affected:
+        calendar.delete(synchronize_session=False)
+        farm_id = require_farm_id(db)
+        db.bulk_insert_mappings(LambingCalendarDay, [
+            {
+                "farm_id": farm_id,
+                "lambing_date": lambing_date,
+                "section": section,
+                "expected_lambings": count,
+                "refreshed_at": started
+            }
+            for lambing_date, section, count in counts.group_by(
+                MatingPair.expected_lambing_date, Sheep.current_section
+            ).all()
+        ])
+    db.commit()
+    return len(updates)
+
+
+def rebuild_forecasts_job(ctx: JobContext) -> dict:
+    """Job handler: relearn gestation statistics and rebuild every forecast."""
+    db = ctx.open_session()
+    try:
+        ctx.progress(0.1, "Updating gestation statistics", force=True)
+        update_gestation_stats(db)
+        ctx.progress(0.4, "Rebuilding forecasts", force=True)
+        return {"updated": refresh_lambing_forecasts(db, full=True)}
+    finally:
+        db.close()
+
+
+def get_gestation_stats(db: Session) -> List[GestationStat]:
+    """Get the learned gestation statistics for every breed."""
+    return db.query(GestationStat).order_by(GestationStat.breed).all()
+
+
+def get_lambing_calendar(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    section: Optional[SheepSection] = None
+) -> List[LambingCalendarDayResponse]:
+    """Get precomputed expected lambings per day, broken down by section."""
+    query = db.query(LambingCalendarDay)
+    if start_date:
+        query = query.filter(LambingCalendarDay.lambing_date >= start_date)
+    if end_date:
+        query = query.filter(LambingCalendarDay.lambing_date <= end_date)
+    if section:
+        query = query.filter(LambingCalendarDay.section == section)
+
+    days: Dict[date, LambingCalendarDayResponse] = {}
+    for row in query.order_by(LambingCalendarDay.lambing_date).all():
+        day = days.setdefault(
+            row.lambing_date,
+            LambingCalendarDayResponse(lambing_date=row.lambing_date, total=0, sections={})
+        )
+        day.sections[row.section] = row.expected_lambings
+        day.total += row.expected_lambings
+    return list(days.values())
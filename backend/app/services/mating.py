@@ -0,0 +1,293 @@
+from typing import List, Optional
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Session
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import Sheep, SheepSex, SheepStatus, SheepSection
+from app.db.tenancy import require_farm_id
+from app.schemas.mating import (
+    MatingOptimizationRequest,
+    MatingOptimizationResponse,
+    MatingAssignment,
+    MatingPairCreate,
+    MatingGroupCreate,
+    MatingPairUpdate,
+    MatingPairResponse,
+    MatingPairFilter,
+    MatingPairsCreated
+)
+from app.schemas.notification import NotificationResponse
+from app.services.notifications import inbreeding_alerts
+from app.services.pedigree import load_pedigree, pair_relationships, relationship_matrix
+from app.services.pedigree_index import cached_pedigree
+
+# Cost of leaving a ewe unassigned; larger than any attainable relationship
+# coefficient so the optimizer always fills capacity before minimizing kinship.
+UNASSIGNED_PENALTY = 10.0
+
+
+def get_open_ewe_ids(db: Session) -> List[str]:
+    """Get tag IDs of active ewes in the mating section without a confirmed pregnancy."""
+    pregnant = db.query(MatingPair.ewe_id).filter(
+        MatingPair.pregnancy_confirmed.is_(True),
+        MatingPair.actual_lambing_date.is_(None)
+    )
+    rows = db.query(Sheep.tag_id).filter(
+        Sheep.sex == SheepSex.FEMALE,
+        Sheep.status == SheepStatus.ACTIVE,
+        Sheep.current_section == SheepSection.MATING,
+        ~Sheep.tag_id.in_(pregnant)
+    ).order_by(Sheep.tag_id).all()
+    return [tag_id for (tag_id,) in rows]
+
+
+def _validate_rams(db: Session, request: MatingOptimizationRequest) -> None:
+    ram_ids = [ram.ram_id for ram in request.rams]
+    if len(set(ram_ids)) != len(ram_ids):
+        raise ValueError("Each ram may only be listed once")
+
+    found = {
+        tag_id: (sex, status)
+        for tag_id, sex, status in db.query(Sheep.tag_id, Sheep.sex, Sheep.status).filter(
+            Sheep.tag_id.in_(ram_ids)
+        )
+    }
+    for ram_id in ram_ids:
+        if ram_id not in found:
+            raise ValueError(f"Ram with tag ID {ram_id} not found")
+        sex, status = found[ram_id]
+        if sex != SheepSex.MALE:
+            raise ValueError(f"Sheep with tag ID {ram_id} is not a male")
+        if status != SheepStatus.ACTIVE:
+            raise ValueError(f"Ram with tag ID {ram_id} is not active")
+
+
+def optimize_mating_assignments(
+    db: Session,
+    request: MatingOptimizationRequest
+) -> MatingOptimizationResponse:
+    """Assign ewes to rams so the total relationship coefficient is minimal.
+
+    The assignment is a transportation problem (a min-cost flow from ewes to
+    capacitated rams). Its constraint matrix is totally unimodular, so the
+    simplex vertex returned by HiGHS is already integral.
+    """
+    _validate_rams(db, request)
+    ewe_ids = request.ewe_ids if request.ewe_ids is not None else get_open_ewe_ids(db)
+    ewe_ids = list(dict.fromkeys(ewe_ids))
+    if not ewe_ids:
+        return MatingOptimizationResponse(assignments=[], unassigned_ewe_ids=[], total_relationship=0.0)
+
+    ram_ids = [ram.ram_id for ram in request.rams]
+    capacities = np.array([min(ram.capacity, len(ewe_ids)) for ram in request.rams], dtype=float)
+    cost = relationship_matrix(load_pedigree(db), ewe_ids, ram_ids)
+
+    n_ewes, n_rams = cost.shape
+    n_pairs = n_ewes * n_rams
+    objective = np.concatenate([cost.ravel(), np.full(n_ewes, UNASSIGNED_PENALTY)])
+
+    # Each ewe is either paired with exactly one ram or left unassigned
+    eq_rows = np.concatenate([np.repeat(np.arange(n_ewes), n_rams), np.arange(n_ewes)])
+    a_eq = sparse.csr_matrix(
+        (np.ones(n_pairs + n_ewes), (eq_rows, np.arange(n_pairs + n_ewes))),
+        shape=(n_ewes, n_pairs + n_ewes)
+    )
+    # Each ram serves at most its capacity
+    a_ub = sparse.csr_matrix(
+        (np.ones(n_pairs), (np.tile(np.arange(n_rams), n_ewes), np.arange(n_pairs))),
+        shape=(n_rams, n_pairs + n_ewes)
+    )
+
+    upper = np.ones(n_pairs + n_ewes)
+    if request.max_relationship is not None:
+        upper[:n_pairs][cost.ravel() > request.max_relationship] = 0.0
+
+    result = linprog(
+        objective,
+        A_ub=a_ub,
+        b_ub=capacities,
+        A_eq=a_eq,
+        b_eq=np.ones(n_ewes),
+        bounds=np.column_stack([np.zeros_like(upper), upper]),
+        method="highs-ds"
+    )
+    if result.status != 0:
+        raise ValueError(f"Mating optimization failed: {result.message}")
+
+    chosen = result.x[:n_pairs].reshape(n_ewes, n_rams)
+    assigned = chosen.max(axis=1) > 0.5
+    ram_index = chosen.argmax(axis=1)
+
+    assignments = []
+    unassigned = []
+    for i, ewe_id in enumerate(ewe_ids):
+        if not assigned[i]:
+            unassigned.append(ewe_id)
+            continue
+        ram = request.rams[ram_index[i]]
+        relationship = float(cost[i, ram_index[i]])
+        assignments.append(MatingAssignment(
+            ram_id=ram.ram_id,
+            ewe_id=ewe_id,
+            group_slot=ram.group_slot,
+            relationship=relationship,
+            expected_inbreeding=relationship / 2
+        ))
+
+    return MatingOptimizationResponse(
+        assignments=assignments,
+        unassigned_ewe_ids=unassigned,
+        total_relationship=float(sum(a.relationship for a in assignments))
+    )
+
+
+def _open_pair_filter():
+    """Mating pairs that may still lamb."""
+    return [
+        MatingPair.actual_lambing_date.is_(None),
+        or_(MatingPair.pregnancy_failed.is_(None), MatingPair.pregnancy_failed.is_(False))
+    ]
+
+
+def _validate_pairs(db: Session, pairs_in: List[MatingPairCreate]) -> None:
+    """Check every ram and ewe of a write in one query each, whatever the number of pairs."""
+    ram_ids = {pair.ram_id for pair in pairs_in}
+    ewe_ids = [pair.ewe_id for pair in pairs_in]
+    if len(set(ewe_ids)) != len(ewe_ids):
+        raise ValueError("Each ewe may only be paired once")
+
+    found = {
+        tag_id: (sex, status)
+        for tag_id, sex, status in db.query(Sheep.tag_id, Sheep.sex, Sheep.status).filter(
+            Sheep.tag_id.in_(ram_ids | set(ewe_ids))
+        )
+    }
+    for ram_id in sorted(ram_ids):
+        if ram_id not in found:
+            raise ValueError(f"Ram with tag ID {ram_id} not found")
+        sex, status = found[ram_id]
+        if sex != SheepSex.MALE:
+            raise ValueError(f"Sheep with tag ID {ram_id} is not a male")
+        if status != SheepStatus.ACTIVE:
+            raise ValueError(f"Ram with tag ID {ram_id} is not active")
+    for ewe_id in ewe_ids:
+        if ewe_id not in found:
+            raise ValueError(f"Ewe with tag ID {ewe_id} not found")
+        sex, status = found[ewe_id]
+        if sex != SheepSex.FEMALE:
+            raise ValueError(f"Sheep with tag ID {ewe_id} is not a female")
+        if status != SheepStatus.ACTIVE:
+            raise ValueError(f"Ewe with tag ID {ewe_id} is not active")
+
+    already_paired = db.query(MatingPair.ewe_id).filter(
+        MatingPair.ewe_id.in_(ewe_ids), *_open_pair_filter()
+    ).first()
+    if already_paired:
+        raise ValueError(f"Ewe with tag ID {already_paired[0]} already has an open mating pair")
+
+
+def create_mating_pairs(db: Session, pairs_in: List[MatingPairCreate]) -> MatingPairsCreated:
+    """Create mating pairs and raise an inbreeding alert for each closely related pair.
+
+    The ancestry comes from the per-farm pedigree cache, and all pairs are
+    checked from one ancestor closure, so a write costs the same handful of
+    queries whether it holds one pair or a whole group.
+    """
+    if not pairs_in:
+        raise ValueError("No mating pairs given")
+    _validate_pairs(db, pairs_in)
+
+    farm_id = require_farm_id(db)
+    rows = [
+        {
+            "farm_id": farm_id,
+            "ram_id": pair_in.ram_id,
+            "ewe_id": pair_in.ewe_id,
+            "mating_start_date": pair_in.mating_start_date,
+            "group_slot": pair_in.group_slot,
+            "override_user": pair_in.override_user,
+            "override_reason": pair_in.override_reason
+        }
+        for pair_in in pairs_in
+    ]
+    # One multi-row INSERT ... RETURNING; rows added with db.add would be flushed
+    # one by one, and without render_nulls rows with different None fields
+    # would be split into separate statements
+    pairs = db.scalars(
+        insert(MatingPair).returning(MatingPair), rows, execution_options={"render_nulls": True}
+    ).all()
+    relationships = pair_relationships(cached_pedigree(db), [(pair.ram_id, pair.ewe_id) for pair in pairs])
+
+    # Serialized before commit, which would expire every pair and reload each one
+    created = MatingPairsCreated(
+        pairs=[MatingPairResponse.model_validate(pair) for pair in pairs],
+        alerts=[NotificationResponse.from_notification(n) for n in inbreeding_alerts(pairs, relationships)]
+    )
+    db.commit()
+    return created
+
+
+def create_mating_pair(db: Session, pair_in: MatingPairCreate) -> MatingPairsCreated:
+    """Create one mating pair."""
+    return create_mating_pairs(db, [pair_in])
+
+
+def create_mating_group(db: Session, group_in: MatingGroupCreate) -> MatingPairsCreated:
+    """Pair one ram with every ewe of a group slot."""
+    return create_mating_pairs(db, [
+        MatingPairCreate(
+            ram_id=group_in.ram_id,
+            ewe_id=ewe_id,
+            mating_start_date=group_in.mating_start_date,
+            group_slot=group_in.group_slot
+        )
+        for ewe_id in group_in.ewe_ids
+    ])
+
+
+def get_mating_pair(db: Session, pair_id: int) -> Optional[MatingPair]:
+    """Get a mating pair by ID."""
+    return db.query(MatingPair).filter(MatingPair.id == pair_id).first()
+
+
+def list_mating_pairs(db: Session, filters: MatingPairFilter) -> List[MatingPair]:
+    """List mating pairs with optional filtering, latest matings first."""
+    query = db.query(MatingPair)
+    if filters.ram_id:
+        query = query.filter(MatingPair.ram_id == filters.ram_id)
+    if filters.ewe_id:
+        query = query.filter(MatingPair.ewe_id == filters.ewe_id)
+    if filters.group_slot is not None:
+        query = query.filter(MatingPair.group_slot == filters.group_slot)
+    if filters.open_only:
+        query = query.filter(*_open_pair_filter())
+    return query.order_by(MatingPair.mating_start_date.desc(), MatingPair.id).all()
+
+
+def update_mating_pair(db: Session, pair_id: int, pair_in: MatingPairUpdate) -> Optional[MatingPair]:
+    """Update a mating pair's timing, outcome or override."""
+    db_pair = get_mating_pair(db=db, pair_id=pair_id)
+    if not db_pair:
+        return None
+
+    update_data = pair_in.model_dump(exclude_unset=True)
+    if update_data.get("pregnancy_confirmed") and update_data.get("pregnancy_failed"):
+        raise ValueError("A pregnancy cannot be both confirmed and failed")
+    for field, value in update_data.items():
+        setattr(db_pair, field, value)
+
+    db.commit()
+    db.refresh(db_pair)
+    return db_pair
+
+
+def delete_mating_pair(db: Session, pair_id: int) -> bool:
+    """Delete a mating pair."""
+    db_pair = get_mating_pair(db=db, pair_id=pair_id)
+    if not db_pair:
+        return False
+    db.delete(db_pair)
+    db.commit()
+    return True
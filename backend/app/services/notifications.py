@@ -1,10 +1,15 @@
-from typing import List, Optional
+from typing import List, Sequence
 from datetime import date, timedelta
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from app.db.models.health_event import HealthEvent
+from app.core.config import settings
+from app.db.models.birth_record import BirthRecord
 from app.db.models.mating_pair import MatingPair
 from app.db.models.sheep import Sheep
 from app.services.health import get_overdue_events
+from app.services.pedigree import pair_relationships
+from app.services.pedigree_index import cached_pedigree
+from app.services.protocols import get_due_treatments
 
 
 class NotificationType:
@@ -12,6 +17,7 @@ class NotificationType:
     MATING_WINDOW = "mating_window"
     WEANING_DUE = "weaning_due"
     HEALTH_FOLLOWUP = "health_followup"
+    TREATMENT_OVERDUE = "treatment_overdue"
     INBREEDING_ALERT = "inbreeding_alert"
 
 
@@ -61,6 +67,30 @@ def get_health_notifications(db: Session) -> List[Notification]:
     return notifications
 
 
+def get_treatment_notifications(db: Session) -> List[Notification]:
+    """Get one notification per protocol with overdue doses."""
+    by_protocol = {}
+    for due in get_due_treatments(db, overdue_only=True, limit=None):
+        by_protocol.setdefault(due.protocol_id, []).append(due)
+
+    notifications = []
+    for protocol_id, dues in by_protocol.items():
+        worst = max(due.days_overdue for due in dues)
+        notifications.append(Notification(
+            type=NotificationType.TREATMENT_OVERDUE,
+            title="Overdue Treatments",
+            message=f"{len(dues)} sheep overdue for {dues[0].protocol_name} (up to {worst} days)",
+            recipient="herd_care_team",
+            priority="high" if worst > 7 else "normal",
+            data={
+                "protocol_id": protocol_id,
+                "sheep_ids": [due.sheep_id for due in dues],
+                "days_overdue": worst
+            }
+        ))
+    return notifications
+
+
 def get_mating_notifications(db: Session) -> List[Notification]:
     """Get notifications for upcoming mating windows."""
     notifications = []
@@ -93,6 +123,47 @@ def get_mating_notifications(db: Session) -> List[Notification]:
     return notifications
 
 
+def inbreeding_alerts(pairs: Sequence[MatingPair], relationships: Sequence[float]) -> List[Notification]:
+    """Alerts for the pairs whose lambs would be inbred beyond the configured threshold."""
+    threshold = settings.MATING_INBREEDING_ALERT_THRESHOLD
+    notifications = []
+    for pair, relationship in zip(pairs, relationships):
+        expected_inbreeding = float(relationship) / 2
+        if expected_inbreeding < threshold:
+            continue
+        notifications.append(Notification(
+            type=NotificationType.INBREEDING_ALERT,
+            title="Inbreeding Alert",
+            message=(
+                f"Ram {pair.ram_id} and ewe {pair.ewe_id} are related: "
+                f"expected lamb inbreeding {expected_inbreeding:.1%}"
+            ),
+            recipient="farm_manager",
+            priority="high" if expected_inbreeding >= 2 * threshold else "normal",
+            data={
+                "mating_id": pair.id,
+                "ram_id": pair.ram_id,
+                "ewe_id": pair.ewe_id,
+                "group_slot": pair.group_slot,
+                "expected_inbreeding": round(expected_inbreeding, 4)
+            }
+        ))
+    return notifications
+
+
+def get_inbreeding_notifications(db: Session) -> List[Notification]:
+    """Get inbreeding alerts for pairs that may still lamb and nobody has overridden."""
+    pairs = db.query(MatingPair).filter(
+        MatingPair.actual_lambing_date.is_(None),
+        or_(MatingPair.pregnancy_failed.is_(None), MatingPair.pregnancy_failed.is_(False)),
+        MatingPair.override_reason.is_(None)
+    ).order_by(MatingPair.id).all()
+    if not pairs:
+        return []
+    relationships = pair_relationships(cached_pedigree(db), [(pair.ram_id, pair.ewe_id) for pair in pairs])
+    return inbreeding_alerts(pairs, relationships)
+
+
 def get_weaning_notifications(db: Session) -> List[Notification]:
     """Get notifications for upcoming weaning dates."""
     notifications = []
@@ -130,6 +201,8 @@ def get_all_notifications(db: Session) -> List[Notification]:
     """Get all notifications from all sources."""
     notifications = []
     notifications.extend(get_health_notifications(db))
+    notifications.extend(get_treatment_notifications(db))
     notifications.extend(get_mating_notifications(db))
+    notifications.extend(get_inbreeding_notifications(db))
     notifications.extend(get_weaning_notifications(db))
     return notifications 
\ No newline at end of file
@@ -0,0 +1,52 @@
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.db.models.sheep import Sheep
+from app.services.sheep_index import FarmIndexes, SheepIndexBase
+from app.services.pedigree import Pedigree
+
+
+class PedigreeIndex(SheepIndexBase):
+    """In-memory {tag_id: (sire_id, dam_id)} pedigree of one farm."""
+
+    def __init__(self):
+        super().__init__()
+        self._pedigree: Pedigree = {}
+        # Copy handed to readers, rebuilt on the first read after a change
+        self._snapshot: Optional[Pedigree] = None
+
+    def _reset(self) -> None:
+        self._pedigree = {}
+        self._snapshot = None
+
+    def _forget(self, tag_id: str) -> None:
+        self._pedigree.pop(tag_id, None)
+        self._snapshot = None
+
+    def _load(self, db: Session, tag_ids: Optional[List[str]] = None) -> None:
+        query = db.query(Sheep.tag_id, Sheep.sire_id, Sheep.dam_id)
+        if tag_ids is not None:
+            query = query.filter(Sheep.tag_id.in_(tag_ids))
+        for tag_id, sire_id, dam_id in query.all():
+            self._pedigree[tag_id] = (sire_id, dam_id)
+        self._snapshot = None
+
+    def pedigree(self) -> Pedigree:
+        """A snapshot of the pedigree, safe to use while another request syncs the index.
+
+        The snapshot is shared by every caller until the index changes, so
+        it must not be modified.
+        """
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = dict(self._pedigree)
+            return self._snapshot
+
+
+pedigree_index = FarmIndexes(PedigreeIndex)
+
+
+def cached_pedigree(db: Session) -> Pedigree:
+    """The session farm's pedigree, costing one query when nothing changed since the last call."""
+    index = pedigree_index.for_session(db)
+    index.sync(db)
+    return index.pedigree()
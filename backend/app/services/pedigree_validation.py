@@ -0,0 +1,214 @@
+from collections import Counter, deque
+from datetime import timedelta
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.jobs import JobContext
+from app.db.models.sheep import Sheep, SheepSex
+from app.schemas.pedigree import (
+    PedigreeIssue,
+    PedigreeIssueSeverity,
+    PedigreeIssueType,
+    PedigreeValidationReport
+)
+
+
+class _Animal:
+    __slots__ = ("sex", "date_of_birth", "gone_date", "sire_id", "dam_id")
+
+    def __init__(self, sex, date_of_birth, gone_date, sire_id, dam_id):
+        self.sex = sex
+        self.date_of_birth = date_of_birth
+        self.gone_date = gone_date
+        self.sire_id = sire_id
+        self.dam_id = dam_id
+
+
+def _load_flock(db: Session) -> Dict[str, _Animal]:
+    """Load every sheep's pedigree and lifetime fields in a single query."""
+    rows = db.query(
+        Sheep.tag_id,
+        Sheep.sex,
+        Sheep.date_of_birth,
+        Sheep.sale_date,
+        Sheep.death_date,
+        Sheep.sire_id,
+        Sheep.dam_id
+    ).all()
+    flock = {}
+    for tag_id, sex, date_of_birth, sale_date, death_date, sire_id, dam_id in rows:
+        gone = [d for d in (sale_date, death_date) if d]
+        flock[tag_id] = _Animal(sex, date_of_birth, min(gone) if gone else None, sire_id, dam_id)
+    return flock
+
+
+def _parent_issues(tag_id: str, animal: _Animal, flock: Dict[str, _Animal]) -> List[PedigreeIssue]:
+    """Checks that only need the animal and its two parents."""
+    issues = []
+
+    def add(issue, related_id, detail, severity=PedigreeIssueSeverity.ERROR):
+        issues.append(PedigreeIssue(
+            sheep_id=tag_id, issue=issue, severity=severity, related_id=related_id, detail=detail
+        ))
+
+    if animal.sire_id and animal.sire_id == animal.dam_id:
+        add(PedigreeIssueType.SAME_SIRE_AND_DAM, animal.sire_id, "Sire and dam are the same animal")
+
+    conception = animal.date_of_birth - timedelta(days=settings.DEFAULT_GESTATION_DAYS)
+    for role, parent_id, expected_sex in (
+        ("sire", animal.sire_id, SheepSex.MALE),
+        ("dam", animal.dam_id, SheepSex.FEMALE)
+    ):
+        if not parent_id:
+            continue
+        if parent_id == tag_id:
+            add(PedigreeIssueType.SELF_PARENT, parent_id, f"Sheep is recorded as its own {role}")
+            continue
+        parent = flock.get(parent_id)
+        if parent is None:
+            continue
+        if parent.sex != expected_sex:
+            add(PedigreeIssueType.WRONG_PARENT_SEX, parent_id, f"The {role} is recorded as {parent.sex.value}")
+        if parent.date_of_birth >= animal.date_of_birth:
+            add(
+                PedigreeIssueType.PARENT_BORN_AFTER_OFFSPRING, parent_id,
+                f"The {role} was born {parent.date_of_birth}, not before the offspring ({animal.date_of_birth})"
+            )
+        if role == "sire" and parent.gone_date and parent.gone_date < conception:
+            add(
+                PedigreeIssueType.SIRE_GONE_BEFORE_CONCEPTION, parent_id,
+                f"The sire left the flock on {parent.gone_date}, before conception around {conception}"
+            )
+        if role == "dam" and parent.gone_date and parent.gone_date < animal.date_of_birth:
+            add(
+                PedigreeIssueType.DAM_GONE_BEFORE_BIRTH, parent_id,
+                f"The dam left the flock on {parent.gone_date}, before the birth on {animal.date_of_birth}"
+            )
+    return issues
+
+
+def _strongly_connected(parents: Dict[str, List[str]]) -> List[List[str]]:
+    """Tarjan's strongly connected components of the ancestry graph, larger than one animal.
+
+    Iterative, so deep pedigrees don't hit the recursion limit.
+    """
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    components = []
+
+    def visit(tag_id):
+        index[tag_id] = low[tag_id] = len(index)
+        stack.append(tag_id)
+        on_stack.add(tag_id)
+        return tag_id, iter(parents[tag_id])
+
+    for root in parents:
+        if root in index:
+            continue
+        work = [visit(root)]
+        while work:
+            tag_id, remaining = work[-1]
+            for parent_id in remaining:
+                if parent_id not in index:
+                    work.append(visit(parent_id))
+                    break
+                if parent_id in on_stack:
+                    low[tag_id] = min(low[tag_id], index[parent_id])
+            else:
+                work.pop()
+                if work:
+                    caller = work[-1][0]
+                    low[caller] = min(low[caller], low[tag_id])
+                if low[tag_id] == index[tag_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == tag_id:
+                            break
+                    if len(component) > 1:
+                        components.append(component)
+    return components
+
+
+def _cycle_issues(flock: Dict[str, _Animal]) -> List[PedigreeIssue]:
+    """Find pedigree cycles as strongly connected components, in time linear in the flock.
+
+    Every animal in a component is its own ancestor; animals descending from
+    a component without being part of one only inherit the problem. An
+    animal recorded as its own parent is reported by the parent checks and
+    left out here.
+    """
+    parents: Dict[str, List[str]] = {}
+    children: Dict[str, List[str]] = {tag_id: [] for tag_id in flock}
+    for tag_id, animal in flock.items():
+        known = sorted(p for p in {animal.sire_id, animal.dam_id} if p and p in flock and p != tag_id)
+        parents[tag_id] = known
+        for parent_id in known:
+            children[parent_id].append(tag_id)
+
+    component_of: Dict[str, int] = {}
+    for number, component in enumerate(_strongly_connected(parents)):
+        for tag_id in component:
+            component_of[tag_id] = number
+    if not component_of:
+        return []
+
+    downstream = set()
+    queue = deque(component_of)
+    while queue:
+        tag_id = queue.popleft()
+        for child_id in children[tag_id]:
+            if child_id not in component_of and child_id not in downstream:
+                downstream.add(child_id)
+                queue.append(child_id)
+
+    issues = []
+    for tag_id in sorted(component_of):
+        cycle_parents = [p for p in parents[tag_id] if component_of.get(p) == component_of[tag_id]]
+        issues.append(PedigreeIssue(
+            sheep_id=tag_id,
+            issue=PedigreeIssueType.CYCLE,
+            severity=PedigreeIssueSeverity.ERROR,
+            related_id=cycle_parents[0],
+            detail="Sheep is its own ancestor"
+        ))
+    for tag_id in sorted(downstream):
+        issues.append(PedigreeIssue(
+            sheep_id=tag_id,
+            issue=PedigreeIssueType.CYCLIC_ANCESTRY,
+            severity=PedigreeIssueSeverity.WARNING,
+            detail="An ancestor is part of a pedigree cycle"
+        ))
+    return issues
+
+
+def validate_pedigree(db: Session) -> PedigreeValidationReport:
+    """Check the whole flock pedigree after one bulk load, in time linear in the flock."""
+    flock = _load_flock(db)
+    issues = []
+    for tag_id, animal in flock.items():
+        issues.extend(_parent_issues(tag_id, animal, flock))
+    issues.extend(_cycle_issues(flock))
+    issues.sort(key=lambda issue: (issue.sheep_id, issue.issue.value))
+
+    counts = Counter(issue.issue for issue in issues)
+    return PedigreeValidationReport(
+        checked=len(flock),
+        valid=not any(issue.severity == PedigreeIssueSeverity.ERROR for issue in issues),
+        counts={issue_type: counts.get(issue_type, 0) for issue_type in PedigreeIssueType},
+        issues=issues
+    )
+
+
+def validate_pedigree_job(ctx: JobContext) -> dict:
+    """Job handler: validate the pedigree and return the report."""
+    db = ctx.open_session()
+    try:
+        ctx.progress(0.1, "Validating pedigree", force=True)
+        return validate_pedigree(db).model_dump(mode="json")
+    finally:
+        db.close()
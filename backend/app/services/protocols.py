@@ -0,0 +1,273 @@
+from typing import List, Optional
+from datetime import date, datetime, timedelta
+from sqlalchemy import and_, exists, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+from app.core.config import settings
+from app.core.jobs import JobContext
+from app.db.models.health_event import HealthEvent
+from app.db.models.sheep import Sheep, SheepStatus
+from app.db.models.treatment_protocol import DueTreatment, TreatmentProtocol
+from app.schemas.protocol import (
+    DueTreatmentCompletion,
+    DueTreatmentResponse,
+    TreatmentProtocolCreate,
+    TreatmentProtocolUpdate
+)
+from app.services.changes import ChangeEntity, record_changes
+
+
+def create_protocol(db: Session, protocol_in: TreatmentProtocolCreate) -> TreatmentProtocol:
+    """Create a treatment protocol and materialize its first due doses."""
+    existing = db.query(TreatmentProtocol).filter(TreatmentProtocol.name == protocol_in.name).first()
+    if existing:
+        raise ValueError(f"Protocol {protocol_in.name} already exists")
+
+    db_protocol = TreatmentProtocol(**protocol_in.model_dump())
+    db.add(db_protocol)
+    db.flush()
+    if db_protocol.active:
+        _materialize_protocol(db, db_protocol, date.today())
+    db.commit()
+    db.refresh(db_protocol)
+    return db_protocol
+
+
+def get_protocol(db: Session, protocol_id: int) -> Optional[TreatmentProtocol]:
+    """Get a treatment protocol by ID."""
+    return db.query(TreatmentProtocol).filter(TreatmentProtocol.id == protocol_id).first()
+
+
+def list_protocols(db: Session, active: Optional[bool] = None) -> List[TreatmentProtocol]:
+    """List treatment protocols."""
+    query = db.query(TreatmentProtocol)
+    if active is not None:
+        query = query.filter(TreatmentProtocol.active == active)
+    return query.order_by(TreatmentProtocol.name).all()
+
+
+def update_protocol(
+    db: Session,
+    protocol_id: int,
+    protocol_in: TreatmentProtocolUpdate
+) -> Optional[TreatmentProtocol]:
+    """Update a protocol's details or pause it; a paused protocol's open doses are dropped."""
+    db_protocol = get_protocol(db, protocol_id)
+    if not db_protocol:
+        return None
+
+    for field, value in protocol_in.model_dump(exclude_unset=True).items():
+        setattr(db_protocol, field, value)
+    if db_protocol.active:
+        _materialize_protocol(db, db_protocol, date.today())
+    else:
+        db.query(DueTreatment).filter(
+            DueTreatment.protocol_id == protocol_id,
+            DueTreatment.completed_date.is_(None)
+        ).delete(synchronize_session=False)
+    db.commit()
+    db.refresh(db_protocol)
+    return db_protocol
+
+
+def delete_protocol(db: Session, protocol_id: int) -> bool:
+    """Delete a protocol and its due treatments; recorded health events are kept."""
+    db_protocol = get_protocol(db, protocol_id)
+    if not db_protocol:
+        return False
+    db.delete(db_protocol)
+    db.commit()
+    return True
+
+
+def _cohort_filter(protocol: TreatmentProtocol):
+    conditions = [Sheep.status == SheepStatus.ACTIVE]
+    if protocol.sex:
+        conditions.append(Sheep.sex == protocol.sex)
+    if protocol.breed:
+        conditions.append(Sheep.breed == protocol.breed)
+    if protocol.section:
+        conditions.append(Sheep.current_section == protocol.section)
+    return and_(*conditions)
+
+
+def _materialize_protocol(db: Session, protocol: TreatmentProtocol, today: date) -> int:
+    """Insert the next due dose for every sheep in the protocol's cohort.
+
+    Two INSERT ... SELECT statements per protocol, whatever the flock size:
+    one starts the series for newly eligible sheep, the other schedules the
+    dose after each completed one. A sheep never has more than one open dose
+    per protocol, and nothing is created beyond the materialization horizon.
+    """
+    horizon = today + timedelta(days=settings.PROTOCOL_DUE_HORIZON_DAYS)
+    # Sheep already past the first-dose age when the protocol was introduced
+    # start from the introduction date rather than becoming instantly overdue
+    introduced = protocol.created_at or today
+    if isinstance(introduced, datetime):
+        introduced = introduced.date()
+    first_due = func.greatest(Sheep.date_of_birth + protocol.first_dose_age_days, introduced)
+    columns = ["farm_id", "protocol_id", "sheep_id", "dose_number", "due_date"]
+
+    # Series start: sheep with no dose of this protocol yet
+    start_age = first_due - Sheep.date_of_birth
+    # The selects inside INSERT ... SELECT are not farm-scoped by the session
+    start_conditions = [
+        Sheep.farm_id == protocol.farm_id,
+        _cohort_filter(protocol),
+        first_due <= horizon,
+        ~exists().where(
+            DueTreatment.protocol_id == protocol.id,
+            DueTreatment.sheep_id == Sheep.tag_id
+        )
+    ]
+    if protocol.min_age_days is not None:
+        start_conditions.append(start_age >= protocol.min_age_days)
+    if protocol.max_age_days is not None:
+        start_conditions.append(start_age <= protocol.max_age_days)
+    started = db.execute(insert(DueTreatment).from_select(columns, select(
+        literal(protocol.farm_id), literal(protocol.id), Sheep.tag_id, literal(1), first_due
+    ).where(*start_conditions)))
+    inserted = started.rowcount or 0
+
+    if not protocol.interval_days:
+        return inserted
+
+    # Next dose: the latest dose was completed and the series isn't finished
+    later = aliased(DueTreatment)
+    next_due = DueTreatment.completed_date + protocol.interval_days
+    next_conditions = [
+        DueTreatment.protocol_id == protocol.id,
+        DueTreatment.completed_date.isnot(None),
+        next_due <= horizon,
+        _cohort_filter(protocol),
+        ~exists().where(
+            later.protocol_id == DueTreatment.protocol_id,
+            later.sheep_id == DueTreatment.sheep_id,
+            later.dose_number > DueTreatment.dose_number
+        )
+    ]
+    if protocol.doses is not None:
+        next_conditions.append(DueTreatment.dose_number < protocol.doses)
+    continued = db.execute(insert(DueTreatment).from_select(columns, select(
+        literal(protocol.farm_id), literal(protocol.id), DueTreatment.sheep_id, DueTreatment.dose_number + 1, next_due
+    ).join(Sheep, Sheep.tag_id == DueTreatment.sheep_id).where(*next_conditions)))
+    return inserted + (continued.rowcount or 0)
+
+
+def materialize_due_treatments(db: Session, today: Optional[date] = None, ctx: Optional[JobContext] = None) -> int:
+    """Materialize due doses for every active protocol; returns the number created.
+
+    With a job context, progress is reported per protocol and a cancelled
+    job stops before anything is committed.
+    """
+    today = today or date.today()
+    created = 0
+    protocols = list_protocols(db, active=True)
+    for done, protocol in enumerate(protocols):
+        if ctx:
+            ctx.progress(done / len(protocols), f"Materializing {protocol.name}")
+        created += _materialize_protocol(db, protocol, today)
+    db.commit()
+    return created
+
+
+def materialize_job(ctx: JobContext) -> dict:
+    """Job handler: materialize due doses for every active protocol."""
+    db = ctx.open_session()
+    try:
+        return {"created": materialize_due_treatments(db, ctx=ctx)}
+    finally:
+        db.close()
+
+
+def get_due_treatments(
+    db: Session,
+    until: Optional[date] = None,
+    overdue_only: bool = False,
+    protocol_id: Optional[int] = None,
+    sheep_id: Optional[str] = None,
+    skip: int = 0,
+    limit: Optional[int] = 500
+) -> List[DueTreatmentResponse]:
+    """Open doses due on or before a date, oldest first, read from the open-dose index."""
+    today = date.today()
+    until = today - timedelta(days=1) if overdue_only else (until or today)
+    query = db.query(
+        DueTreatment,
+        TreatmentProtocol.name,
+        TreatmentProtocol.event_type
+    ).join(TreatmentProtocol, TreatmentProtocol.id == DueTreatment.protocol_id).filter(
+        DueTreatment.completed_date.is_(None),
+        DueTreatment.due_date <= until
+    )
+    if protocol_id:
+        query = query.filter(DueTreatment.protocol_id == protocol_id)
+    if sheep_id:
+        query = query.filter(DueTreatment.sheep_id == sheep_id)
+
+    rows = query.order_by(DueTreatment.due_date, DueTreatment.sheep_id).offset(skip).limit(limit).all()
+    return [
+        DueTreatmentResponse(
+            id=due.id,
+            protocol_id=due.protocol_id,
+            protocol_name=name,
+            event_type=event_type,
+            sheep_id=due.sheep_id,
+            dose_number=due.dose_number,
+            due_date=due.due_date,
+            days_overdue=(today - due.due_date).days
+        )
+        for due, name, event_type in rows
+    ]
+
+
+def complete_due_treatments(db: Session, completion: DueTreatmentCompletion) -> List[HealthEvent]:
+    """Record the given doses as health events and close them.
+
+    The follow-up dose of each series is scheduled immediately, so the due
+    list is correct without waiting for the nightly run. The events carry no
+    next_due_date: the due list is the only reminder for protocol doses, so
+    they are not alerted twice and don't stay overdue once the next dose is
+    given.
+    """
+    completed_date = completion.completed_date or date.today()
+    due_ids = list(dict.fromkeys(completion.due_ids))
+    dues = db.query(DueTreatment).filter(DueTreatment.id.in_(due_ids)).with_for_update().all()
+    found = {due.id for due in dues}
+    missing = [str(due_id) for due_id in due_ids if due_id not in found]
+    if missing:
+        raise ValueError(f"Due treatments not found: {', '.join(missing)}")
+    done = [str(due.id) for due in dues if due.completed_date is not None]
+    if done:
+        raise ValueError(f"Due treatments already completed: {', '.join(done)}")
+
+    protocols = {p.id: p for p in db.query(TreatmentProtocol).filter(
+        TreatmentProtocol.id.in_({due.protocol_id for due in dues})
+    ).all()}
+    events = []
+    for due in dues:
+        protocol = protocols[due.protocol_id]
+        details = "; ".join(filter(None, [
+            f"{protocol.name} (dose {due.dose_number})", protocol.details, completion.details
+        ]))
+        events.append(HealthEvent(
+            sheep_id=due.sheep_id,
+            event_date=completed_date,
+            event_type=protocol.event_type,
+            details=details
+        ))
+    db.add_all(events)
+    db.flush()
+
+    for due, event in zip(dues, events):
+        due.completed_date = completed_date
+        due.health_event_id = event.id
+    db.flush()
+    record_changes(db, ChangeEntity.HEALTH_EVENT, [event.id for event in events])
+
+    for protocol in protocols.values():
+        if protocol.active:
+            _materialize_protocol(db, protocol, date.today())
+    db.commit()
+    for event in events:
+        db.refresh(event)
+    return events
@@ -0,0 +1,74 @@
+from typing import List
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.sheep import Sheep
+from app.schemas.sheep import AutocompleteSuggestion
+from app.services.search_index import sheep_search_index
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _escape_like(value: str) -> str:
+    # Backslash is Postgres' default LIKE escape, so no ESCAPE clause is needed
+    # and the planner can still turn the pattern into an index range
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _notes_vector():
+    # Must match the expression of ix_sheep_notes_fts exactly for the index to be used
+    return func.to_tsvector(literal_column("'simple'"), func.coalesce(Sheep.notes, literal_column("''")))
+
+
+def autocomplete_sheep(db: Session, prefix: str, limit: int = 10) -> List[AutocompleteSuggestion]:
+    """Suggest sheep whose tag ID or scrapie ID starts with the prefix."""
+    if not _is_postgres(db):
+        index = sheep_search_index.for_session(db)
+        index.sync(db)
+        return [
+            AutocompleteSuggestion(tag_id=tag_id, value=value)
+            for value, tag_id in index.autocomplete(prefix, limit)
+        ]
+
+    pattern = _escape_like(prefix.upper()) + "%"
+    suggestions = []
+    for column in (Sheep.tag_id, Sheep.scrapie_id):
+        rows = db.query(Sheep.tag_id, column).filter(
+            func.upper(column).like(pattern)
+        ).order_by(func.upper(column)).limit(limit).all()
+        suggestions.extend(AutocompleteSuggestion(tag_id=tag_id, value=value) for tag_id, value in rows)
+    suggestions.sort(key=lambda s: s.value.upper())
+    return suggestions[:limit]
+
+
+def search_sheep(db: Session, q: str, limit: int = 20) -> List[Sheep]:
+    """Typo-tolerant search over identifiers, origin farm and notes, best matches first."""
+    if not _is_postgres(db):
+        index = sheep_search_index.for_session(db)
+        index.sync(db)
+        ranked = index.search(q, settings.SEARCH_SIMILARITY_THRESHOLD, limit)
+        if not ranked:
+            return []
+        by_tag = {s.tag_id: s for s in db.query(Sheep).filter(Sheep.tag_id.in_([t for t, _ in ranked])).all()}
+        return [by_tag[tag_id] for tag_id, _ in ranked if tag_id in by_tag]
+
+    # pg_trgm's % operator uses pg_trgm.similarity_threshold
+    db.execute(
+        func.set_config("pg_trgm.similarity_threshold", str(settings.SEARCH_SIMILARITY_THRESHOLD), True).select()
+    )
+    ts_query = func.plainto_tsquery(literal_column("'simple'"), q)
+    score = func.greatest(
+        func.similarity(Sheep.tag_id, q),
+        func.similarity(func.coalesce(Sheep.scrapie_id, ""), q),
+        func.similarity(func.coalesce(Sheep.origin_farm, ""), q),
+        func.ts_rank(_notes_vector(), ts_query)
+    )
+    return db.query(Sheep).filter(or_(
+        Sheep.tag_id.op("%")(q),
+        Sheep.scrapie_id.op("%")(q),
+        Sheep.origin_farm.op("%")(q),
+        Sheep.tag_id.ilike(_escape_like(q) + "%"),
+        _notes_vector().op("@@")(ts_query)
+    )).order_by(score.desc(), Sheep.tag_id).limit(limit).all()
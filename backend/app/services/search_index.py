@@ -0,0 +1,117 @@
+import bisect
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.db.models.sheep import Sheep
+from app.services.sheep_index import FarmIndexes, SheepIndexBase
+
+_WORD = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded the way pg_trgm pads them."""
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SheepSearchIndex(SheepIndexBase):
+    """In-process fallback for trigram search and prefix autocomplete.
+
+    Identifiers sit in a sorted list so a prefix lookup is a bisection plus a
+    short scan, independent of flock size. Identifiers, origin farm and words
+    from the notes are also indexed by trigram for typo-tolerant matching with
+    the same similarity measure as pg_trgm.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._prefixes: List[Tuple[str, str, str]] = []
+        self._terms: Dict[str, List[Tuple[str, str]]] = {}
+        self._term_grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._gram_terms: Dict[str, Set[str]] = {}
+
+    def _reset(self) -> None:
+        self._prefixes, self._terms, self._term_grams, self._postings, self._gram_terms = [], {}, {}, {}, {}
+
+    def _forget(self, tag_id: str) -> None:
+        for key, value in self._terms.pop(tag_id, []):
+            if key == "prefix":
+                entry = (value.upper(), value, tag_id)
+                i = bisect.bisect_left(self._prefixes, entry)
+                if i < len(self._prefixes) and self._prefixes[i] == entry:
+                    del self._prefixes[i]
+                continue
+            term_tags = self._postings.get(value)
+            if term_tags is not None:
+                term_tags[tag_id] -= 1
+                if term_tags[tag_id] == 0:
+                    del term_tags[tag_id]
+                if not term_tags:
+                    del self._postings[value]
+                    for gram in self._term_grams.pop(value):
+                        self._gram_terms[gram].discard(value)
+                        if not self._gram_terms[gram]:
+                            del self._gram_terms[gram]
+
+    def _add_term(self, tag_id: str, term: str) -> None:
+        term = term.lower()
+        self._terms[tag_id].append(("term", term))
+        if term not in self._postings:
+            self._postings[term] = {}
+            self._term_grams[term] = trigrams(term)
+            for gram in self._term_grams[term]:
+                self._gram_terms.setdefault(gram, set()).add(term)
+        self._postings[term][tag_id] = self._postings[term].get(tag_id, 0) + 1
+
+    def _load(self, db: Session, tag_ids: Optional[List[str]] = None) -> None:
+        query = db.query(Sheep.tag_id, Sheep.scrapie_id, Sheep.origin_farm, Sheep.notes)
+        if tag_ids is not None:
+            query = query.filter(Sheep.tag_id.in_(tag_ids))
+        for tag_id, scrapie_id, origin_farm, notes in query.all():
+            self._terms[tag_id] = []
+            for identifier in (tag_id, scrapie_id):
+                if identifier:
+                    bisect.insort(self._prefixes, (identifier.upper(), identifier, tag_id))
+                    self._terms[tag_id].append(("prefix", identifier))
+                    self._add_term(tag_id, identifier)
+            for text in (origin_farm, notes):
+                for word in _WORD.findall(text or ""):
+                    self._add_term(tag_id, word)
+
+    def autocomplete(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        """(matched identifier, tag_id) pairs whose identifier starts with the prefix."""
+        key = prefix.upper()
+        start = bisect.bisect_left(self._prefixes, (key,))
+        matches = []
+        for upper, identifier, tag_id in self._prefixes[start:]:
+            if not upper.startswith(key) or len(matches) >= limit:
+                break
+            matches.append((identifier, tag_id))
+        return matches
+
+    def search(self, query: str, threshold: float, limit: int) -> List[Tuple[str, float]]:
+        """(tag_id, score) pairs ranked by best trigram similarity of any indexed term."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared_counts: Dict[str, int] = {}
+        for gram in query_grams:
+            for term in self._gram_terms.get(gram, ()):
+                shared_counts[term] = shared_counts.get(term, 0) + 1
+
+        best: Dict[str, float] = {}
+        for term, shared in shared_counts.items():
+            score = shared / (len(query_grams) + len(self._term_grams[term]) - shared)
+            if score < threshold:
+                continue
+            for tag_id in self._postings[term]:
+                if score > best.get(tag_id, 0.0):
+                    best[tag_id] = score
+        return sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+sheep_search_index = FarmIndexes(SheepSearchIndex)
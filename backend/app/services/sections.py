@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional
+from datetime import date
+from sqlalchemy import and_, or_, func, insert, literal_column, update
+from sqlalchemy.orm import Session
+from app.db.models.section_assignment import SectionAssignment
+from app.db.models.sheep import Sheep, SheepSection
+from app.db.tenancy import require_farm_id
+from app.schemas.section import SectionHeadcountResponse
+from app.services.changes import ChangeEntity, record_changes
+
+
+def _overlaps(db: Session, first_day: date, last_day: date):
+    """Filter for assignments overlapping the closed date range [first_day, last_day].
+
+    On Postgres the predicate is written against the same daterange expression
+    as the GiST index so the planner can use it; elsewhere it falls back to
+    the (section, start_date, end_date) B-tree index.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        period = func.daterange(SectionAssignment.start_date, SectionAssignment.end_date, literal_column("'[)'"))
+        return period.op("&&")(func.daterange(first_day, last_day, literal_column("'[]'")))
+    return and_(
+        SectionAssignment.start_date <= last_day,
+        or_(SectionAssignment.end_date.is_(None), SectionAssignment.end_date > first_day)
+    )
+
+
+def get_section_occupants(db: Session, section: SheepSection, on_date: date) -> List[Sheep]:
+    """Get the sheep that were in a section on a given date."""
+    occupant_ids = db.query(SectionAssignment.sheep_id).filter(
+        SectionAssignment.section == section,
+        _overlaps(db, on_date, on_date)
+    )
+    return db.query(Sheep).filter(Sheep.tag_id.in_(occupant_ids)).order_by(Sheep.tag_id).all()
+
+
+def get_section_headcounts(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    section: Optional[SheepSection] = None
+) -> List[SectionHeadcountResponse]:
+    """Get the headcount of each section for every day in a date range.
+
+    Only the intervals overlapping the range are read; daily counts are then
+    produced with a single sweep over interval start/end deltas.
+    """
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date")
+
+    days = (end_date - start_date).days + 1
+    sections = [section] if section else list(SheepSection)
+    deltas: Dict[SheepSection, List[int]] = {s: [0] * (days + 1) for s in sections}
+
+    query = db.query(
+        SectionAssignment.section,
+        SectionAssignment.start_date,
+        SectionAssignment.end_date
+    ).filter(_overlaps(db, start_date, end_date))
+    if section:
+        query = query.filter(SectionAssignment.section == section)
+
+    for assigned_section, start, end in query.all():
+        first = max((start - start_date).days, 0)
+        stop = days if end is None else min((end - start_date).days, days)
+        if first < stop:
+            deltas[assigned_section][first] += 1
+            deltas[assigned_section][stop] -= 1
+
+    running = {s: 0 for s in sections}
+    headcounts = []
+    for offset in range(days):
+        for s in sections:
+            running[s] += deltas[s][offset]
+        headcounts.append(SectionHeadcountResponse(
+            day=date.fromordinal(start_date.toordinal() + offset),
+            counts=dict(running)
+        ))
+    return headcounts
+
+
+def open_section_intervals(
+    db: Session,
+    tag_ids: List[str],
+    section: SheepSection,
+    start_date: date,
+    reason: Optional[str] = None
+) -> None:
+    """Open the first section interval of newly registered sheep with one INSERT.
+
+    The sheep rows must already be flushed; the caller commits.
+    """
+    farm_id = require_farm_id(db)
+    db.execute(insert(SectionAssignment), [
+        {"farm_id": farm_id, "sheep_id": tag_id, "section": section, "start_date": start_date, "reason": reason}
+        for tag_id in tag_ids
+    ])
+
+
+def record_section_moves(
+    db: Session,
+    tag_ids: List[str],
+    section: SheepSection,
+    move_date: date,
+    reason: Optional[str] = None
+) -> None:
+    """Close open intervals, open new ones and sync current_section for a group of sheep.
+
+    Each step is one set-based statement regardless of group size. The caller
+    owns the transaction and commits.
+    """
+    db.execute(
+        update(SectionAssignment).where(
+            SectionAssignment.sheep_id.in_(tag_ids),
+            SectionAssignment.end_date.is_(None)
+        ).values(end_date=move_date)
+    )
+    open_section_intervals(db, tag_ids, section, move_date, reason)
+    db.execute(
+        update(Sheep).where(Sheep.tag_id.in_(tag_ids)).values(current_section=section)
+    )
+    record_changes(db, ChangeEntity.SHEEP, tag_ids)
+
+
+def _move(
+    db: Session,
+    tag_ids: List[str],
+    section: SheepSection,
+    move_date: date,
+    reason: Optional[str]
+) -> List[str]:
+    """Validate and record a move, returning the tag IDs that changed section."""
+    tag_ids = list(dict.fromkeys(tag_ids))
+    current = dict(
+        db.query(Sheep.tag_id, Sheep.current_section).filter(
+            Sheep.tag_id.in_(tag_ids)
+        ).with_for_update().all()
+    )
+    missing = [tag_id for tag_id in tag_ids if tag_id not in current]
+    if missing:
+        raise ValueError(f"Sheep not found: {', '.join(missing)}")
+
+    to_move = [tag_id for tag_id in tag_ids if current[tag_id] != section]
+    if not to_move:
+        return []
+
+    later = db.query(SectionAssignment.sheep_id).filter(
+        SectionAssignment.sheep_id.in_(to_move),
+        SectionAssignment.end_date.is_(None),
+        SectionAssignment.start_date > move_date
+    ).first()
+    if later:
+        raise ValueError(f"Sheep {later[0]} entered its current section after {move_date}")
+
+    record_section_moves(db, to_move, section, move_date, reason)
+    return to_move
+
+
+def move_sheep(
+    db: Session,
+    tag_id: str,
+    section: SheepSection,
+    move_date: Optional[date] = None,
+    reason: Optional[str] = None
+) -> Optional[SectionAssignment]:
+    """Move a sheep to a section and return its open section assignment."""
+    if not db.query(Sheep.tag_id).filter(Sheep.tag_id == tag_id).first():
+        return None
+    _move(db, [tag_id], section, move_date or date.today(), reason)
+    db.commit()
+    return db.query(SectionAssignment).filter(
+        SectionAssignment.sheep_id == tag_id,
+        SectionAssignment.end_date.is_(None)
+    ).first()
+
+
+def bulk_move_sheep(
+    db: Session,
+    tag_ids: List[str],
+    section: SheepSection,
+    move_date: Optional[date] = None,
+    reason: Optional[str] = None
+) -> int:
+    """Move a group of sheep to a section in one transaction."""
+    moved = _move(db, tag_ids, section, move_date or date.today(), reason)
+    db.commit()
+    return len(moved)
+
+
+def get_section_history(db: Session, tag_id: str) -> List[SectionAssignment]:
+    """Get a sheep's section assignments, most recent first."""
+    return db.query(SectionAssignment).filter(
+        SectionAssignment.sheep_id == tag_id
+    ).order_by(SectionAssignment.start_date.desc()).all()
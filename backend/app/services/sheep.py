@@ -1,32 +1,48 @@
 from typing import List, Optional
+from datetime import date
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from app.db.models.sheep import Sheep, SheepStatus
-from app.schemas.sheep import SheepCreate, SheepUpdate, SheepFilter
+from sqlalchemy import or_, text
+from app.db.models.sheep import Sheep, SheepSection
+from app.db.models.section_assignment import SectionAssignment
+from app.db.models.archive import SheepArchive
+from app.schemas.sheep import SheepCreate, SheepUpdate, SheepFilter, TagResolveResponse
+from app.db.models.change_log import ChangeOperation
+from app.db.tenancy import ALL_FARMS
+from app.services.changes import ChangeEntity, record_change
+from app.services.sections import open_section_intervals, record_section_moves
+from app.services.tag_index import tag_code_index
+
+# Arbitrary application-wide key for the Postgres advisory lock that keeps
+# concurrent tag allocations from handing out the same numbers
+TAG_ALLOCATION_LOCK_KEY = 7291003
 
 
 def create_sheep(db: Session, sheep_in: SheepCreate) -> Sheep:
     """Create a new sheep record."""
-    # Check if tag_id already exists
-    existing_sheep = get_sheep(db, sheep_in.tag_id)
+    # Tags and codes are unique across all farms, so these checks look past
+    # the session's farm; only at farms sharing this session's database (see
+    # ALL_FARMS)
+    existing_sheep = db.query(Sheep.tag_id).filter(Sheep.tag_id == sheep_in.tag_id).execution_options(**ALL_FARMS).first()
     if existing_sheep:
         raise ValueError(f"Sheep with tag ID {sheep_in.tag_id} already exists")
+    if db.query(SheepArchive.tag_id).filter(SheepArchive.tag_id == sheep_in.tag_id).execution_options(**ALL_FARMS).first():
+        raise ValueError(f"Sheep with tag ID {sheep_in.tag_id} is archived; restore it instead")
 
     # Check if scrapie_id is unique if provided
     if sheep_in.scrapie_id:
-        existing = db.query(Sheep).filter(Sheep.scrapie_id == sheep_in.scrapie_id).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.scrapie_id == sheep_in.scrapie_id).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with scrapie ID {sheep_in.scrapie_id} already exists")
 
     # Check if rfid_code is unique if provided
     if sheep_in.rfid_code:
-        existing = db.query(Sheep).filter(Sheep.rfid_code == sheep_in.rfid_code).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.rfid_code == sheep_in.rfid_code).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with RFID code {sheep_in.rfid_code} already exists")
 
     # Check if qr_code is unique if provided
     if sheep_in.qr_code:
-        existing = db.query(Sheep).filter(Sheep.qr_code == sheep_in.qr_code).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.qr_code == sheep_in.qr_code).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with QR code {sheep_in.qr_code} already exists")
 
@@ -49,14 +65,24 @@ def create_sheep(db: Session, sheep_in: SheepCreate) -> Sheep:
     # Create new sheep record
     db_sheep = Sheep(**sheep_in.model_dump())
     db.add(db_sheep)
+    db.flush()
+    # The sheep has been in its first section since it joined the flock
+    open_section_intervals(
+        db, [db_sheep.tag_id], db_sheep.current_section or SheepSection.GENERAL,
+        sheep_in.purchase_date or sheep_in.date_of_birth
+    )
+    record_change(db, ChangeEntity.SHEEP, db_sheep.tag_id)
     db.commit()
     db.refresh(db_sheep)
     return db_sheep
 
 
-def get_sheep(db: Session, tag_id: str) -> Optional[Sheep]:
-    """Get a sheep by tag ID."""
-    return db.query(Sheep).filter(Sheep.tag_id == tag_id).first()
+def get_sheep(db: Session, tag_id: str, include_archived: bool = False) -> Optional[Sheep]:
+    """Get a sheep by tag ID, falling back to the archive when asked."""
+    sheep = db.query(Sheep).filter(Sheep.tag_id == tag_id).first()
+    if sheep is None and include_archived:
+        sheep = db.query(SheepArchive).filter(SheepArchive.tag_id == tag_id).first()
+    return sheep
 
 
 def update_sheep(db: Session, tag_id: str, sheep_in: SheepUpdate) -> Optional[Sheep]:
@@ -67,27 +93,32 @@ def update_sheep(db: Session, tag_id: str, sheep_in: SheepUpdate) -> Optional[Sh
 
     # Check if scrapie_id is unique if provided
     if sheep_in.scrapie_id and sheep_in.scrapie_id != db_sheep.scrapie_id:
-        existing = db.query(Sheep).filter(Sheep.scrapie_id == sheep_in.scrapie_id).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.scrapie_id == sheep_in.scrapie_id).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with scrapie ID {sheep_in.scrapie_id} already exists")
 
     # Check if rfid_code is unique if provided
     if sheep_in.rfid_code and sheep_in.rfid_code != db_sheep.rfid_code:
-        existing = db.query(Sheep).filter(Sheep.rfid_code == sheep_in.rfid_code).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.rfid_code == sheep_in.rfid_code).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with RFID code {sheep_in.rfid_code} already exists")
 
     # Check if qr_code is unique if provided
     if sheep_in.qr_code and sheep_in.qr_code != db_sheep.qr_code:
-        existing = db.query(Sheep).filter(Sheep.qr_code == sheep_in.qr_code).first()
+        existing = db.query(Sheep.tag_id).filter(Sheep.qr_code == sheep_in.qr_code).execution_options(**ALL_FARMS).first()
         if existing:
             raise ValueError(f"Sheep with QR code {sheep_in.qr_code} already exists")
 
+    # Section changes go through the section history so it stays in sync
+    if sheep_in.current_section and sheep_in.current_section != db_sheep.current_section:
+        record_section_moves(db, [tag_id], sheep_in.current_section, date.today())
+
     # Update fields
     update_data = sheep_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_sheep, field, value)
 
+    record_change(db, ChangeEntity.SHEEP, tag_id)
     db.commit()
     db.refresh(db_sheep)
     return db_sheep
@@ -104,55 +135,109 @@ def delete_sheep(db: Session, tag_id: str) -> bool:
         raise ValueError("Cannot delete sheep that has offspring records")
     if db_sheep.health_events:
         raise ValueError("Cannot delete sheep that has health event records")
-    if db_sheep.birth_records:
+    if db_sheep.birth_records_as_ewe or db_sheep.birth_records_as_sire:
         raise ValueError("Cannot delete sheep that has birth records")
-    if db_sheep.mating_records:
+    if db_sheep.mating_pairs_as_ram or db_sheep.mating_pairs_as_ewe:
         raise ValueError("Cannot delete sheep that has mating records")
-    if db_sheep.section_history:
-        raise ValueError("Cannot delete sheep that has section history")
 
+    # Section history belongs to the sheep and goes with it
+    db.query(SectionAssignment).filter(
+        SectionAssignment.sheep_id == tag_id
+    ).delete(synchronize_session=False)
     db.delete(db_sheep)
+    record_change(db, ChangeEntity.SHEEP, tag_id, ChangeOperation.DELETE)
     db.commit()
     return True
 
 
-def list_sheep(db: Session, filters: SheepFilter) -> List[Sheep]:
-    """List sheep records with optional filtering."""
-    query = db.query(Sheep)
-
+def _filter_sheep(db: Session, model, filters: SheepFilter):
+    query = db.query(model)
     if filters.status:
-        query = query.filter(Sheep.status == filters.status)
+        query = query.filter(model.status == filters.status)
     if filters.sex:
-        query = query.filter(Sheep.sex == filters.sex)
+        query = query.filter(model.sex == filters.sex)
     if filters.section:
-        query = query.filter(Sheep.current_section == filters.section)
+        query = query.filter(model.current_section == filters.section)
     if filters.breed:
-        query = query.filter(Sheep.breed == filters.breed)
+        query = query.filter(model.breed == filters.breed)
+    return query
 
-    return query.all()
 
+def list_sheep(db: Session, filters: SheepFilter) -> List[Sheep]:
+    """List sheep records with optional filtering; archived animals only when asked."""
+    sheep = _filter_sheep(db, Sheep, filters).all()
+    if filters.include_archived:
+        sheep.extend(_filter_sheep(db, SheepArchive, filters).all())
+    return sheep
 
-def generate_tag_id(db: Session, color_code: str) -> str:
-    """Generate the next available tag ID for a given color code."""
-    # Get the highest existing number for this color code
+
+def resolve_tag_codes(db: Session, codes: List[str]) -> TagResolveResponse:
+    """Resolve a batch of RFID/QR codes to sheep with a single query."""
+    index = tag_code_index.for_session(db)
+    index.sync(db)
+    matches = index.lookup(codes)
+
+    sheep_by_tag = {}
+    if matches:
+        sheep_by_tag = {
+            sheep.tag_id: sheep
+            for sheep in db.query(Sheep).filter(Sheep.tag_id.in_(set(matches.values()))).all()
+        }
+
+    resolved = {}
+    unresolved = []
+    for code in codes:
+        sheep = sheep_by_tag.get(matches.get(code))
+        if sheep:
+            resolved[code] = sheep
+        else:
+            unresolved.append(code)
+    return TagResolveResponse(resolved=resolved, unresolved=unresolved)
+
+
+def _next_tag_number(db: Session, color_code: str) -> int:
+    """The number after the highest one issued for a color code."""
+    # Archived tags and other farms' tags count too, they can't be issued again
     existing = db.query(Sheep.tag_id).filter(
         Sheep.tag_id.like(f"{color_code}-%")
-    ).all()
-    
-    if not existing:
-        return f"{color_code}-001"
-    
+    ).union_all(
+        db.query(SheepArchive.tag_id).filter(SheepArchive.tag_id.like(f"{color_code}-%"))
+    ).execution_options(**ALL_FARMS).all()
+
     # Extract numbers and find the highest
     numbers = []
-    for tag_id in existing:
+    for (tag_id,) in existing:
         try:
             num = int(tag_id.split("-")[1])
             numbers.append(num)
         except (IndexError, ValueError):
             continue
-    
-    next_num = max(numbers) + 1 if numbers else 1
-    return f"{color_code}-{next_num:03d}"
+    return max(numbers) + 1 if numbers else 1
+
+
+def generate_tag_id(db: Session, color_code: str) -> str:
+    """Generate the next available tag ID for a given color code."""
+    return f"{color_code}-{_next_tag_number(db, color_code):03d}"
+
+
+def lock_tag_allocation(db: Session) -> None:
+    """Serialize tag allocation and lamb registration until the caller's transaction ends.
+
+    Uses a transaction-scoped advisory lock on Postgres; a no-op elsewhere.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": TAG_ALLOCATION_LOCK_KEY})
+
+
+def allocate_tag_ids(db: Session, color_code: str, count: int) -> List[str]:
+    """Reserve the next ``count`` tag IDs for a color code in the caller's transaction.
+
+    On Postgres a transaction-scoped advisory lock serializes allocations
+    until commit, so concurrent writers never hand out the same tags.
+    """
+    lock_tag_allocation(db)
+    next_num = _next_tag_number(db, color_code)
+    return [f"{color_code}-{num:03d}" for num in range(next_num, next_num + count)]
 
 
 def check_inbreeding(db: Session, ram_id: str, ewe_id: str, generations: int = 3) -> bool:
@@ -0,0 +1,79 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models.change_log import ChangeLogEntry
+from app.db.tenancy import current_farm_id
+from app.services.changes import ChangeEntity
+
+
+class SheepIndexBase(ABC):
+    """Base for per-process in-memory indexes over the sheep table.
+
+    The index is loaded once and then kept warm from the change log: each
+    sync compares the latest change log id with the one the index was built
+    at and reloads only the sheep written since. Writes made by any worker
+    process therefore invalidate the affected entries everywhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cursor: Optional[int] = None
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Drop all entries before a full load."""
+
+    @abstractmethod
+    def _forget(self, tag_id: str) -> None:
+        """Drop the entries of one sheep."""
+
+    @abstractmethod
+    def _load(self, db: Session, tag_ids: Optional[List[str]] = None) -> None:
+        """Load entries for the given sheep, or for every sheep after a reset."""
+
+    def sync(self, db: Session) -> None:
+        """Bring the index up to date with the latest committed sheep writes."""
+        cursor = db.query(func.max(ChangeLogEntry.id)).scalar() or 0
+        if cursor == self._cursor:
+            return
+        with self._lock:
+            if self._cursor is None or cursor < self._cursor:
+                self._reset()
+                self._load(db)
+            elif cursor > self._cursor:
+                changed = [
+                    tag_id for (tag_id,) in db.query(ChangeLogEntry.entity_id).filter(
+                        ChangeLogEntry.id > self._cursor,
+                        ChangeLogEntry.id <= cursor,
+                        ChangeLogEntry.entity == ChangeEntity.SHEEP
+                    ).distinct().all()
+                ]
+                if changed:
+                    for tag_id in changed:
+                        self._forget(tag_id)
+                    self._load(db, changed)
+            self._cursor = cursor
+
+    def invalidate(self) -> None:
+        """Drop the index so the next sync reloads it in full."""
+        with self._lock:
+            self._cursor = None
+
+
+class FarmIndexes:
+    """One in-memory index per farm, since a farm-scoped session only loads its own sheep."""
+
+    def __init__(self, factory: Callable[[], SheepIndexBase]):
+        self._factory = factory
+        self._indexes: Dict[Optional[int], SheepIndexBase] = {}
+        self._lock = threading.Lock()
+
+    def for_session(self, db: Session) -> SheepIndexBase:
+        """The index of the farm the session is scoped to."""
+        farm_id = current_farm_id(db)
+        with self._lock:
+            if farm_id not in self._indexes:
+                self._indexes[farm_id] = self._factory()
+            return self._indexes[farm_id]
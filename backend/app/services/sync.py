@@ -0,0 +1,71 @@
+from typing import Dict, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models.change_log import ChangeLogEntry, ChangeOperation
+from app.db.models.health_event import HealthEvent
+from app.db.models.sheep import Sheep
+from app.schemas.sync import SyncChangesResponse, SyncDeletions
+from app.services.changes import ChangeEntity
+
+
+class CursorExpiredError(Exception):
+    """The requested cursor points at changes that have already been pruned."""
+
+
+def get_current_cursor(db: Session) -> int:
+    """Get the cursor of the most recent change."""
+    return db.query(func.max(ChangeLogEntry.id)).scalar() or 0
+
+
+def get_changes(db: Session, since: int, limit: int) -> SyncChangesResponse:
+    """Get the records changed after a cursor, one compact batch at a time.
+
+    Several changes to the same record within a batch collapse to its latest
+    state, and each entity type is fetched with a single IN query, so the
+    cost is proportional to the number of changed records.
+    """
+    oldest = db.query(func.min(ChangeLogEntry.id)).scalar()
+    if oldest is not None and since < oldest - 1:
+        raise CursorExpiredError(f"Cursor {since} has expired; a full sync is required")
+
+    entries = db.query(
+        ChangeLogEntry.id,
+        ChangeLogEntry.entity,
+        ChangeLogEntry.entity_id,
+        ChangeLogEntry.operation
+    ).filter(ChangeLogEntry.id > since).order_by(ChangeLogEntry.id).limit(limit).all()
+
+    latest: Dict[Tuple[str, str], str] = {}
+    for _, entity, entity_id, operation in entries:
+        latest[(entity, entity_id)] = operation
+
+    def ids(entity: str, operation: str):
+        return [entity_id for (e, entity_id), op in latest.items() if e == entity and op == operation]
+
+    deleted = SyncDeletions(
+        sheep=ids(ChangeEntity.SHEEP, ChangeOperation.DELETE),
+        health_events=[int(i) for i in ids(ChangeEntity.HEALTH_EVENT, ChangeOperation.DELETE)]
+    )
+
+    sheep = []
+    sheep_ids = ids(ChangeEntity.SHEEP, ChangeOperation.UPSERT)
+    if sheep_ids:
+        sheep = db.query(Sheep).filter(Sheep.tag_id.in_(sheep_ids)).all()
+        # Rows deleted after this batch's last entry are reported as tombstones
+        found = {s.tag_id for s in sheep}
+        deleted.sheep.extend(i for i in sheep_ids if i not in found)
+
+    events = []
+    event_ids = [int(i) for i in ids(ChangeEntity.HEALTH_EVENT, ChangeOperation.UPSERT)]
+    if event_ids:
+        events = db.query(HealthEvent).filter(HealthEvent.id.in_(event_ids)).all()
+        found = {e.id for e in events}
+        deleted.health_events.extend(i for i in event_ids if i not in found)
+
+    return SyncChangesResponse(
+        cursor=entries[-1].id if entries else since,
+        has_more=len(entries) == limit,
+        sheep=sheep,
+        health_events=events,
+        deleted=deleted
+    )
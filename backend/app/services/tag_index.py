@@ -0,0 +1,49 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.db.models.sheep import Sheep
+from app.services.sheep_index import FarmIndexes, SheepIndexBase
+
+
+class TagCodeIndex(SheepIndexBase):
+    """In-memory RFID/QR code -> tag_id hash index."""
+
+    def __init__(self):
+        super().__init__()
+        self._rfid: Dict[str, str] = {}
+        self._qr: Dict[str, str] = {}
+        self._codes: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def _reset(self) -> None:
+        self._rfid, self._qr, self._codes = {}, {}, {}
+
+    def _forget(self, tag_id: str) -> None:
+        rfid_code, qr_code = self._codes.pop(tag_id, (None, None))
+        if rfid_code and self._rfid.get(rfid_code) == tag_id:
+            del self._rfid[rfid_code]
+        if qr_code and self._qr.get(qr_code) == tag_id:
+            del self._qr[qr_code]
+
+    def _load(self, db: Session, tag_ids: Optional[List[str]] = None) -> None:
+        query = db.query(Sheep.tag_id, Sheep.rfid_code, Sheep.qr_code)
+        if tag_ids is None:
+            query = query.filter((Sheep.rfid_code.isnot(None)) | (Sheep.qr_code.isnot(None)))
+        else:
+            query = query.filter(Sheep.tag_id.in_(tag_ids))
+        for tag_id, rfid_code, qr_code in query.all():
+            self._codes[tag_id] = (rfid_code, qr_code)
+            if rfid_code:
+                self._rfid[rfid_code] = tag_id
+            if qr_code:
+                self._qr[qr_code] = tag_id
+
+    def lookup(self, codes: Iterable[str]) -> Dict[str, str]:
+        """Map each known code to a tag ID, preferring RFID over QR matches."""
+        found = {}
+        for code in codes:
+            tag_id = self._rfid.get(code) or self._qr.get(code)
+            if tag_id:
+                found[code] = tag_id
+        return found
+
+
+tag_code_index = FarmIndexes(TagCodeIndex)
@@ -0,0 +1,70 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Set
+from PIL import Image
+from app.core.config import settings
+from app.services.attachments import object_path, thumbnail_path
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: Set[str] = set()
+_lock = threading.Lock()
+
+
+def render_thumbnail(source: str, target: str, size: int) -> str:
+    """Render a JPEG thumbnail; runs inside a worker process."""
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with Image.open(source) as image:
+        image.thumbnail((size, size))
+        image.convert("RGB").save(tmp, "JPEG", quality=80)
+    os.replace(tmp, target)
+    return target
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.THUMBNAIL_WORKERS)
+    return _executor
+
+
+def request_thumbnail(sha256: str, content_type: str) -> bool:
+    """Queue thumbnail generation for an image unless it exists or is already queued.
+
+    Returns whether a thumbnail exists or is on its way.
+    """
+    if not content_type.startswith("image/"):
+        return False
+    target = thumbnail_path(sha256)
+    if target.exists():
+        return True
+
+    with _lock:
+        if sha256 in _pending:
+            return True
+        _pending.add(sha256)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    future = _get_executor().submit(
+        render_thumbnail, str(object_path(sha256)), str(target), settings.THUMBNAIL_SIZE
+    )
+
+    def done(f):
+        with _lock:
+            _pending.discard(sha256)
+        if f.exception():
+            logger.error(f"Thumbnail generation failed for {sha256}: {f.exception()}")
+
+    future.add_done_callback(done)
+    return True
+
+
+def shutdown_thumbnail_workers() -> None:
+    """Stop the thumbnail worker pool."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,8 @@
+"""HTTP load-testing harness for the API.
+
+Usage: python -m loadtest --scenario morning_dashboard --users 20 --duration 60 --start-app
+
+Runs named scenarios of simulated users against the API, reports throughput
+and latency percentiles per request, and exits with status 1 when a run
+regresses past the baselines stored in loadtest/baselines.json.
+"""
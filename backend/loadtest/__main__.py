@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+import httpx
+from loadtest.runner import compare_to_baseline, run_scenario
+from loadtest.scenarios import SCENARIOS
+
+DEFAULT_BASELINES = Path(__file__).parent / "baselines.json"
+
+
+def start_app(port: int) -> subprocess.Popen:
+    """Start the API under uvicorn and wait until it answers."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=Path(__file__).resolve().parent.parent
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with status {process.returncode} during start-up")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1.0)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("API did not start within 30 seconds")
+
+
+def print_report(result: dict) -> None:
+    overall = result["overall"]
+    print(f"\n== {result['scenario']}: {result['users']} users, {result['duration_s']}s ==")
+    print(
+        f"{overall['requests']} requests, {overall['throughput_rps']} req/s, "
+        f"errors {overall['error_rate']:.2%}, shed {overall['shed_rate']:.2%}"
+    )
+    print(f"p50 {overall['p50_ms']} ms  p95 {overall['p95_ms']} ms  p99 {overall['p99_ms']} ms  max {overall['max_ms']} ms")
+    peak = max(result["histogram"].values()) or 1
+    for bucket, count in result["histogram"].items():
+        print(f"  {bucket:>9} {count:>7} {'#' * round(40 * count / peak)}")
+    print(f"  {'request':<32} {'count':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>6}")
+    for label, stats in result["requests"].items():
+        print(
+            f"  {label:<32} {stats['requests']:>7} {stats['throughput_rps']:>8} {stats['p50_ms']:>8} "
+            f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['error_rate']:>6.1%}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the API with scripted user scenarios.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default all)")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--flock-size", type=int, default=500, help="Test sheep seeded before the run")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="API to test")
+    parser.add_argument("--start-app", action="store_true", help="Start the API locally for the run")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --start-app")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the seeded test sheep afterwards")
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed fractional regression")
+    parser.add_argument("--update-baselines", action="store_true", help="Store this run as the new baselines")
+    parser.add_argument("--output", help="Also write the full results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    base_url = args.base_url
+    if args.start_app:
+        process = start_app(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    results = []
+    try:
+        for name in args.scenario or sorted(SCENARIOS):
+            result = asyncio.run(run_scenario(
+                base_url, SCENARIOS[name], args.users, args.duration, args.flock_size, args.warmup, args.cleanup
+            ))
+            print_report(result)
+            results.append(result)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baselines = json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    if args.update_baselines:
+        for result in results:
+            baselines[result["scenario"]] = {
+                "users": result["users"],
+                "overall": result["overall"],
+                "requests": result["requests"],
+            }
+        args.baselines.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"\nBaselines written to {args.baselines}")
+        return 0
+
+    failed = False
+    for result in results:
+        baseline = baselines.get(result["scenario"])
+        if baseline is None:
+            print(f"\n{result['scenario']}: no baseline stored, run with --update-baselines to record one")
+            continue
+        if baseline.get("users") != result["users"]:
+            print(f"\n{result['scenario']}: baseline was recorded with {baseline.get('users')} users, comparing anyway")
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        if regressions:
+            failed = True
+            print(f"\n{result['scenario']}: REGRESSED")
+            for regression in regressions:
+                print(f"  {regression}")
+        else:
+            print(f"\n{result['scenario']}: within {args.tolerance:.0%} of baseline")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import asyncio
+import bisect
+import random
+import time
+from typing import Dict, List, Optional
+import httpx
+from loadtest.scenarios import API, Flock, Scenario
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+
+# Responses from admission control shedding load, counted apart from errors
+SHED_STATUSES = {429, 503}
+
+
+class LatencyRecorder:
+    """Latencies and outcomes of one request label."""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.shed = 0
+
+    def record(self, latency_ms: float, status: Optional[int]) -> None:
+        if status is None or (status >= 400 and status not in SHED_STATUSES):
+            self.errors += 1
+        elif status in SHED_STATUSES:
+            self.shed += 1
+        bisect.insort(self.latencies_ms, latency_ms)
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        self.latencies_ms = sorted(self.latencies_ms + other.latencies_ms)
+        self.errors += other.errors
+        self.shed += other.shed
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        index = min(int(round(p / 100 * (len(self.latencies_ms) - 1))), len(self.latencies_ms) - 1)
+        return self.latencies_ms[index]
+
+    def histogram(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        lower = 0
+        for upper in HISTOGRAM_BUCKETS_MS + [float("inf")]:
+            count = bisect.bisect_right(self.latencies_ms, upper) - bisect.bisect_right(self.latencies_ms, lower)
+            label = f"<={upper}ms" if upper != float("inf") else f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+            counts[label] = count
+            lower = upper
+        return counts
+
+    def summary(self, duration: float) -> dict:
+        requests = len(self.latencies_ms)
+        return {
+            "requests": requests,
+            "throughput_rps": round(requests / duration, 2) if duration else 0.0,
+            "error_rate": round(self.errors / requests, 4) if requests else 0.0,
+            "shed_rate": round(self.shed / requests, 4) if requests else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.latencies_ms[-1], 2) if requests else 0.0,
+        }
+
+
+async def seed_flock(client: httpx.AsyncClient, flock: Flock) -> None:
+    """Create the test sheep; ones left by an earlier run are kept."""
+    semaphore = asyncio.Semaphore(10)
+
+    async def create(payload):
+        async with semaphore:
+            response = await client.post(f"{API}/sheep/", json=payload)
+            # 400 means the tag already exists
+            if response.status_code >= 500:
+                response.raise_for_status()
+
+    await asyncio.gather(*(create(payload) for payload in flock.payloads()))
+
+
+async def cleanup_flock(client: httpx.AsyncClient, flock: Flock) -> None:
+    for tag_id in flock.tags:
+        await client.delete(f"{API}/sheep/{tag_id}")
+
+
+async def _user(client, scenario: Scenario, flock: Flock, deadline: float, recorders: Dict[str, LatencyRecorder]):
+    # Stagger start-up so users don't fire in lock step
+    await asyncio.sleep(random.uniform(0, scenario.think_time))
+    while time.monotonic() < deadline:
+        step = scenario.next_step()
+        started = time.perf_counter()
+        label = step.__name__
+        try:
+            label, response = await step(client, flock)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        latency_ms = (time.perf_counter() - started) * 1000
+        recorders.setdefault(label, LatencyRecorder()).record(latency_ms, status)
+        await asyncio.sleep(random.expovariate(1 / scenario.think_time) if scenario.think_time else 0)
+
+
+async def run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    users: int,
+    duration: float,
+    flock_size: int,
+    warmup: float = 5.0,
+    cleanup: bool = False,
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> dict:
+    """Run one scenario with ``users`` concurrent simulated users and summarise the results.
+
+    Requests issued during the warm-up period are not counted. A transport,
+    e.g. httpx.ASGITransport, replaces the network connection to base_url.
+    """
+    flock = Flock(flock_size)
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits, transport=transport) as client:
+        await seed_flock(client, flock)
+
+        if warmup:
+            await asyncio.gather(*(
+                _user(client, scenario, flock, time.monotonic() + warmup, {}) for _ in range(users)
+            ))
+
+        recorders: Dict[str, LatencyRecorder] = {}
+        started = time.monotonic()
+        await asyncio.gather(*(
+            _user(client, scenario, flock, started + duration, recorders) for _ in range(users)
+        ))
+        elapsed = time.monotonic() - started
+
+        if cleanup:
+            await cleanup_flock(client, flock)
+
+    total = LatencyRecorder()
+    for recorder in recorders.values():
+        total.merge(recorder)
+    return {
+        "scenario": scenario.name,
+        "users": users,
+        "duration_s": round(elapsed, 1),
+        "overall": total.summary(elapsed),
+        "histogram": total.histogram(),
+        "requests": {label: recorders[label].summary(elapsed) for label in sorted(recorders)},
+    }
+
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Describe each way ``result`` is worse than ``baseline`` by more than ``tolerance``."""
+    regressions = []
+
+    def check(label: str, current: dict, expected: dict):
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if key in expected and current[key] > expected[key] * (1 + tolerance):
+                regressions.append(f"{label} {key}: {current[key]} > baseline {expected[key]}")
+        if "throughput_rps" in expected and current["throughput_rps"] < expected["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{label} throughput_rps: {current['throughput_rps']} < baseline {expected['throughput_rps']}")
+        if "error_rate" in expected and current["error_rate"] > expected["error_rate"] + 0.01:
+            regressions.append(f"{label} error_rate: {current['error_rate']} > baseline {expected['error_rate']}")
+
+    check("overall", result["overall"], baseline.get("overall", {}))
+    for label, expected in baseline.get("requests", {}).items():
+        if label in result["requests"]:
+            check(label, result["requests"][label], expected)
+    return regressions
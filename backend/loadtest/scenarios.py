@@ -0,0 +1,176 @@
+import random
+import zlib
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+import httpx
+
+API = "/api/v1"
+SEED_PREFIX = "LT"
+
+# A step issues one request and returns (label, response); labels group latencies
+Step = Callable[[httpx.AsyncClient, "Flock"], Awaitable[Tuple[str, httpx.Response]]]
+
+
+class Flock:
+    """Test sheep seeded before a run, shared by all simulated users."""
+
+    def __init__(self, size: int):
+        self.ewes = [f"{SEED_PREFIX}-E{i:05d}" for i in range(size - size // 10)]
+        self.rams = [f"{SEED_PREFIX}-R{i:05d}" for i in range(size // 10)]
+        self.lambs = 0
+
+    @property
+    def tags(self) -> List[str]:
+        return self.ewes + self.rams
+
+    @staticmethod
+    def rfid(tag_id: str) -> str:
+        return f"982{zlib.crc32(tag_id.encode()):012d}"
+
+    def payloads(self) -> List[dict]:
+        today = date.today()
+        return [
+            {
+                "tag_id": tag_id,
+                "breed": "Katahdin",
+                "sex": "male" if tag_id in self.rams else "female",
+                "date_of_birth": (today - timedelta(days=400 + i % 1500)).isoformat(),
+                "rfid_code": self.rfid(tag_id),
+                "notes": "load test",
+            }
+            for i, tag_id in enumerate(self.tags)
+        ]
+
+
+async def list_active_sheep(client, flock):
+    return "GET /sheep", await client.get(f"{API}/sheep/", params={"status": "active"})
+
+
+async def read_notifications(client, flock):
+    return "GET /notifications", await client.get(f"{API}/notifications/")
+
+
+async def read_health_notifications(client, flock):
+    return "GET /notifications/health", await client.get(f"{API}/notifications/health")
+
+
+async def list_overdue_events(client, flock):
+    return "GET /health-events/overdue", await client.get(f"{API}/health-events/overdue/")
+
+
+async def read_sheep(client, flock):
+    return "GET /sheep/{tag_id}", await client.get(f"{API}/sheep/{random.choice(flock.tags)}")
+
+
+async def list_sheep_events(client, flock):
+    params = {"sheep_id": random.choice(flock.tags)}
+    return "GET /health-events", await client.get(f"{API}/health-events/", params=params)
+
+
+async def record_checkup(client, flock):
+    event = {
+        "sheep_id": random.choice(flock.ewes),
+        "event_date": date.today().isoformat(),
+        "event_type": "checkup",
+        "details": "Post-lambing check",
+    }
+    return "POST /health-events", await client.post(f"{API}/health-events/", json=event)
+
+
+async def register_lamb(client, flock):
+    flock.lambs += 1
+    lamb = {
+        "tag_id": f"{SEED_PREFIX}-L{random.randrange(10**6):06d}{flock.lambs % 100:02d}",
+        "breed": "Katahdin",
+        "sex": random.choice(["male", "female"]),
+        "date_of_birth": date.today().isoformat(),
+        "dam_id": random.choice(flock.ewes),
+        "sire_id": random.choice(flock.rams) if flock.rams else None,
+        "notes": "load test",
+    }
+    return "POST /sheep", await client.post(f"{API}/sheep/", json=lamb)
+
+
+async def update_ewe_notes(client, flock):
+    tag_id = random.choice(flock.ewes)
+    return "PUT /sheep/{tag_id}", await client.put(f"{API}/sheep/{tag_id}", json={"notes": "lambed"})
+
+
+async def resolve_chute_batch(client, flock):
+    codes = [flock.rfid(tag_id) for tag_id in random.sample(flock.tags, min(25, len(flock.tags)))]
+    return "POST /sheep/resolve", await client.post(f"{API}/sheep/resolve", json={"codes": codes})
+
+
+async def autocomplete_tag(client, flock):
+    prefix = random.choice(flock.tags)[:6]
+    return "GET /sheep/search/autocomplete", await client.get(f"{API}/sheep/search/autocomplete", params={"prefix": prefix})
+
+
+async def record_treatment(client, flock):
+    event = {
+        "sheep_id": random.choice(flock.tags),
+        "event_date": date.today().isoformat(),
+        "event_type": "treatment",
+        "details": "Drench at chute",
+        "next_due_date": (date.today() + timedelta(days=21)).isoformat(),
+    }
+    return "POST /health-events", await client.post(f"{API}/health-events/", json=event)
+
+
+class Scenario:
+    """A weighted mix of steps, each simulated user picking one per iteration.
+
+    ``think_time`` is the mean pause in seconds between a user's requests.
+    """
+
+    def __init__(self, name: str, description: str, steps: Dict[Step, int], think_time: float):
+        self.name = name
+        self.description = description
+        self.steps = list(steps)
+        self.weights = list(steps.values())
+        self.think_time = think_time
+
+    def next_step(self) -> Step:
+        return random.choices(self.steps, self.weights)[0]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(
+            "morning_dashboard",
+            "Office dashboards loading the flock, notifications and overdue treatments",
+            {
+                list_active_sheep: 3,
+                read_notifications: 3,
+                read_health_notifications: 2,
+                list_overdue_events: 2,
+                read_sheep: 1,
+            },
+            think_time=1.0,
+        ),
+        Scenario(
+            "lambing_season",
+            "Shepherds registering lambs and recording checkups in the barn",
+            {
+                register_lamb: 3,
+                record_checkup: 3,
+                update_ewe_notes: 2,
+                read_sheep: 2,
+                list_sheep_events: 1,
+            },
+            think_time=2.0,
+        ),
+        Scenario(
+            "chute_scanning",
+            "Chute readers resolving RFID batches and recording treatments",
+            {
+                resolve_chute_batch: 5,
+                read_sheep: 3,
+                record_treatment: 2,
+                autocomplete_tag: 1,
+            },
+            think_time=0.2,
+        ),
+    ]
+}
@@ -0,0 +1,107 @@
+import os
+import tempfile
+
+# Tests run against a throwaway SQLite database; set before app modules
+# create their engines
+_db_dir = tempfile.mkdtemp(prefix="kamureito-tests-")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_db_dir, 'primary.db')}"
+os.environ.setdefault("SLOW_QUERY_LOG_ENABLED", "false")
+os.environ.setdefault("BACKEND_CORS_ORIGINS", '["http://farm.example"]')
+os.environ.setdefault("ATTACHMENT_STORAGE_DIR", os.path.join(_db_dir, "attachments"))
+os.environ.setdefault("PROFILE_STORAGE_DIR", os.path.join(_db_dir, "profiles"))
+
+import importlib.util
+from datetime import date
+from pathlib import Path
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from fastapi.testclient import TestClient
+from app.db.base import Base
+from app.db.models.farm import Farm
+from app.db.models.sheep import Sheep, SheepSex, SheepStatus
+from app.db.session import FarmRoute, SessionLocal, engine, farm_session, invalidate_farm_routes
+from app.main import app
+from app.services.pedigree_index import pedigree_index
+from app.services.search_index import sheep_search_index
+from app.services.tag_index import tag_code_index
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Every test starts from empty tables."""
+    Base.metadata.create_all(bind=engine)
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    invalidate_farm_routes()
+    # SQLite reuses change log ids once the table is empty, which would make
+    # a warm index look current
+    for indexes in (pedigree_index, sheep_search_index, tag_code_index):
+        indexes._indexes.clear()
+
+
+@pytest.fixture
+def farm() -> FarmRoute:
+    """The default farm every request falls back to."""
+    with SessionLocal() as db:
+        db.add(Farm(id=1, code="default", name="Default farm"))
+        db.commit()
+    invalidate_farm_routes()
+    return FarmRoute(1, "default", None, None)
+
+
+@pytest.fixture
+def db(farm):
+    session = farm_session(farm)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(farm):
+    return TestClient(app)
+
+
+@pytest.fixture
+def add_sheep(db):
+    """Insert sheep directly, bypassing create_sheep's validation."""
+    def add(tag_id, sex=SheepSex.FEMALE, sire_id=None, dam_id=None, **fields):
+        fields.setdefault("breed", "Merino")
+        fields.setdefault("date_of_birth", date(2022, 3, 1))
+        fields.setdefault("status", SheepStatus.ACTIVE)
+        sheep = Sheep(tag_id=tag_id, sex=sex, sire_id=sire_id, dam_id=dam_id, **fields)
+        db.add(sheep)
+        db.commit()
+        return sheep
+    return add
+
+
+def _load_migration(revision: str):
+    versions = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+    [path] = versions.glob(f"{revision}_*.py")
+    spec = importlib.util.spec_from_file_location(f"migration_{revision}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def load_migration():
+    """Import a migration module by revision, for testing its helpers."""
+    return _load_migration
+
+
+@pytest.fixture
+def migrate():
+    """Run one migration's upgrade() or downgrade() against the test database."""
+    def run(revision: str, direction: str = "upgrade"):
+        module = _load_migration(revision)
+        with engine.begin() as connection:
+            with Operations.context(MigrationContext.configure(connection)):
+                getattr(module, direction)()
+        return module
+    return run
@@ -0,0 +1,25 @@
+from app.core.admission import AdmissionPool, admission_controller, pool_limits
+from app.core.config import settings
+
+
+def test_default_pool_gets_the_connections_left_over(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 8)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 4)
+    monkeypatch.setattr(settings, "ADMISSION_POOLS", {"heavy": 3})
+
+    assert pool_limits() == {"heavy": 3, "default": 9}
+
+
+def test_configured_default_pool_is_kept(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_POOLS", {"default": 20, "heavy": 3})
+
+    assert pool_limits() == {"default": 20, "heavy": 3}
+
+
+def test_shed_requests_carry_cors_headers(client, monkeypatch):
+    monkeypatch.setitem(admission_controller.pools, "default", AdmissionPool("default", 0, 0, 0.0))
+
+    response = client.get(f"{settings.API_V1_STR}/jobs/", headers={"Origin": "http://farm.example"})
+
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == "http://farm.example"
@@ -0,0 +1,71 @@
+from datetime import date
+from app.db.models.archive import AttachmentArchive, HealthEventArchive, SectionAssignmentArchive, SheepArchive
+from app.db.models.attachment import Attachment
+from app.db.models.farm import Farm
+from app.db.models.health_event import EventType, HealthEvent
+from app.db.models.section_assignment import SectionAssignment
+from app.db.models.sheep import Sheep, SheepSection, SheepStatus
+from app.db.session import FarmRoute, SessionLocal, farm_session
+from app.services.archive import archive_inactive_sheep, archive_old_health_events, restore_sheep
+
+CUTOFF = date(2024, 1, 1)
+
+
+def add_history(db, tag_id, event_date=date(2022, 5, 1)):
+    db.add(SectionAssignment(sheep_id=tag_id, section=SheepSection.GENERAL, start_date=date(2020, 3, 1)))
+    event = HealthEvent(sheep_id=tag_id, event_date=event_date, event_type=EventType.CHECKUP, details="Fine")
+    db.add(event)
+    db.flush()
+    db.add(Attachment(
+        health_event_id=event.id, sha256="a" * 64, filename="scan.txt", content_type="text/plain", size=3
+    ))
+    db.commit()
+    return event.id
+
+
+def test_archive_and_restore_a_sheep_with_its_history(db, add_sheep):
+    add_sheep("EWE-1", status=SheepStatus.SOLD, sale_date=date(2022, 6, 1))
+    add_sheep("EWE-2")
+    event_id = add_history(db, "EWE-1")
+    add_history(db, "EWE-2")
+
+    assert archive_inactive_sheep(db, CUTOFF) == 1
+
+    assert [tag for (tag,) in db.query(Sheep.tag_id)] == ["EWE-2"]
+    assert [tag for (tag,) in db.query(SheepArchive.tag_id)] == ["EWE-1"]
+    assert [e.id for e in db.query(HealthEventArchive)] == [event_id]
+    assert db.query(SectionAssignmentArchive).count() == 1
+    assert [a.health_event_id for a in db.query(AttachmentArchive)] == [event_id]
+    assert db.query(HealthEvent).count() == db.query(Attachment).count() == 1
+    assert db.query(SheepArchive.archived_at).scalar() is not None
+
+    restored = restore_sheep(db, "EWE-1")
+
+    assert restored.tag_id == "EWE-1"
+    assert restored.status == SheepStatus.SOLD
+    assert db.query(SheepArchive).count() == db.query(HealthEventArchive).count() == 0
+    assert db.query(SectionAssignmentArchive).count() == db.query(AttachmentArchive).count() == 0
+    assert db.query(HealthEvent).filter(HealthEvent.id == event_id).count() == 1
+    assert db.query(Attachment).filter(Attachment.health_event_id == event_id).count() == 1
+
+
+def test_archival_only_moves_the_session_farms_rows(db, add_sheep):
+    with SessionLocal() as registry:
+        registry.add(Farm(id=2, code="north", name="North"))
+        registry.commit()
+    north = farm_session(FarmRoute(2, "north", None, None))
+    try:
+        north.add(Sheep(tag_id="N-1", breed="Merino", sex="female", date_of_birth=date(2020, 3, 1)))
+        north.commit()
+        add_history(north, "N-1")
+        add_sheep("EWE-1")
+        add_history(db, "EWE-1")
+        add_history(db, "EWE-1", event_date=date(2024, 5, 1))
+
+        assert archive_old_health_events(db, CUTOFF) == 1
+
+        assert [sheep_id for (sheep_id,) in db.query(HealthEventArchive.sheep_id)] == ["EWE-1"]
+        assert north.query(HealthEvent).count() == north.query(Attachment).count() == 1
+        assert db.query(HealthEvent).count() == 1
+    finally:
+        north.close()
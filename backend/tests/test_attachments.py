@@ -0,0 +1,135 @@
+import asyncio
+from datetime import date
+import pytest
+from sqlalchemy import text
+from app.db.models.archive import AttachmentArchive
+from app.db.models.attachment import Attachment
+from app.db.models.health_event import EventType, HealthEvent
+from app.db.session import SessionLocal
+from app.services.attachments import (
+    create_attachment,
+    delete_attachment,
+    object_path,
+    parse_range,
+    store_stream
+)
+
+CONTENT = b"0123456789" * 100
+
+
+@pytest.fixture
+def event(db, add_sheep):
+    add_sheep("EWE-1")
+    event = HealthEvent(sheep_id="EWE-1", event_date=date(2024, 5, 1), event_type=EventType.CHECKUP, details="Scan")
+    db.add(event)
+    db.commit()
+    return event
+
+
+def upload(client, event, content=CONTENT, filename="scan.txt"):
+    response = client.post(
+        "/api/v1/attachments/",
+        params={"health_event_id": event.id, "filename": filename},
+        content=content,
+        headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def stage(content=CONTENT):
+    async def chunks():
+        yield content
+    return asyncio.run(store_stream(chunks()))
+
+
+def test_upload_and_ranged_download(client, event):
+    attachment = upload(client, event)
+
+    full = client.get(f"/api/v1/attachments/{attachment['id']}")
+    ranged = client.get(f"/api/v1/attachments/{attachment['id']}", headers={"Range": "bytes=10-19"})
+
+    assert full.content == CONTENT
+    assert ranged.status_code == 206
+    assert ranged.content == CONTENT[10:20]
+    assert ranged.headers["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+
+
+def test_identical_uploads_share_one_object(client, event):
+    first = upload(client, event)
+    second = upload(client, event, filename="copy.txt")
+
+    assert first["sha256"] == second["sha256"]
+    client.delete(f"/api/v1/attachments/{first['id']}")
+    assert object_path(first["sha256"]).exists()
+
+    client.delete(f"/api/v1/attachments/{second['id']}")
+    assert not object_path(first["sha256"]).exists()
+
+
+def test_object_referenced_by_another_farm_is_kept(client, event):
+    attachment = upload(client, event)
+    with SessionLocal() as db:
+        db.execute(text("INSERT INTO farms (id, code, name) VALUES (2, 'north', 'North')"))
+        db.add(Attachment(
+            farm_id=2, health_event_id=event.id, sha256=attachment["sha256"],
+            size=len(CONTENT), filename="north.txt", content_type="text/plain"
+        ))
+        db.commit()
+
+    client.delete(f"/api/v1/attachments/{attachment['id']}")
+
+    assert object_path(attachment["sha256"]).exists()
+
+
+def test_object_referenced_by_an_archived_attachment_is_kept(db, client, event):
+    attachment = upload(client, event)
+    db.add(AttachmentArchive(
+        id=attachment["id"] + 1, health_event_id=event.id + 1, sha256=attachment["sha256"],
+        size=len(CONTENT), filename="old.txt", content_type="text/plain"
+    ))
+    db.commit()
+
+    client.delete(f"/api/v1/attachments/{attachment['id']}")
+
+    assert object_path(attachment["sha256"]).exists()
+
+
+def test_upload_racing_a_delete_still_gets_its_object(db, event):
+    existing = create_attachment(db, event.id, stage(), "first.txt", "text/plain")
+    staged = stage()
+
+    # The delete removes the object before the second upload is recorded
+    assert delete_attachment(db, existing.id)
+    assert not object_path(staged.sha256).exists()
+    attachment = create_attachment(db, event.id, staged, "second.txt", "text/plain")
+
+    assert object_path(attachment.sha256).read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("bytes=0-9", (0, 9)),
+    ("bytes=990-", (990, 999)),
+    ("bytes=-10", (990, 999)),
+    ("bytes=0-1,5-6", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+def test_unsatisfiable_range():
+    with pytest.raises(ValueError):
+        parse_range("bytes=1000-", 1000)
+
+
+def test_legacy_attachment_lists_move_into_details(db, event, migrate):
+    migrate("016", "downgrade")
+    with SessionLocal() as session:
+        session.execute(text("UPDATE health_events SET attachments = '[\"scan.pdf\"]'"))
+        session.commit()
+
+    migrate("016")
+
+    db.expire_all()
+    assert db.get(HealthEvent, event.id).details == 'Scan\n\nLegacy attachments: ["scan.pdf"]'
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.services import backup
+from app.services.backup import MANIFEST, backup_path, create_full_backup, prune_backups, read_manifest
+
+
+@pytest.fixture(autouse=True)
+def backup_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BACKUP_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _write_backup(name, status, started_at, kind="full"):
+    root = backup_path(name)
+    root.mkdir()
+    (root / MANIFEST).write_text(json.dumps({
+        "name": name, "type": kind, "status": status, "started_at": started_at.isoformat()
+    }))
+
+
+def test_failed_full_backup_keeps_its_directory(monkeypatch):
+    def refuse():
+        raise RuntimeError("connection refused")
+    monkeypatch.setattr(backup, "_snapshot_connection", refuse)
+
+    with pytest.raises(RuntimeError):
+        create_full_backup(jobs=1)
+
+    [root] = [path for path in backup_path("").iterdir() if path.is_dir()]
+    manifest = read_manifest(root.name)
+    assert manifest["status"] == "failed"
+    assert manifest["error"] == "connection refused"
+    assert backup.list_backups() == []
+
+
+def test_prune_removes_old_failed_backups():
+    now = datetime.utcnow()
+    _write_backup("full_old", "completed", now - timedelta(days=30))
+    _write_backup("full_new", "completed", now - timedelta(days=1))
+    _write_backup("full_failed_old", "failed", now - timedelta(days=30))
+    _write_backup("full_failed_new", "failed", now - timedelta(days=1))
+
+    assert prune_backups(retention_days=7) == ["full_failed_old", "full_old"]
+    assert sorted(p.name for p in backup_path("").iterdir()) == ["full_failed_new", "full_new"]
+
+
+def test_resumed_restore_skips_schema_entries_already_restored(monkeypatch):
+    _write_backup("full_x", "completed", datetime.utcnow())
+    manifest_path = backup_path("full_x") / MANIFEST
+    manifest_path.write_text(json.dumps({**json.loads(manifest_path.read_text()), "files": {}, "tables": {}}))
+    listings = {
+        "--section=pre-data": "; comment\n10; 2615 1 SCHEMA - farm\n11; 1259 2 TABLE public sheep\n",
+        "--section=data": "",
+    }
+    monkeypatch.setattr(backup, "_run", lambda args, database=None: listings.get(args[2], ""))
+    monkeypatch.setattr(backup, "_recreate_database", lambda database: None)
+    restored, fail_on = [], {"11; 1259 2 TABLE public sheep"}
+
+    def restore_item(dump, database, line, scratch):
+        if line in fail_on:
+            raise RuntimeError("interrupted")
+        restored.append(line)
+    monkeypatch.setattr(backup, "_restore_item", restore_item)
+
+    with pytest.raises(RuntimeError):
+        backup.restore_backup("full_x", "drill")
+    fail_on.clear()
+    backup.restore_backup("full_x", "drill", resume=True)
+
+    assert restored == ["10; 2615 1 SCHEMA - farm", "11; 1259 2 TABLE public sheep"]
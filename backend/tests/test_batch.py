@@ -0,0 +1,39 @@
+from app.db.models.sheep import Sheep
+
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+def test_batch_runs_operations_in_order(client):
+    response = client.post("/api/v1/batch/", json={"operations": [
+        {"id": "create", "method": "POST", "path": "/sheep/", "body": {"tag_id": "EWE-1", **SHEEP}},
+        {"id": "read", "path": "/sheep/EWE-1"},
+    ]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [200, 200]
+    assert results[1]["body"]["tag_id"] == "EWE-1"
+
+
+def test_failed_atomic_batch_stops_at_the_first_error(client, db):
+    response = client.post("/api/v1/batch/", json={"atomic": True, "operations": [
+        {"method": "POST", "path": "/sheep/", "body": {"tag_id": "EWE-1", **SHEEP}},
+        {"method": "GET", "path": "/sheep/MISSING"},
+        {"method": "POST", "path": "/sheep/", "body": {"tag_id": "EWE-2", **SHEEP}},
+    ]})
+
+    body = response.json()
+    assert body["rolled_back"] is True
+    assert [result["status"] for result in body["results"]] == [200, 404, 424]
+    # The sheep created before the failure was rolled back with the batch
+    assert client.get("/api/v1/sheep/EWE-1").status_code == 404
+    assert db.query(Sheep).count() == 0
+
+
+def test_atomic_batch_commits_together(client, db):
+    response = client.post("/api/v1/batch/", json={"atomic": True, "operations": [
+        {"method": "POST", "path": "/sheep/", "body": {"tag_id": f"EWE-{i}", **SHEEP}} for i in range(3)
+    ]})
+
+    assert response.json()["rolled_back"] is False
+    assert db.query(Sheep).count() == 3
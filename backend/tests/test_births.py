@@ -0,0 +1,54 @@
+from datetime import date
+import pytest
+from app.db.models.sheep import SheepSection, SheepSex, SheepStatus
+from app.schemas.birth import BirthRecordCreate, BulkBirthCreate, LambCreate
+from app.services.births import record_births
+from app.services.sections import get_section_history
+
+LAMBED = date(2025, 3, 10)
+
+
+@pytest.fixture
+def parents(add_sheep):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("EWE-1")
+    add_sheep("EWE-2")
+    add_sheep("EWE-3", status=SheepStatus.SOLD, sale_date=date(2025, 1, 15))
+
+
+def births(*ewe_ids, date_lambed=LAMBED):
+    return BulkBirthCreate(
+        births=[
+            BirthRecordCreate(
+                ewe_id=ewe_id, sire_id="RAM-1", date_lambed=date_lambed,
+                lambs=[LambCreate(sex=SheepSex.FEMALE), LambCreate(born_alive=False)]
+            )
+            for ewe_id in ewe_ids
+        ],
+        color_code="GRN"
+    )
+
+
+def test_registered_lambs_open_a_section_interval(db, parents):
+    recorded = record_births(db, births("EWE-1", "EWE-2"))
+
+    tags = [lamb.tag_id for record in recorded for lamb in record.lambs if lamb.tag_id]
+    assert sorted(tags) == ["GRN-001", "GRN-002"]
+    for tag_id in tags:
+        [interval] = get_section_history(db, tag_id)
+        assert (interval.section, interval.start_date, interval.end_date) == (SheepSection.GENERAL, LAMBED, None)
+
+
+def test_double_submitted_birth_is_rejected(db, parents):
+    record_births(db, births("EWE-1"))
+
+    with pytest.raises(ValueError, match="already lambed"):
+        record_births(db, births("EWE-1", date_lambed=date(2025, 3, 11)))
+
+
+def test_inactive_ewes_are_rejected(client, parents):
+    response = client.post("/api/v1/birth-records/bulk", json=births("EWE-1", "EWE-3").model_dump(mode="json"))
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Ewe with tag ID EWE-3 is sold"
+    assert client.get("/api/v1/birth-records/lamb-stats").json()[0]["lambs"] == 0
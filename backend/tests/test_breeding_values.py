@@ -0,0 +1,82 @@
+from datetime import date
+import numpy as np
+import pytest
+from app.db.models.birth_record import BirthRecord, BirthType, RearingType
+from app.db.models.breeding_value import BreedingTrait, EvaluationStatus, GeneticEvaluation
+from app.db.models.lamb import Lamb
+from app.db.models.sheep import SheepSex
+from app.services.breeding_values import (
+    _weaning_weight_records,
+    get_breeding_value_ranking,
+    run_evaluation,
+    solve_animal_model
+)
+from app.services.pedigree import index_pedigree, inverse_relationship_matrix, relationship_matrix
+
+PEDIGREE = {
+    "S1": (None, None),
+    "S2": (None, None),
+    "D1": (None, None),
+    "D2": (None, None),
+    "L1": ("S1", "D1"),
+    "L2": ("S1", "D2"),
+    "L3": ("S2", "D1"),
+    "L4": ("L1", "L3"),
+}
+
+
+def test_inverse_relationship_matrix_inverts_a():
+    ped = index_pedigree(PEDIGREE)
+    a = relationship_matrix(PEDIGREE, ped.order, ped.order)
+
+    a_inv = inverse_relationship_matrix(ped).toarray()
+
+    # Henderson's rules without inbreeding are exact here: no parent is inbred
+    assert np.allclose(a_inv @ a, np.eye(len(ped)), atol=1e-9)
+
+
+def test_offspring_inherit_half_their_sires_merit():
+    records = [("L1", "g", 30.0), ("L2", "g", 31.0), ("L3", "g", 20.0), ("L4", "g", 25.0)]
+
+    order, ebvs, own_records, _ = solve_animal_model(PEDIGREE, records, heritability=0.3)
+
+    ebv = dict(zip(order, ebvs))
+    assert ebv["S1"] > 0 > ebv["S2"]
+    assert dict(zip(order, own_records))["L1"] == 1
+
+
+@pytest.fixture
+def weaned(db, add_sheep):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("EWE-1")
+    add_sheep("EWE-2")
+    for tag in ("SINGLE", "TWIN-A", "TWIN-B"):
+        add_sheep(tag, SheepSex.MALE, sire_id="RAM-1")
+    for ewe_id, lambs, weight in (("EWE-1", ["SINGLE"], 32.0), ("EWE-2", ["TWIN-A", "TWIN-B"], 48.0)):
+        record = BirthRecord(
+            ewe_id=ewe_id, sire_id="RAM-1", date_lambed=date(2024, 3, 1),
+            birth_type=BirthType.SINGLE if len(lambs) == 1 else BirthType.TWIN,
+            rearing_type=RearingType.NATURAL, weaning_weight=weight
+        )
+        db.add(record)
+        db.flush()
+        for order, tag_id in enumerate(lambs, start=1):
+            db.add(Lamb(birth_record_id=record.id, birth_order=order, tag_id=tag_id, sex=SheepSex.MALE))
+    db.commit()
+
+
+def test_litter_weaning_weight_only_counts_for_single_lambs(db, weaned):
+    assert _weaning_weight_records(db) == [("SINGLE", "2024|single|natural|male", 32.0)]
+
+
+def test_run_evaluation_stores_ranked_values(db, weaned):
+    evaluation = GeneticEvaluation(trait=BreedingTrait.WEANING_WEIGHT, status=EvaluationStatus.PENDING)
+    db.add(evaluation)
+    db.commit()
+
+    finished = run_evaluation(evaluation.id)
+
+    assert finished.status == EvaluationStatus.COMPLETED
+    assert finished.records == 1
+    ranking = get_breeding_value_ranking(db, BreedingTrait.WEANING_WEIGHT)
+    assert len(ranking) == finished.animals
@@ -0,0 +1,82 @@
+import json
+import msgpack
+import pytest
+from app.core.encoding import (
+    COLUMNAR_JSON,
+    COLUMNAR_MSGPACK,
+    JSON,
+    MSGPACK,
+    negotiate_media_type,
+    to_columns
+)
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON),
+    ("*/*", JSON),
+    ("application/msgpack", MSGPACK),
+    ("application/x-msgpack", MSGPACK),
+    ("application/json;q=0.5, application/msgpack", MSGPACK),
+    ("application/msgpack;q=0.2, application/json;q=0.9", JSON),
+    (f"{COLUMNAR_MSGPACK}, {COLUMNAR_JSON}", COLUMNAR_MSGPACK),
+    ("application/msgpack;q=0, */*;q=0.1", JSON),
+    ("text/html", JSON),
+    ("application/msgpack;q=abc", JSON),
+])
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_repetitive_string_columns_are_dictionary_encoded():
+    rows = [{"tag_id": f"EWE-{i}", "breed": "Merino" if i % 3 else "Dorper", "notes": None} for i in range(6)]
+
+    columns = to_columns(rows, ["tag_id", "breed", "notes"])
+
+    assert columns["count"] == 6
+    assert columns["columns"] == ["tag_id", "breed", "notes"]
+    tags, breeds, notes = columns["data"]
+    assert tags == [f"EWE-{i}" for i in range(6)]
+    assert columns["dictionaries"] == {"breed": ["Dorper", "Merino"]}
+    assert [columns["dictionaries"]["breed"][code] for code in breeds] == [row["breed"] for row in rows]
+    assert notes == [None] * 6
+
+
+@pytest.fixture
+def flock(add_sheep):
+    for i in range(5):
+        add_sheep(f"EWE-{i}")
+
+
+def test_list_is_plain_json_by_default(client, flock):
+    response = client.get("/api/v1/sheep/")
+
+    assert response.headers["content-type"] == JSON
+    assert response.headers["vary"] == "Accept"
+    assert len(response.json()) == 5
+
+
+def test_msgpack_carries_the_json_rows(client, flock):
+    rows = client.get("/api/v1/sheep/").json()
+
+    response = client.get("/api/v1/sheep/", headers={"Accept": MSGPACK})
+
+    assert response.headers["content-type"] == MSGPACK
+    assert response.headers["vary"] == "Accept"
+    assert msgpack.unpackb(response.content) == rows
+    assert len(response.content) < len(json.dumps(rows))
+
+
+def test_columnar_json_rebuilds_the_rows(client, flock):
+    rows = client.get("/api/v1/sheep/").json()
+
+    columns = client.get("/api/v1/sheep/", headers={"Accept": COLUMNAR_JSON}).json()
+
+    rebuilt = [
+        {
+            field: columns["dictionaries"][field][value]
+            if field in columns["dictionaries"] and value is not None else value
+            for field, value in zip(columns["columns"], values)
+        }
+        for values in zip(*columns["data"])
+    ]
+    assert rebuilt == rows
@@ -0,0 +1,68 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.core.jobs import JobCancelled, fail_expired_jobs, run_job
+from app.db.models.breeding_value import BreedingTrait, EvaluationStatus, GeneticEvaluation
+from app.db.models.job import Job, JobStatus
+from app.services.breeding_values import solve_animal_model
+
+
+@pytest.fixture
+def evaluation_job(db):
+    """A queued breeding value evaluation, as start_evaluation leaves it."""
+    def add(status=JobStatus.QUEUED, **fields):
+        evaluation = GeneticEvaluation(trait=BreedingTrait.WEANING_WEIGHT, status=EvaluationStatus.PENDING)
+        db.add(evaluation)
+        db.flush()
+        job = Job(
+            kind="evaluate_breeding_values", status=status,
+            params=json.dumps({"evaluation_id": evaluation.id}), **fields
+        )
+        db.add(job)
+        db.flush()
+        evaluation.job_id = job.id
+        db.commit()
+        return job, evaluation
+    return add
+
+
+def test_job_cancelled_while_queued_fails_its_evaluation(db, evaluation_job):
+    job, evaluation = evaluation_job(cancel_requested=True)
+
+    run_job(job.id, job.farm_id)
+
+    db.expire_all()
+    assert job.status == JobStatus.CANCELLED
+    assert evaluation.status == EvaluationStatus.FAILED
+    assert evaluation.error == "Cancelled"
+
+
+def test_running_jobs_with_an_expired_lease_are_failed(db, evaluation_job):
+    now = datetime.utcnow()
+    lost, lost_evaluation = evaluation_job(JobStatus.RUNNING, lease_expires_at=now - timedelta(minutes=1), worker="w1")
+    alive, alive_evaluation = evaluation_job(JobStatus.RUNNING, lease_expires_at=now + timedelta(minutes=1))
+    lost_evaluation.status = alive_evaluation.status = EvaluationStatus.RUNNING
+    db.commit()
+
+    assert fail_expired_jobs(db) == 1
+
+    db.expire_all()
+    assert lost.status == JobStatus.FAILED
+    assert "w1" in lost.error
+    assert lost_evaluation.status == EvaluationStatus.FAILED
+    assert alive.status == JobStatus.RUNNING
+    assert alive_evaluation.status == EvaluationStatus.RUNNING
+
+
+def test_solver_can_be_aborted_between_iterations():
+    pedigree = {"S1": (None, None), "D1": (None, None), "L1": ("S1", "D1"), "L2": ("S1", "D1")}
+    records = [("L1", "g1", 30.0), ("L2", "g2", 24.0), ("D1", "g1", 28.0)]
+    calls = []
+
+    def cancel():
+        calls.append(1)
+        raise JobCancelled()
+
+    with pytest.raises(JobCancelled):
+        solve_animal_model(pedigree, records, heritability=0.3, on_iteration=cancel)
+    assert calls == [1]
@@ -0,0 +1,72 @@
+import json
+from datetime import date
+import pytest
+from app.db.models.birth_record import BirthRecord, BirthType, RearingType
+from app.db.models.lamb import Lamb
+from app.db.models.sheep import SheepSex
+from app.schemas.birth import LambStatsGroup
+from app.services.births import get_lamb_stats
+
+
+@pytest.fixture
+def lambings(db, add_sheep):
+    add_sheep("EWE-1")
+    add_sheep("RAM-1", SheepSex.MALE)
+    for lambed, lambs in (
+        (date(2024, 3, 5), [(SheepSex.MALE, True, 4.0), (SheepSex.FEMALE, True, 3.0)]),
+        (date(2024, 4, 2), [(SheepSex.MALE, False, 5.0)]),
+    ):
+        record = BirthRecord(
+            ewe_id="EWE-1", sire_id="RAM-1", date_lambed=lambed,
+            birth_type=BirthType.TWIN if len(lambs) == 2 else BirthType.SINGLE,
+            rearing_type=RearingType.NATURAL
+        )
+        db.add(record)
+        db.flush()
+        for order, (sex, alive, weight) in enumerate(lambs, start=1):
+            db.add(Lamb(birth_record_id=record.id, birth_order=order, sex=sex, born_alive=alive, birth_weight=weight))
+    db.commit()
+
+
+def test_lamb_stats_overall(db, lambings):
+    [stats] = get_lamb_stats(db)
+
+    assert (stats.lambs, stats.males, stats.females, stats.stillborn) == (3, 2, 1, 1)
+    assert stats.male_ratio == pytest.approx(2 / 3, abs=1e-4)
+    assert stats.mean_birth_weight == pytest.approx(4.0)
+
+
+def test_lamb_stats_by_month(db, lambings):
+    stats = get_lamb_stats(db, group_by=LambStatsGroup.MONTH)
+
+    assert [(s.group, s.lambs) for s in stats] == [("2024-03", 2), ("2024-04", 1)]
+
+
+def test_lamb_stats_by_birth_type(db, lambings):
+    stats = get_lamb_stats(db, group_by=LambStatsGroup.BIRTH_TYPE, start_date=date(2024, 4, 1))
+
+    assert [(s.group, s.lambs) for s in stats] == [("single", 1)]
+
+
+@pytest.mark.parametrize("detail, born_alive", [
+    ({"alive": "false"}, False),
+    ({"alive": "yes"}, True),
+    ({"born_alive": 0}, False),
+    ({"status": "stillborn"}, False),
+    ({}, True),
+])
+def test_migration_parses_alive_flags(load_migration, detail, born_alive):
+    [row] = load_migration("009")._parse_lambs(1, json.dumps([detail]))
+    assert row["born_alive"] is born_alive
+
+
+def test_migration_skips_unreadable_lambs(load_migration):
+    raw = json.dumps({"lambs": [
+        {"tag": "A", "alive": "maybe"},
+        {"tag": "B", "death_date": "last tuesday"},
+        {"tag": "C", "alive": True, "death_date": "2024-03-09T10:00:00"},
+    ]})
+
+    [row] = load_migration("009")._parse_lambs(1, raw)
+
+    assert (row["tag_id"], row["birth_order"], row["death_date"]) == ("C", 3, date(2024, 3, 9))
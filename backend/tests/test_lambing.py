@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+import pytest
+from app.core.config import settings
+from app.db.models.birth_record import BirthRecord, BirthType, RearingType
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import SheepSection, SheepSex
+from app.services.lambing import (
+    PRIOR_WEIGHT,
+    get_lambing_calendar,
+    refresh_lambing_forecasts,
+    update_gestation_stats
+)
+
+MATED = date(2024, 10, 1)
+
+
+@pytest.fixture
+def flock(add_sheep):
+    add_sheep("RAM-1", SheepSex.MALE)
+    for tag in ("EWE-1", "EWE-2", "EWE-3"):
+        add_sheep(tag, current_section=SheepSection.MATING)
+
+
+def add_pair(db, ewe_id, mating_start_date=MATED, **fields):
+    pair = MatingPair(ram_id="RAM-1", ewe_id=ewe_id, mating_start_date=mating_start_date, **fields)
+    db.add(pair)
+    db.commit()
+    return pair
+
+
+def test_gestation_stats_shrink_towards_default(db, flock):
+    add_pair(db, "EWE-1")
+    db.add(BirthRecord(
+        ewe_id="EWE-1", date_lambed=MATED + timedelta(days=144),
+        birth_type=BirthType.SINGLE, rearing_type=RearingType.NATURAL
+    ))
+    db.commit()
+
+    [stat] = update_gestation_stats(db)
+
+    expected = (144 + PRIOR_WEIGHT * settings.DEFAULT_GESTATION_DAYS) / (1 + PRIOR_WEIGHT)
+    assert stat.breed == "Merino"
+    assert stat.sample_size == 1
+    assert stat.mean_days == pytest.approx(expected)
+
+
+def test_implausible_gestations_are_ignored(db, flock):
+    add_pair(db, "EWE-1")
+    db.add(BirthRecord(
+        ewe_id="EWE-1", date_lambed=MATED + timedelta(days=60),
+        birth_type=BirthType.SINGLE, rearing_type=RearingType.NATURAL
+    ))
+    db.commit()
+
+    assert update_gestation_stats(db) == []
+
+
+def test_full_refresh_fills_forecasts_and_calendar(db, flock):
+    pair = add_pair(db, "EWE-1")
+    add_pair(db, "EWE-2")
+
+    assert refresh_lambing_forecasts(db, full=True) == 2
+
+    db.refresh(pair)
+    expected = MATED + timedelta(days=settings.DEFAULT_GESTATION_DAYS)
+    assert pair.expected_lambing_date == expected
+    assert pair.lambing_window_start < expected < pair.lambing_window_end
+
+    [day] = get_lambing_calendar(db)
+    assert day.lambing_date == expected
+    assert day.total == 2
+    assert day.sections == {SheepSection.MATING: 2}
+
+
+def test_incremental_refresh_only_touches_new_pairs(db, flock):
+    add_pair(db, "EWE-1")
+    refresh_lambing_forecasts(db, full=True)
+    add_pair(db, "EWE-3", mating_start_date=MATED + timedelta(days=10))
+
+    refresh_lambing_forecasts(db)
+
+    days = get_lambing_calendar(db)
+    assert [day.total for day in days] == [1, 1]
+
+
+def test_lambed_and_failed_pairs_leave_the_calendar(db, flock):
+    add_pair(db, "EWE-1", actual_lambing_date=MATED + timedelta(days=150))
+    add_pair(db, "EWE-2", pregnancy_failed=True)
+    add_pair(db, "EWE-3")
+
+    refresh_lambing_forecasts(db, full=True)
+
+    [day] = get_lambing_calendar(db)
+    assert day.total == 1
+
+
+def test_calendar_endpoint_filters_by_date(client, db, flock):
+    add_pair(db, "EWE-1")
+    add_pair(db, "EWE-2", mating_start_date=MATED + timedelta(days=30))
+    refresh_lambing_forecasts(db, full=True)
+
+    cutoff = MATED + timedelta(days=settings.DEFAULT_GESTATION_DAYS + 1)
+    response = client.get("/api/v1/calendar/lambing", params={"end_date": cutoff.isoformat()})
+
+    assert response.status_code == 200
+    assert [day["total"] for day in response.json()] == [1]
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+from app.core.leader import SchedulerLeader, leader_only, scheduler_leader
+from app.db.models.scheduler_lease import SchedulerLease
+from app.db.session import SessionLocal
+
+
+def test_only_one_worker_holds_the_lease():
+    first, second = SchedulerLeader(), SchedulerLeader()
+
+    assert first.elect()
+    assert not second.elect()
+    assert first.elect()
+
+
+def test_lease_fails_over_when_it_expires():
+    first, second = SchedulerLeader(), SchedulerLeader()
+    first.elect()
+    with SessionLocal() as db:
+        db.query(SchedulerLease).update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+
+    assert second.elect()
+    assert not first.elect()
+
+
+def test_release_hands_leadership_over():
+    first, second = SchedulerLeader(), SchedulerLeader()
+    first.elect()
+
+    first.release()
+
+    assert not first.is_leader
+    assert second.elect()
+
+
+def test_leader_only_skips_jobs_in_followers():
+    other = SchedulerLeader()
+    other.elect()
+    calls = []
+
+    @leader_only
+    def job():
+        calls.append(1)
+        return "ran"
+
+    assert job() is None
+    other.release()
+    try:
+        assert job() == "ran"
+    finally:
+        scheduler_leader.release()
+    assert calls == [1]
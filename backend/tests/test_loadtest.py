@@ -0,0 +1,75 @@
+import asyncio
+import httpx
+from app.main import app
+from loadtest.runner import LatencyRecorder, compare_to_baseline, run_scenario
+from loadtest.scenarios import Flock, Scenario, read_sheep, update_ewe_notes
+
+
+def test_recorder_separates_shed_requests_from_errors():
+    recorder = LatencyRecorder()
+    for latency, status in ((4.0, 200), (1.0, 200), (30.0, 503), (700.0, 500), (3.0, None)):
+        recorder.record(latency, status)
+
+    summary = recorder.summary(duration=2.0)
+
+    assert recorder.latencies_ms == [1.0, 3.0, 4.0, 30.0, 700.0]
+    assert summary["requests"] == 5
+    assert summary["throughput_rps"] == 2.5
+    assert summary["error_rate"] == 0.4
+    assert summary["shed_rate"] == 0.2
+    assert summary["p50_ms"] == 4.0
+    assert summary["p99_ms"] == 700.0
+
+
+def test_histogram_counts_each_latency_once():
+    recorder = LatencyRecorder()
+    for latency in (0.5, 1.0, 1.5, 60.0, 20000.0):
+        recorder.record(latency, 200)
+
+    histogram = recorder.histogram()
+
+    assert sum(histogram.values()) == 5
+    assert histogram["<=1ms"] == 2
+    assert histogram["<=2ms"] == 1
+    assert histogram["<=100ms"] == 1
+    assert histogram[">10000ms"] == 1
+
+
+def test_baseline_comparison_flags_only_regressions_past_tolerance():
+    baseline = {
+        "overall": {"p95_ms": 100.0, "throughput_rps": 50.0, "error_rate": 0.0},
+        "requests": {"GET /sheep": {"p99_ms": 200.0}},
+    }
+    within = {
+        "overall": {"p50_ms": 10.0, "p95_ms": 115.0, "p99_ms": 150.0, "throughput_rps": 45.0, "error_rate": 0.005},
+        "requests": {"GET /sheep": {"p50_ms": 10.0, "p95_ms": 100.0, "p99_ms": 230.0, "throughput_rps": 5.0, "error_rate": 0.0}},
+    }
+    regressed = {
+        "overall": {**within["overall"], "p95_ms": 130.0, "throughput_rps": 30.0},
+        "requests": {"GET /sheep": {**within["requests"]["GET /sheep"], "p99_ms": 260.0}},
+    }
+
+    assert compare_to_baseline(within, baseline, tolerance=0.2) == []
+    assert len(compare_to_baseline(regressed, baseline, tolerance=0.2)) == 3
+
+
+def test_flock_tags_and_rfid_codes_are_stable():
+    flock = Flock(20)
+
+    assert len(flock.ewes) == 18 and len(flock.rams) == 2
+    assert len({Flock.rfid(tag) for tag in flock.tags}) == 20
+    assert Flock.rfid("LT-E00000") == Flock(5).rfid("LT-E00000")
+
+
+def test_scenario_runs_against_the_app(farm):
+    scenario = Scenario("smoke", "Reads and updates", {read_sheep: 1, update_ewe_notes: 1}, think_time=0.0)
+
+    result = asyncio.run(run_scenario(
+        "http://loadtest", scenario, users=2, duration=0.3, flock_size=10, warmup=0,
+        transport=httpx.ASGITransport(app=app)
+    ))
+
+    assert result["scenario"] == "smoke"
+    assert result["overall"]["requests"] > 0
+    assert result["overall"]["error_rate"] == 0.0
+    assert set(result["requests"]) == {"GET /sheep/{tag_id}", "PUT /sheep/{tag_id}"}
@@ -0,0 +1,87 @@
+import pytest
+from app.db.models.sheep import SheepSection, SheepSex
+from app.schemas.mating import MatingOptimizationRequest, RamCapacity
+from app.services.mating import get_open_ewe_ids, optimize_mating_assignments
+from app.services.pedigree import relationship_matrix
+
+
+PEDIGREE = {
+    "S": (None, None),
+    "D": (None, None),
+    "D2": (None, None),
+    "FULL1": ("S", "D"),
+    "FULL2": ("S", "D"),
+    "HALF": ("S", "D2"),
+    "INBRED": ("FULL1", "FULL2"),
+}
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("S", "S", 1.0),
+    ("S", "D", 0.0),
+    ("S", "FULL1", 0.5),
+    ("FULL1", "FULL2", 0.5),
+    ("FULL1", "HALF", 0.25),
+    ("INBRED", "INBRED", 1.25),
+    ("UNKNOWN", "S", 0.0),
+])
+def test_relationship_matrix(a, b, expected):
+    assert relationship_matrix(PEDIGREE, [a], [b])[0, 0] == pytest.approx(expected)
+
+
+def test_optimizer_avoids_related_pairs(add_sheep, db):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("RAM-2", SheepSex.MALE)
+    add_sheep("EWE-1", sire_id="RAM-1", current_section=SheepSection.MATING)
+    add_sheep("EWE-2", current_section=SheepSection.MATING)
+
+    result = optimize_mating_assignments(db, MatingOptimizationRequest(rams=[
+        RamCapacity(ram_id="RAM-1", capacity=1, group_slot=1),
+        RamCapacity(ram_id="RAM-2", capacity=1, group_slot=2),
+    ]))
+
+    pairs = {a.ewe_id: a.ram_id for a in result.assignments}
+    assert pairs == {"EWE-1": "RAM-2", "EWE-2": "RAM-1"}
+    assert result.total_relationship == pytest.approx(0.0)
+    assert result.unassigned_ewe_ids == []
+
+
+def test_optimizer_leaves_ewes_over_capacity_unassigned(add_sheep, db):
+    add_sheep("RAM-1", SheepSex.MALE)
+    for tag in ("EWE-1", "EWE-2", "EWE-3"):
+        add_sheep(tag, current_section=SheepSection.MATING)
+
+    result = optimize_mating_assignments(db, MatingOptimizationRequest(
+        rams=[RamCapacity(ram_id="RAM-1", capacity=2)]
+    ))
+
+    assert len(result.assignments) == 2
+    assert len(result.unassigned_ewe_ids) == 1
+
+
+def test_optimizer_respects_max_relationship(add_sheep, db):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("EWE-1", sire_id="RAM-1", current_section=SheepSection.MATING)
+
+    result = optimize_mating_assignments(db, MatingOptimizationRequest(
+        rams=[RamCapacity(ram_id="RAM-1", capacity=1)], max_relationship=0.25
+    ))
+
+    assert result.assignments == []
+    assert result.unassigned_ewe_ids == ["EWE-1"]
+
+
+def test_optimizer_rejects_ewe_as_ram(add_sheep, db):
+    add_sheep("EWE-1", current_section=SheepSection.MATING)
+    with pytest.raises(ValueError, match="not a male"):
+        optimize_mating_assignments(db, MatingOptimizationRequest(
+            rams=[RamCapacity(ram_id="EWE-1", capacity=1)]
+        ))
+
+
+def test_open_ewes_are_females_in_the_mating_section(add_sheep, db):
+    add_sheep("EWE-1", current_section=SheepSection.MATING)
+    add_sheep("EWE-2")
+    add_sheep("RAM-1", SheepSex.MALE, current_section=SheepSection.MATING)
+
+    assert get_open_ewe_ids(db) == ["EWE-1"]
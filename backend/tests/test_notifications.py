@@ -0,0 +1,28 @@
+from datetime import date, timedelta
+from app.db.models.birth_record import BirthRecord, BirthType, RearingType
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import SheepSex
+
+
+def test_all_notifications_include_weaning_and_inbreeding(client, db, add_sheep):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("EWE-1")
+    add_sheep("EWE-2", sire_id="RAM-1", dam_id="EWE-1")
+    today = date.today()
+    db.add(BirthRecord(
+        ewe_id="EWE-1", sire_id="RAM-1", date_lambed=today - timedelta(days=80),
+        birth_type=BirthType.SINGLE, rearing_type=RearingType.NATURAL,
+        expected_wean_date=today + timedelta(days=7)
+    ))
+    # Father-daughter mating
+    db.add(MatingPair(ram_id="RAM-1", ewe_id="EWE-2", mating_start_date=today - timedelta(days=30)))
+    db.commit()
+
+    response = client.get("/api/v1/notifications/")
+
+    assert response.status_code == 200
+    by_type = {notification["type"]: notification for notification in response.json()}
+    assert by_type["weaning_due"]["data"]["ewe_id"] == "EWE-1"
+    assert by_type["weaning_due"]["data"]["days_until"] == 7
+    assert by_type["inbreeding_alert"]["data"]["ewe_id"] == "EWE-2"
+    assert by_type["inbreeding_alert"]["priority"] == "high"
@@ -0,0 +1,39 @@
+from datetime import date
+from app.db.models.mating_pair import MatingPair
+from app.db.models.sheep import SheepSex
+from app.schemas.mating import MatingPairUpdate
+from app.services.mating import update_mating_pair
+from app.services.pedigree_index import cached_pedigree
+
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+def test_pedigree_snapshot_is_shared_until_the_index_changes(client, db):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-1"})
+    first = cached_pedigree(db)
+    assert cached_pedigree(db) is first
+
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-2"})
+    second = cached_pedigree(db)
+
+    assert second is not first
+    assert set(second) == {"EWE-1", "EWE-2"}
+    assert set(first) == {"EWE-1"}
+
+
+def test_update_mating_pair_leaves_unset_fields_alone(db, add_sheep):
+    add_sheep("RAM-1", SheepSex.MALE)
+    add_sheep("EWE-1")
+    pair = MatingPair(
+        ram_id="RAM-1", ewe_id="EWE-1", mating_start_date=date(2024, 10, 1),
+        group_slot=2, override_user="vet", override_reason="Ram swap"
+    )
+    db.add(pair)
+    db.commit()
+
+    updated = update_mating_pair(db, pair.id, MatingPairUpdate(pregnancy_confirmed=True))
+
+    assert updated.pregnancy_confirmed is True
+    assert updated.group_slot == 2
+    assert updated.override_user == "vet"
+    assert updated.mating_start_date == date(2024, 10, 1)
@@ -0,0 +1,74 @@
+from datetime import date
+from app.db.models.sheep import SheepSex
+from app.schemas.pedigree import PedigreeIssueType
+from app.services.pedigree_validation import _Animal, _cycle_issues, validate_pedigree
+
+
+def flock(**parents):
+    """Animals keyed by tag with (sire_id, dam_id); sex and dates don't matter to cycles."""
+    return {
+        tag_id: _Animal(SheepSex.FEMALE, date(2020, 1, 1), None, sire_id, dam_id)
+        for tag_id, (sire_id, dam_id) in parents.items()
+    }
+
+
+def labels(issues):
+    return {issue.sheep_id: issue.issue for issue in issues}
+
+
+def test_no_cycles():
+    assert _cycle_issues(flock(A=(None, None), B=("A", None), C=("B", "A"))) == []
+
+
+def test_cycle_members_and_descendants():
+    issues = _cycle_issues(flock(A=("B", None), B=("A", None), C=("A", None), D=("C", None)))
+
+    assert labels(issues) == {
+        "A": PedigreeIssueType.CYCLE,
+        "B": PedigreeIssueType.CYCLE,
+        "C": PedigreeIssueType.CYCLIC_ANCESTRY,
+        "D": PedigreeIssueType.CYCLIC_ANCESTRY,
+    }
+    assert {issue.sheep_id: issue.related_id for issue in issues}["A"] == "B"
+
+
+def test_animal_between_two_cycles_is_not_in_a_cycle():
+    # X descends from the A/B cycle and is an ancestor of the C/D cycle
+    issues = _cycle_issues(flock(A=("B", None), B=("A", None), X=("A", None), C=("D", "X"), D=("C", None)))
+
+    assert labels(issues) == {
+        "A": PedigreeIssueType.CYCLE,
+        "B": PedigreeIssueType.CYCLE,
+        "X": PedigreeIssueType.CYCLIC_ANCESTRY,
+        "C": PedigreeIssueType.CYCLE,
+        "D": PedigreeIssueType.CYCLE,
+    }
+
+
+def test_long_cycle_does_not_recurse():
+    size = 5000
+    animals = flock(**{f"S{i}": (f"S{(i + 1) % size}", None) for i in range(size)})
+
+    assert len(_cycle_issues(animals)) == size
+
+
+def test_self_parent_is_reported_once(db, add_sheep):
+    add_sheep("EWE-1", dam_id="EWE-1")
+
+    report = validate_pedigree(db)
+
+    assert [issue.issue for issue in report.issues] == [PedigreeIssueType.SELF_PARENT]
+    assert not report.valid
+
+
+def test_parent_checks(db, add_sheep):
+    add_sheep("EWE-1", date_of_birth=date(2022, 1, 1))
+    add_sheep("LAMB-1", sire_id="EWE-1", date_of_birth=date(2021, 1, 1))
+
+    report = validate_pedigree(db)
+
+    assert sorted(issue.issue for issue in report.issues) == [
+        PedigreeIssueType.PARENT_BORN_AFTER_OFFSPRING,
+        PedigreeIssueType.WRONG_PARENT_SEX,
+    ]
+    assert report.counts[PedigreeIssueType.WRONG_PARENT_SEX] == 1
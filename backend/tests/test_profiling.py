@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware, StackSampler
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def request_work():
+    _spin(0.2)
+
+
+def unrelated_work(stop: threading.Event):
+    while not stop.is_set():
+        _spin(0.01)
+
+
+def test_sampler_only_captures_the_profiled_request():
+    stop = threading.Event()
+    other = threading.Thread(target=unrelated_work, args=(stop,), daemon=True)
+    other.start()
+    sampler = StackSampler(0.005)
+
+    async def profiled_request():
+        sampler.start()
+        try:
+            await run_in_threadpool(request_work)
+        finally:
+            sampler.stop()
+
+    try:
+        asyncio.run(profiled_request())
+    finally:
+        stop.set()
+        other.join()
+
+    folded = sampler.folded()
+    assert "request_work" in folded
+    assert "unrelated_work" not in folded
+
+
+def test_admin_token_selects_requests(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", "s3cret")
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    middleware = ProfilingMiddleware(app=None)
+    header = settings.PROFILING_HEADER.lower().encode()
+
+    assert middleware._wanted({"headers": [(header, b"s3cret")]})
+    assert not middleware._wanted({"headers": [(header, b"s3cre")]})
+    assert not middleware._wanted({"headers": []})
@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+import pytest
+from app.db.models.health_event import EventType
+from app.db.models.treatment_protocol import DueTreatment, TreatmentProtocol
+from app.schemas.protocol import DueTreatmentCompletion
+from app.services.health import get_overdue_events
+from app.services.protocols import complete_due_treatments, get_due_treatments
+
+
+@pytest.fixture
+def booster(db, add_sheep):
+    add_sheep("EWE-1")
+    add_sheep("EWE-2")
+    # Paused so completing doses doesn't materialize the next ones
+    protocol = TreatmentProtocol(
+        name="CDT booster", event_type=EventType.VACCINATION, interval_days=365, doses=3, active=False
+    )
+    db.add(protocol)
+    db.flush()
+    overdue = date.today() - timedelta(days=3)
+    db.add_all([
+        DueTreatment(protocol_id=protocol.id, sheep_id="EWE-1", dose_number=1, due_date=overdue),
+        DueTreatment(protocol_id=protocol.id, sheep_id="EWE-2", dose_number=1, due_date=date.today() + timedelta(days=5)),
+    ])
+    db.commit()
+    return protocol
+
+
+def test_due_list_reports_days_overdue(db, booster):
+    [due] = get_due_treatments(db, overdue_only=True)
+
+    assert (due.sheep_id, due.protocol_name, due.days_overdue) == ("EWE-1", "CDT booster", 3)
+    assert len(get_due_treatments(db, until=date.today() + timedelta(days=7))) == 2
+
+
+def test_completed_doses_leave_reminders_to_the_due_list(db, booster):
+    [due] = get_due_treatments(db, overdue_only=True)
+
+    [event] = complete_due_treatments(db, DueTreatmentCompletion(due_ids=[due.id], details="Left neck"))
+
+    assert event.details == "CDT booster (dose 1); Left neck"
+    assert event.next_due_date is None
+    assert get_overdue_events(db) == []
+    assert get_due_treatments(db, overdue_only=True) == []
+    assert db.get(DueTreatment, due.id).health_event_id == event.id
+
+
+def test_completing_twice_is_rejected(db, booster):
+    [due] = get_due_treatments(db, overdue_only=True)
+    complete_due_treatments(db, DueTreatmentCompletion(due_ids=[due.id]))
+
+    with pytest.raises(ValueError, match="already completed"):
+        complete_due_treatments(db, DueTreatmentCompletion(due_ids=[due.id]))
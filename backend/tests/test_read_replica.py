@@ -0,0 +1,76 @@
+from datetime import date
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+from app.api.deps import get_db
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.models.job import Job, JobStatus
+from app.db.models.sheep import Sheep
+
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch, farm):
+    """A second SQLite file standing in for the read replica; nothing replicates to it."""
+    bind = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=bind)
+    monkeypatch.setattr(db_session, "ReadSessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=bind))
+    yield bind
+    bind.dispose()
+
+
+def tags_in(bind):
+    with Session(bind=bind) as db:
+        return [tag_id for (tag_id,) in db.query(Sheep.tag_id).order_by(Sheep.tag_id)]
+
+
+def bind_for(method):
+    request = Request({"type": "http", "method": method, "headers": [], "path": "/"})
+    dependency = get_db(request)
+    db = next(dependency)
+    try:
+        return db.get_bind()
+    finally:
+        dependency.close()
+
+
+@pytest.mark.parametrize("method, read_only", [
+    ("GET", True), ("HEAD", True), ("OPTIONS", True), ("POST", False), ("PUT", False), ("DELETE", False)
+])
+def test_get_db_routes_by_method(replica, method, read_only):
+    assert bind_for(method) is (replica if read_only else db_session.engine)
+
+
+def test_writes_go_to_the_primary_and_reads_to_the_replica(client, replica):
+    response = client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-1"})
+    assert response.status_code == 200, response.text
+
+    assert tags_in(db_session.engine) == ["EWE-1"]
+    assert tags_in(replica) == []
+    # Served by the replica, which has not caught up
+    assert client.get("/api/v1/sheep/").json() == []
+    assert client.get("/api/v1/sheep/EWE-1").status_code == 404
+
+    with Session(bind=replica) as db:
+        db.add(Sheep(farm_id=1, tag_id="EWE-1", breed="Merino", sex="female", date_of_birth=date(2023, 3, 1)))
+        db.commit()
+    assert [sheep["tag_id"] for sheep in client.get("/api/v1/sheep/").json()] == ["EWE-1"]
+
+    response = client.put("/api/v1/sheep/EWE-1", json={"notes": "Lame"})
+    assert response.status_code == 200, response.text
+    with Session(bind=db_session.engine) as db:
+        assert db.query(Sheep.notes).filter(Sheep.tag_id == "EWE-1").scalar() == "Lame"
+
+
+def test_job_status_is_read_from_the_primary(client, db, replica):
+    job = Job(kind="evaluate_breeding_values", status=JobStatus.QUEUED, params="{}")
+    db.add(job)
+    db.commit()
+
+    assert client.get("/api/v1/jobs/").json() == []
+    response = client.get(f"/api/v1/jobs/{job.id}")
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "queued"
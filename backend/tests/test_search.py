@@ -0,0 +1,47 @@
+import pytest
+from app.services.search_index import SheepSearchIndex, trigrams
+from app.services.sheep_index import SheepIndexBase
+
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+def test_index_base_is_abstract():
+    with pytest.raises(TypeError):
+        SheepIndexBase()
+    assert isinstance(SheepSearchIndex(), SheepIndexBase)
+
+
+def test_trigrams_pad_like_pg_trgm():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+
+def test_autocomplete_matches_tag_and_scrapie_prefixes(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "GRN-001", "scrapie_id": "US123"})
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "GRN-002"})
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "RED-001"})
+
+    tags = client.get("/api/v1/sheep/search/autocomplete", params={"prefix": "grn"}).json()
+    scrapie = client.get("/api/v1/sheep/search/autocomplete", params={"prefix": "US1"}).json()
+
+    assert [s["value"] for s in tags] == ["GRN-001", "GRN-002"]
+    assert scrapie == [{"tag_id": "GRN-001", "value": "US123"}]
+
+
+def test_search_tolerates_typos(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "GRN-001", "origin_farm": "Hillcrest"})
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "RED-002", "notes": "limping on the left"})
+
+    by_farm = client.get("/api/v1/sheep/search", params={"q": "Hilcrest"}).json()
+    by_notes = client.get("/api/v1/sheep/search", params={"q": "limping"}).json()
+
+    assert [s["tag_id"] for s in by_farm] == ["GRN-001"]
+    assert [s["tag_id"] for s in by_notes] == ["RED-002"]
+
+
+def test_search_follows_updates(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "GRN-001", "notes": "healthy"})
+    assert client.get("/api/v1/sheep/search", params={"q": "coughing"}).json() == []
+
+    client.put("/api/v1/sheep/GRN-001", json={"notes": "coughing"})
+
+    assert [s["tag_id"] for s in client.get("/api/v1/sheep/search", params={"q": "coughing"}).json()] == ["GRN-001"]
@@ -0,0 +1,87 @@
+from datetime import date
+import pytest
+from app.db.models.section_assignment import SectionAssignment
+from app.db.models.sheep import SheepSection, SheepSex
+from app.schemas.sheep import SheepCreate
+from app.services.sections import (
+    bulk_move_sheep,
+    get_section_headcounts,
+    get_section_history,
+    get_section_occupants,
+    move_sheep
+)
+from app.services.sheep import create_sheep, delete_sheep
+
+
+def new_sheep(db, tag_id, **fields):
+    fields.setdefault("breed", "Merino")
+    fields.setdefault("sex", SheepSex.FEMALE)
+    fields.setdefault("date_of_birth", date(2023, 3, 1))
+    return create_sheep(db, SheepCreate(tag_id=tag_id, **fields))
+
+
+def test_create_sheep_opens_a_section_interval(db):
+    new_sheep(db, "EWE-1")
+    new_sheep(db, "EWE-2", purchase_date=date(2024, 1, 10))
+
+    [first] = get_section_history(db, "EWE-1")
+    assert (first.section, first.start_date, first.end_date) == (SheepSection.GENERAL, date(2023, 3, 1), None)
+    assert get_section_history(db, "EWE-2")[0].start_date == date(2024, 1, 10)
+    occupants = get_section_occupants(db, SheepSection.GENERAL, date(2024, 6, 1))
+    assert [sheep.tag_id for sheep in occupants] == ["EWE-1", "EWE-2"]
+
+
+def test_move_closes_the_open_interval(db):
+    new_sheep(db, "EWE-1")
+
+    assignment = move_sheep(db, "EWE-1", SheepSection.MATING, date(2024, 9, 1), "Joining")
+
+    assert assignment.section == SheepSection.MATING
+    history = get_section_history(db, "EWE-1")
+    assert [(a.section, a.end_date) for a in history] == [
+        (SheepSection.MATING, None),
+        (SheepSection.GENERAL, date(2024, 9, 1))
+    ]
+    assert get_section_occupants(db, SheepSection.GENERAL, date(2024, 8, 31))[0].tag_id == "EWE-1"
+    assert get_section_occupants(db, SheepSection.GENERAL, date(2024, 9, 1)) == []
+
+
+def test_move_before_the_current_interval_is_rejected(db):
+    new_sheep(db, "EWE-1")
+    move_sheep(db, "EWE-1", SheepSection.MATING, date(2024, 9, 1))
+
+    with pytest.raises(ValueError, match="entered its current section"):
+        move_sheep(db, "EWE-1", SheepSection.GENERAL, date(2024, 8, 1))
+
+
+def test_headcounts_sweep_over_intervals(db):
+    new_sheep(db, "EWE-1", date_of_birth=date(2024, 1, 1))
+    new_sheep(db, "EWE-2", date_of_birth=date(2024, 1, 3))
+    bulk_move_sheep(db, ["EWE-1", "EWE-2"], SheepSection.MATING, date(2024, 1, 4))
+
+    counts = get_section_headcounts(db, date(2024, 1, 1), date(2024, 1, 4))
+
+    assert [day.counts[SheepSection.GENERAL] for day in counts] == [1, 1, 2, 0]
+    assert [day.counts[SheepSection.MATING] for day in counts] == [0, 0, 0, 2]
+
+
+def test_delete_sheep_removes_its_section_history(db):
+    new_sheep(db, "EWE-1")
+
+    assert delete_sheep(db, "EWE-1")
+    assert db.query(SectionAssignment).count() == 0
+
+
+def test_backfill_opens_intervals_for_sheep_without_one(db, add_sheep, migrate):
+    add_sheep("EWE-1", current_section=SheepSection.MATING, purchase_date=date(2023, 5, 1))
+    new_sheep(db, "EWE-2")
+
+    migrate("015")
+
+    [backfilled] = get_section_history(db, "EWE-1")
+    assert (backfilled.section, backfilled.start_date) == (SheepSection.MATING, date(2023, 5, 1))
+    assert len(get_section_history(db, "EWE-2")) == 1
+
+    migrate("015", "downgrade")
+    db.expire_all()
+    assert get_section_history(db, "EWE-1") == []
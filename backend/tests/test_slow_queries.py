@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.core.slow_queries import _SIDE_EFFECTS, SlowQueryLog
+
+
+@pytest.mark.parametrize("statement", [
+    "SELECT pg_advisory_xact_lock(%(key)s)",
+    "SELECT jobs.id FROM jobs WHERE jobs.id = %(id)s FOR UPDATE",
+    "SELECT set_config('pg_trgm.similarity_threshold', %(v)s, true)",
+    "SELECT nextval('health_events_id_seq')",
+])
+def test_locking_or_side_effect_reads_are_not_analyzed(statement):
+    assert _SIDE_EFFECTS.search(statement)
+
+
+def test_plain_reads_are_analyzed():
+    assert not _SIDE_EFFECTS.search("SELECT count(*), max(sheep.date_of_birth) FROM sheep WHERE sheep.breed = %(b)s")
+
+
+def test_failed_statements_do_not_leave_a_start_time_behind(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    SlowQueryLog().install(engine)
+
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+
+        assert conn.info["slow_query_start"] == []
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from app.db.models.change_log import ChangeLogEntry
+from app.services.changes import prune_change_log
+
+SHEEP = {"tag_id": "EWE-1", "breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+def changes(client, since=0, **params):
+    response = client.get("/api/v1/sync/changes", params={"since": since, **params})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_changes_since_cursor(client):
+    client.post("/api/v1/sheep/", json=SHEEP)
+    first = changes(client)
+    assert [sheep["tag_id"] for sheep in first["sheep"]] == ["EWE-1"]
+    assert first["has_more"] is False
+
+    client.put("/api/v1/sheep/EWE-1", json={"notes": "Lame"})
+    second = changes(client, first["cursor"])
+    assert second["sheep"][0]["notes"] == "Lame"
+    assert second["cursor"] > first["cursor"]
+
+    assert changes(client, second["cursor"])["sheep"] == []
+
+
+def test_repeated_changes_collapse_to_latest_state(client):
+    client.post("/api/v1/sheep/", json=SHEEP)
+    client.put("/api/v1/sheep/EWE-1", json={"notes": "one"})
+    client.put("/api/v1/sheep/EWE-1", json={"notes": "two"})
+
+    batch = changes(client)
+
+    assert len(batch["sheep"]) == 1
+    assert batch["sheep"][0]["notes"] == "two"
+
+
+def test_deletions_are_reported_as_tombstones(client):
+    client.post("/api/v1/sheep/", json=SHEEP)
+    cursor = changes(client)["cursor"]
+    client.post("/api/v1/health-events/", json={
+        "sheep_id": "EWE-1", "event_date": "2024-05-01", "event_type": "checkup", "details": "Fine"
+    })
+    event_cursor = changes(client, cursor)
+    event_id = event_cursor["health_events"][0]["id"]
+
+    client.delete(f"/api/v1/health-events/{event_id}")
+    client.delete("/api/v1/sheep/EWE-1")
+
+    batch = changes(client, event_cursor["cursor"])
+    assert batch["deleted"] == {"sheep": ["EWE-1"], "health_events": [event_id]}
+
+
+def test_batches_page_with_has_more(client):
+    for number in range(3):
+        client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": f"EWE-{number}"})
+
+    first = changes(client, limit=2)
+    second = changes(client, first["cursor"], limit=2)
+
+    assert first["has_more"] is True
+    assert len(first["sheep"]) + len(second["sheep"]) == 3
+
+
+def test_pruned_cursor_expires(client, db):
+    for number in range(3):
+        client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": f"EWE-{number}"})
+    oldest = db.query(ChangeLogEntry).order_by(ChangeLogEntry.id).limit(2).all()
+    last_pruned = oldest[-1].id
+    for entry in oldest:
+        entry.changed_at = datetime.utcnow() - timedelta(days=400)
+    db.commit()
+    assert prune_change_log(db, retention_days=30) == 2
+
+    response = client.get("/api/v1/sync/changes", params={"since": 0})
+
+    assert response.status_code == 410
+    assert client.get("/api/v1/sync/cursor").json()["cursor"] == last_pruned + 1
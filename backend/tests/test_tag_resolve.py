@@ -0,0 +1,38 @@
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+def resolve(client, codes):
+    response = client.post("/api/v1/sheep/resolve", json={"codes": codes})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_resolves_rfid_and_qr_codes(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-1", "rfid_code": "982000001"})
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-2", "qr_code": "QR-2"})
+
+    result = resolve(client, ["982000001", "QR-2", "nope"])
+
+    assert result["resolved"]["982000001"]["tag_id"] == "EWE-1"
+    assert result["resolved"]["QR-2"]["tag_id"] == "EWE-2"
+    assert result["unresolved"] == ["nope"]
+
+
+def test_index_follows_code_changes(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-1", "rfid_code": "OLD"})
+    assert "OLD" in resolve(client, ["OLD"])["resolved"]
+
+    client.put("/api/v1/sheep/EWE-1", json={"rfid_code": "NEW"})
+    result = resolve(client, ["OLD", "NEW"])
+
+    assert result["unresolved"] == ["OLD"]
+    assert result["resolved"]["NEW"]["tag_id"] == "EWE-1"
+
+
+def test_deleted_sheep_no_longer_resolve(client):
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "EWE-1", "qr_code": "QR-1"})
+    assert resolve(client, ["QR-1"])["resolved"]
+
+    client.delete("/api/v1/sheep/EWE-1")
+
+    assert resolve(client, ["QR-1"])["unresolved"] == ["QR-1"]
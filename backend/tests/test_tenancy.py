@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models.farm import Farm
+from app.db.models.sheep import Sheep
+from app.db.session import SessionLocal, get_farm_route, invalidate_farm_routes
+
+SHEEP = {"breed": "Merino", "sex": "female", "date_of_birth": "2023-03-01"}
+
+
+@pytest.fixture
+def farm_databases(tmp_path, monkeypatch, farm):
+    """Two farms, each with a SQLite file standing in for a database of its own."""
+    # Farm engines are cached by database name, so names are unique per test
+    databases = {code: f"{code}-{tmp_path.name}" for code in ("east", "west")}
+    monkeypatch.setattr(settings, "FARM_DATABASES", {
+        database: f"sqlite:///{tmp_path / database}.db" for database in databases.values()
+    })
+    engines = {}
+    with SessionLocal() as db:
+        for farm_id, (code, database) in enumerate(databases.items(), start=2):
+            engines[code] = create_engine(settings.FARM_DATABASES[database])
+            Base.metadata.create_all(bind=engines[code])
+            db.add(Farm(id=farm_id, code=code, name=code.title(), database=database))
+        db.commit()
+    yield engines
+    for bind in engines.values():
+        bind.dispose()
+
+
+def tags_in(bind):
+    with Session(bind=bind) as db:
+        return [(tag_id, farm_id) for tag_id, farm_id in db.query(Sheep.tag_id, Sheep.farm_id).order_by(Sheep.tag_id)]
+
+
+def test_farms_are_served_from_their_own_databases(client, farm_databases):
+    for code, tag_id in (("east", "E-1"), ("west", "W-1"), ("default", "D-1")):
+        response = client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": tag_id}, headers={"X-Farm": code})
+        assert response.status_code == 200, response.text
+
+    assert tags_in(farm_databases["east"]) == [("E-1", 2)]
+    assert tags_in(farm_databases["west"]) == [("W-1", 3)]
+    with SessionLocal() as db:
+        assert [tag for (tag,) in db.query(Sheep.tag_id)] == ["D-1"]
+
+    east = client.get("/api/v1/sheep/", headers={"X-Farm": "east"}).json()
+    by_id = client.get("/api/v1/sheep/", headers={"X-Farm": "3"}).json()
+    assert [s["tag_id"] for s in east] == ["E-1"]
+    assert [s["tag_id"] for s in by_id] == ["W-1"]
+
+
+def test_farms_sharing_a_database_see_only_their_rows(client, farm):
+    with SessionLocal() as db:
+        db.add(Farm(id=2, code="north", name="North"))
+        db.commit()
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "N-1"}, headers={"X-Farm": "north"})
+    client.post("/api/v1/sheep/", json={**SHEEP, "tag_id": "D-1"})
+
+    north = client.get("/api/v1/sheep/", headers={"X-Farm": "north"}).json()
+    default = client.get("/api/v1/sheep/").json()
+
+    assert [s["tag_id"] for s in north] == ["N-1"]
+    assert [s["tag_id"] for s in default] == ["D-1"]
+    assert client.get("/api/v1/sheep/D-1", headers={"X-Farm": "north"}).status_code == 404
+
+
+def test_unknown_farm_is_not_found(client):
+    response = client.get("/api/v1/sheep/", headers={"X-Farm": "nowhere"})
+    assert response.status_code == 404
+
+
+def test_unknown_farm_lookups_are_cached(farm):
+    assert get_farm_route("north") is None
+    with SessionLocal() as db:
+        db.add(Farm(id=2, code="north", name="North"))
+        db.commit()
+
+    # Within FARM_CACHE_SECONDS the miss is remembered instead of reloading
+    assert get_farm_route("north") is None
+    invalidate_farm_routes()
+    assert get_farm_route("north").id == 2
+
+
+def test_missing_header_is_rejected_when_required(client, monkeypatch):
+    monkeypatch.setattr(settings, "FARM_HEADER_REQUIRED", True)
+    assert client.get("/api/v1/sheep/").status_code == 400